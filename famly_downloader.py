@@ -27,34 +27,717 @@ Usage:
 """
 
 import argparse
+import contextlib
+import functools
+import gzip
+import hashlib
+import itertools
 import json
+import multiprocessing
 import os
 import re
+import shutil
 import sys
+import tempfile
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sized
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from datetime import datetime
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
+from urllib3.exceptions import IncompleteRead, ProtocolError, ReadTimeoutError
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the standard library is used otherwise
+    orjson = None
 
 from output_formats import (
     FORMATTERS,
+    OutputFormatter,
     get_conversations_count_from_directory,
     get_formatter,
     get_observations_count_from_directory,
     get_photos_from_directory,
+    observation_media,
 )
 
 DEFAULT_CONFIG = {
     "output_dir": "./famly_photos",
     "download_big": True,
-    "max_workers": 4,
+    # Downloads are network-bound, so use several threads per core (capped
+    # to stay polite to Famly's servers)
+    "max_workers": min(16, (os.cpu_count() or 1) * 4),
     "batch_size": 100,
 }
 
 CONFIG_FILENAME = ".famly_credentials.json"
+SYNC_STATE_FILENAME = ".famly_sync.json"
+
+# Chromium profile reused by --login so an unexpired Famly session skips the
+# sign-in form. Kept outside the output directory so it is never published.
+BROWSER_PROFILE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "famly-downloader"
+    / "browser"
+)
+
+# Resource types the login browser does not need to download
+BLOCKED_LOGIN_RESOURCES = frozenset({"image", "font", "media"})
+
+# Conversation fields the conversations index renders; see conversation_index_entry
+CONVERSATION_INDEX_FIELDS = (
+    "conversationId",
+    "title",
+    "participants",
+    "lastActivityAt",
+    "lastMessage",
+)
+
+# Signatures of rendered observation pages, kept alongside them
+PAGE_SIGNATURES_FILENAME = ".pages.json"
+
+# Rendered files that --precompress writes gzipped copies of
+PRECOMPRESS_SUFFIXES = frozenset({".html", ".css"})
+
+# Fewer observation pages than this are rendered in-process; starting render
+# processes would cost more than it saves
+PROCESS_RENDER_MIN_PAGES = 32
+
+# Photo galleries with at least this many photos render in a render process
+# while messages are fetched
+PROCESS_RENDER_MIN_PHOTOS = 1000
+
+# Parsed config files, the modification time they were read at, and those
+# with unsaved changes, keyed by path
+_config_cache: dict[Path, dict] = {}
+_config_mtimes: dict[Path, int] = {}
+_dirty_configs: set[Path] = set()
+
+# Patterns used to turn observation text into directory-name slugs
+_SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+_SLUG_DASH_RE = re.compile(r"[\s_]+")
+
+# Deletes the ASCII characters _SLUG_STRIP_RE would remove, for the common
+# all-ASCII case where str.translate is much cheaper than a regex pass
+_SLUG_ASCII_STRIP = str.maketrans(
+    {c: None for c in map(chr, range(128)) if _SLUG_STRIP_RE.match(c)}
+)
+
+# Copy buffer for streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Files at least this large are fetched as several parallel byte ranges when
+# the server supports it, so one slow connection doesn't bound the transfer
+MULTIPART_MIN_SIZE = 16 * 1024 * 1024
+MULTIPART_PARTS = 4
+
+# Retry transient server/rate-limit errors on idempotent requests
+RETRY_POLICY = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+
+# Failures of a byte range transfer that requesting the range again can fix;
+# local file errors, such as a full disk, are not among them
+RANGE_RETRY_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    ProtocolError,
+    ReadTimeoutError,
+    IncompleteRead,
+)
+
+# Pause before requesting each further page of images or observations, to go
+# easy on the API. It runs on the prefetch thread, so it overlaps the work on
+# the current page rather than adding to it.
+PAGE_DELAY = 0.5
+
+
+class RateLimiter:
+    """
+    Token bucket that spaces out requests made by several threads.
+
+    Parameters
+    ----------
+    rate : float
+        Sustained number of requests per second.
+    burst : int | None
+        Requests allowed back to back after an idle spell; defaults to one
+        second's worth.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the next request may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Taking a token on credit reserves this thread's slot, so waiters
+            # are released in order without holding the lock while they sleep
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+
+
+class _RangeNotHonoured(OSError):
+    """The server answered a byte range request with something other than that range."""
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a token from a RateLimiter before each request."""
+
+    def __init__(self, rate_limiter: RateLimiter, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.rate_limiter.acquire()
+        return super().send(request, **kwargs)
+
+
+def mount_pooled_adapter(
+    session: requests.Session,
+    max_workers: int = 4,
+    max_connections: int | None = None,
+    rate_limiter: RateLimiter | None = None,
+) -> None:
+    """
+    Mount a connection-pooling adapter sized for parallel downloads.
+
+    The default adapter keeps at most 10 connections per host, so any worker
+    beyond that has its connection discarded and pays a fresh TLS handshake.
+
+    Parameters
+    ----------
+    session : requests.Session
+        The session to configure.
+    max_workers : int
+        Number of threads that will share the session.
+    max_connections : int | None
+        Hard cap on open connections per host. Threads wait for a free
+        connection instead of opening more. None means no cap.
+    rate_limiter : RateLimiter | None
+        Limiter every request sent through the session must pass. It may be
+        shared with other sessions. None means no limit.
+    """
+    pool_args = {
+        "pool_connections": 32,
+        "pool_maxsize": max_connections or max(32, max_workers * 2),
+        "pool_block": max_connections is not None,
+        "max_retries": RETRY_POLICY,
+    }
+    adapter = (
+        _RateLimitedAdapter(rate_limiter, **pool_args)
+        if rate_limiter is not None
+        else HTTPAdapter(**pool_args)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def json_loads(data: bytes | str):
+    """
+    Parse JSON, using orjson when it is installed.
+
+    Parameters
+    ----------
+    data : bytes | str
+        JSON document.
+
+    Returns
+    -------
+    Any
+        The decoded value.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data) -> bytes:
+    """
+    Serialize a value as indented UTF-8 JSON, using orjson when it is installed.
+
+    Parameters
+    ----------
+    data : Any
+        JSON-serializable value.
+
+    Returns
+    -------
+    bytes
+        The encoded document.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
+def progress_miniters(total: int) -> int:
+    """
+    Number of iterations between progress bar refreshes for a loop of `total` items.
+
+    About 200 refreshes are plenty for any bar; checking more often only adds
+    lock and clock overhead when items complete quickly (e.g. skipped files).
+
+    Parameters
+    ----------
+    total : int
+        Number of items the loop processes.
+
+    Returns
+    -------
+    int
+        Value for tqdm's ``miniters`` argument.
+    """
+    return max(1, total // 200)
+
+
+def list_filenames(directory: Path) -> set[str]:
+    """
+    List the entry names in a directory with a single scandir call.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory to list.
+
+    Returns
+    -------
+    set[str]
+        Names of the directory's entries, or an empty set if it does not exist.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+def conversation_index_entry(summary: dict, conversation: dict | None = None) -> dict:
+    """
+    Reduce a conversation to the fields its conversations index entry shows.
+
+    Incremental runs only fetch conversations that changed, so the index is
+    built from a mix of list summaries and full conversations. Taking the same
+    fields from both keeps the entries, and the index signature, in one shape.
+
+    Parameters
+    ----------
+    summary : dict
+        Conversation summary from fetch_conversations.
+    conversation : dict | None
+        Full conversation from fetch_conversation_messages, if it was fetched;
+        its values take precedence over the summary's.
+
+    Returns
+    -------
+    dict
+        The conversation's CONVERSATION_INDEX_FIELDS that are present.
+    """
+    entry = {key: summary[key] for key in CONVERSATION_INDEX_FIELDS if key in summary}
+    if conversation is not None:
+        entry.update(
+            (key, conversation[key]) for key in CONVERSATION_INDEX_FIELDS if key in conversation
+        )
+    return entry
+
+
+@functools.lru_cache(maxsize=1)
+def _formatter_fingerprint() -> str:
+    """Hash of the formatter source, so upgrading it invalidates rendered pages."""
+    source = Path(sys.modules[OutputFormatter.__module__].__file__).read_bytes()
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
+
+
+def page_signature(formatter: OutputFormatter, *inputs) -> str:
+    """
+    Fingerprint everything a rendered page depends on.
+
+    Parameters
+    ----------
+    formatter : OutputFormatter
+        Formatter that renders the page.
+    *inputs : Any
+        JSON-serializable page inputs (Paths are serialized as strings).
+
+    Returns
+    -------
+    str
+        Hex digest that changes whenever the page would render differently.
+    """
+    parts = [_formatter_fingerprint(), type(formatter).__name__, *inputs]
+    if orjson is not None:
+        payload = orjson.dumps(parts, default=str)
+    else:
+        payload = json.dumps(parts, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def load_page_signatures(directory: Path) -> dict[str, str]:
+    """
+    Load the signatures of pages rendered in a directory by earlier runs.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory holding the pages.
+
+    Returns
+    -------
+    dict[str, str]
+        Map of page name to signature; empty if none were saved.
+    """
+    try:
+        data = json_loads((directory / PAGE_SIGNATURES_FILENAME).read_bytes())
+    except (json.JSONDecodeError, OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_page_signatures(directory: Path, signatures: dict[str, str]) -> None:
+    """
+    Save page signatures for the next run.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory holding the pages.
+    signatures : dict[str, str]
+        Map of page name to signature.
+    """
+    _replace_file(directory / PAGE_SIGNATURES_FILENAME, json_dumps(signatures))
+
+
+def write_page(
+    path: Path,
+    signature: str,
+    signatures: dict[str, str],
+    key: str,
+    render: Callable[..., str],
+    *render_args,
+) -> bool:
+    """
+    Render and write a page unless its inputs are unchanged since the last run.
+
+    Parameters
+    ----------
+    path : Path
+        Destination file.
+    signature : str
+        Signature of the page inputs, from page_signature.
+    signatures : dict[str, str]
+        Signatures from earlier runs; updated when the page is written.
+    key : str
+        Name of the page within signatures.
+    render : Callable[..., str]
+        Produces the page content; only called when the page is written.
+    *render_args : Any
+        Arguments for render.
+
+    Returns
+    -------
+    bool
+        True if the page was written, False if it was already up to date.
+    """
+    if signatures.get(key) == signature and path.exists():
+        return False
+    path.write_bytes(render(*render_args).encode("utf-8"))
+    signatures[key] = signature
+    return True
+
+
+def write_observation_page(
+    formatter: OutputFormatter, path: Path, observation: dict, assets: dict[str, list[Path]]
+) -> None:
+    """
+    Render and write the index page of one observation.
+
+    A module-level function so that render processes can run it.
+
+    Parameters
+    ----------
+    formatter : OutputFormatter
+        Formatter used to render the page.
+    path : Path
+        Destination file.
+    observation : dict
+        Observation data from API.
+    assets : dict[str, list[Path]]
+        The observation's downloaded attachments, as returned by
+        FamlyDownloader.download_observation_assets.
+    """
+    formatter.write_observation(
+        path,
+        observation,
+        assets["images"],
+        FamlyDownloader._get_observation_dir_name,
+        file_paths=assets["files"],
+        video_paths=assets["videos"],
+    )
+
+
+def _gzip_file(path: Path) -> None:
+    """
+    Write a gzip-compressed copy of a file beside it, as path + ".gz".
+
+    The copy is written to a ".part" file first, so a static host never
+    serves a truncated one.
+
+    Parameters
+    ----------
+    path : Path
+        File to compress.
+    """
+    gz_path = path.with_name(f"{path.name}.gz")
+    part_path = gz_path.with_name(f"{gz_path.name}.part")
+    try:
+        # A fixed mtime keeps the output identical for identical pages
+        part_path.write_bytes(gzip.compress(path.read_bytes(), compresslevel=9, mtime=0))
+        os.replace(part_path, gz_path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+
+
+def precompress_pages(directory: Path, executor: Executor | None = None) -> int:
+    """
+    Write gzipped copies of rendered pages for static hosts to serve as-is.
+
+    Hosts such as nginx with gzip_static serve "page.html.gz" in place of
+    "page.html" to browsers that accept gzip. Only pages that are new or have
+    changed since their copy was written are compressed.
+
+    Parameters
+    ----------
+    directory : Path
+        Archive directory to scan recursively.
+    executor : Executor | None
+        Pool to compress on; compression runs in this thread if None.
+
+    Returns
+    -------
+    int
+        Number of pages compressed.
+    """
+    stale = []
+    for path in directory.rglob("*"):
+        if path.suffix not in PRECOMPRESS_SUFFIXES or path.name.startswith("."):
+            continue
+        try:
+            if path.with_name(f"{path.name}.gz").stat().st_mtime >= path.stat().st_mtime:
+                continue
+        except FileNotFoundError:
+            pass
+        stale.append(path)
+
+    if executor is None:
+        for path in stale:
+            _gzip_file(path)
+    else:
+        list(executor.map(_gzip_file, stale, chunksize=32))
+    return len(stale)
+
+
+def _fetch_after_delay(fetch, **kwargs):
+    """Call fetch(**kwargs) once PAGE_DELAY has passed."""
+    time.sleep(PAGE_DELAY)
+    return fetch(**kwargs)
+
+
+def _link_or_copy(source: Path, destination: Path) -> bool:
+    """
+    Hard-link a file to a second name, copying it if linking is not possible.
+
+    Parameters
+    ----------
+    source : Path
+        Existing file.
+    destination : Path
+        New path for the same content.
+
+    Returns
+    -------
+    bool
+        True if the destination now exists.
+    """
+    try:
+        os.link(source, destination)
+    except FileExistsError:
+        pass
+    except OSError:
+        try:
+            shutil.copyfile(source, destination)
+        except OSError as e:
+            print(f"  Warning: Could not copy {source.name} to {destination}: {e}")
+            return False
+    return True
+
+
+def _body_length(response: requests.Response) -> int | None:
+    """
+    Return the number of bytes a response body will write to disk, if known.
+
+    Parameters
+    ----------
+    response : requests.Response
+        Response whose body will be written.
+
+    Returns
+    -------
+    int | None
+        The Content-Length, or None if it is missing or the body is encoded
+        (the Content-Length of an encoded body is not the size written).
+    """
+    length = response.headers.get("Content-Length")
+    if not length or not length.isdigit() or "Content-Encoding" in response.headers:
+        return None
+    return int(length)
+
+
+def _preallocate(f, length: int | None) -> None:
+    """
+    Reserve disk space for a download whose size is known up front.
+
+    Large media files are otherwise grown one block at a time, which
+    fragments them on disk.
+
+    Parameters
+    ----------
+    f : BinaryIO
+        Destination file opened for writing.
+    length : int | None
+        Size of the body, from _body_length.
+    """
+    if not hasattr(os, "posix_fallocate") or not length or length < DOWNLOAD_CHUNK_SIZE:
+        return
+    # Not every filesystem supports it; the copy works either way
+    with contextlib.suppress(OSError):
+        os.posix_fallocate(f.fileno(), 0, length)
+
+
+def _copy_exact(source, f, size: int) -> None:
+    """
+    Copy exactly `size` bytes from a file-like object.
+
+    Parameters
+    ----------
+    source : BinaryIO
+        Stream to read from.
+    f : BinaryIO
+        Destination, positioned where the bytes belong.
+    size : int
+        Number of bytes to copy.
+    """
+    remaining = size
+    while remaining:
+        chunk = source.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise IncompleteRead(size - remaining, remaining)
+        f.write(chunk)
+        remaining -= len(chunk)
+
+
+def _read_config(config_path: Path) -> dict | None:
+    """
+    Return the parsed config file, reading it again only if it changed on disk.
+
+    A file with unsaved changes is always served from memory.
+
+    Parameters
+    ----------
+    config_path : Path
+        Path to the credentials or sync state file.
+
+    Returns
+    -------
+    dict | None
+        The config data, or None if the file is missing or invalid.
+    """
+    if config_path in _dirty_configs:
+        return _config_cache[config_path]
+
+    try:
+        mtime = config_path.stat().st_mtime_ns
+        if _config_mtimes.get(config_path) == mtime:
+            return _config_cache[config_path]
+        data = json_loads(config_path.read_bytes())
+    except (json.JSONDecodeError, OSError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    _config_cache[config_path] = data
+    _config_mtimes[config_path] = mtime
+    return data
+
+
+def _replace_file(path: Path, data: bytes, durable: bool = False) -> None:
+    """
+    Atomically replace a file's contents.
+
+    The data goes to a uniquely named temporary file beside the target, which
+    is then renamed over it, so readers and concurrent runs never see a torn
+    file. The temporary file is private to the user (mode 0600).
+
+    Parameters
+    ----------
+    path : Path
+        File to replace.
+    data : bytes
+        New contents.
+    durable : bool
+        Flush the data to disk before the rename, so a power cut cannot leave
+        an empty file behind.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def _write_config(config_path: Path, data: dict) -> None:
+    """
+    Atomically replace the config file and remember its contents.
+
+    Parameters
+    ----------
+    config_path : Path
+        Path to the credentials or sync state file.
+    data : dict
+        Config data to write.
+    """
+    _replace_file(config_path, json_dumps(data), durable=True)
+    _config_cache[config_path] = data
+    _config_mtimes[config_path] = config_path.stat().st_mtime_ns
+    _dirty_configs.discard(config_path)
 
 
 def load_cached_credentials(output_dir: Path) -> dict | None:
@@ -71,26 +754,13 @@ def load_cached_credentials(output_dir: Path) -> dict | None:
     dict | None
         Cached credentials dict or None if not found/invalid.
     """
-    config_path = output_dir / CONFIG_FILENAME
-    if not config_path.exists():
-        return None
-
-    try:
-        with open(config_path) as f:
-            data = json.load(f)
-        if data.get("access_token") and data.get("children"):
-            return data
-    except (json.JSONDecodeError, OSError):
-        pass
+    data = _read_config(output_dir / CONFIG_FILENAME)
+    if data and data.get("access_token") and data.get("children"):
+        return data
     return None
 
 
-def save_cached_credentials(
-    output_dir: Path,
-    access_token: str,
-    children: list,
-    last_sync: dict | None = None,
-) -> None:
+def save_cached_credentials(output_dir: Path, access_token: str, children: list) -> None:
     """
     Save credentials to the output directory.
 
@@ -102,62 +772,137 @@ def save_cached_credentials(
         The Famly API access token.
     children : list
         List of child dictionaries.
-    last_sync : dict | None
-        Dict mapping child_id to their newest image timestamp.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     config_path = output_dir / CONFIG_FILENAME
 
-    # Preserve existing last_sync data if not provided
-    existing_last_sync = {}
-    if config_path.exists() and last_sync is None:
-        try:
-            with open(config_path) as f:
-                existing = json.load(f)
-                existing_last_sync = existing.get("last_sync", {})
-        except (json.JSONDecodeError, OSError):
-            pass
+    # Carry any timestamps still stored in an old-style credentials file over
+    # to the sync state before the file is replaced
+    load_sync_state(output_dir)
 
     data = {
         "access_token": access_token,
         "children": children,
         "saved_at": datetime.now().isoformat(),
-        "last_sync": last_sync if last_sync is not None else existing_last_sync,
     }
-    with open(config_path, "w") as f:
-        json.dump(data, f, indent=2)
+    _write_config(config_path, data)
     print(f"  Credentials cached to {config_path}")
 
 
-def update_last_sync(output_dir: Path, child_id: str, timestamp: str) -> None:
+def _valid_sync_state(state) -> dict:
+    """Keep only well-formed {child_id: {kind: timestamp}} or legacy string entries."""
+    if not isinstance(state, dict):
+        return {}
+    valid = {}
+    for child_id, entry in state.items():
+        if isinstance(entry, str):
+            valid[child_id] = entry
+        elif isinstance(entry, dict):
+            valid[child_id] = {k: v for k, v in entry.items() if isinstance(v, str)}
+    return valid
+
+
+def load_sync_state(output_dir: Path) -> dict:
+    """
+    Load the last sync timestamps for every child, reading the file once per run.
+
+    Parameters
+    ----------
+    output_dir : Path
+        The output directory with the sync state file.
+
+    Returns
+    -------
+    dict
+        Dict mapping child_id to its last sync timestamps. Updated in place by
+        update_last_sync.
+    """
+    state_path = output_dir / SYNC_STATE_FILENAME
+    if state_path in _config_cache:
+        return _config_cache[state_path]
+
+    state = _read_config(state_path)
+    if state is None:
+        # Older versions kept the timestamps in the credentials file
+        legacy = _read_config(output_dir / CONFIG_FILENAME) or {}
+        state = legacy.get("last_sync")
+        if state:
+            _dirty_configs.add(state_path)
+    state = _valid_sync_state(state)
+    _config_cache[state_path] = state
+    return state
+
+
+def get_last_sync(last_sync: dict, child_id: str, kind: str = "images") -> str | None:
+    """
+    Look up a child's last sync timestamp for one kind of content.
+
+    Parameters
+    ----------
+    last_sync : dict
+        The sync state returned by load_sync_state.
+    child_id : str
+        The child's ID.
+    kind : str
+        Content kind, e.g. "images" or "conversations".
+
+    Returns
+    -------
+    str | None
+        The stored timestamp, or None if that kind has not been synced.
+    """
+    entry = last_sync.get(child_id)
+    # Older config files store a bare image timestamp per child
+    if isinstance(entry, str):
+        return entry if kind == "images" else None
+    if isinstance(entry, dict):
+        return entry.get(kind)
+    return None
+
+
+def update_last_sync(output_dir: Path, child_id: str, timestamp: str, kind: str = "images") -> None:
     """
     Update the last sync timestamp for a child.
 
+    The change is kept in memory until flush_sync_state is called.
+
     Parameters
     ----------
     output_dir : Path
-        The output directory with the config file.
+        The output directory with the sync state file.
     child_id : str
         The child's ID.
     timestamp : str
-        The newest image timestamp.
+        The newest timestamp seen for this kind of content.
+    kind : str
+        Content kind, e.g. "images" or "conversations".
     """
-    config_path = output_dir / CONFIG_FILENAME
-    if not config_path.exists():
-        return
+    last_sync = load_sync_state(output_dir)
+    entry = last_sync.get(child_id)
+    if not isinstance(entry, dict):
+        entry = {"images": entry} if entry else {}
+        last_sync[child_id] = entry
+    entry[kind] = timestamp
+    _dirty_configs.add(output_dir / SYNC_STATE_FILENAME)
 
-    try:
-        with open(config_path) as f:
-            data = json.load(f)
 
-        if "last_sync" not in data:
-            data["last_sync"] = {}
-        data["last_sync"][child_id] = timestamp
+def flush_sync_state(output_dir: Path) -> None:
+    """
+    Write pending last sync updates to the sync state file.
 
-        with open(config_path, "w") as f:
-            json.dump(data, f, indent=2)
-    except (json.JSONDecodeError, OSError):
-        pass
+    Parameters
+    ----------
+    output_dir : Path
+        The output directory with the sync state file.
+    """
+    state_path = output_dir / SYNC_STATE_FILENAME
+    if state_path not in _dirty_configs:
+        return
+
+    try:
+        _write_config(state_path, _config_cache[state_path])
+    except OSError as e:
+        print(f"  Warning: Could not save sync state to {state_path}: {e}")
 
 
 class FamlyBrowserAuth:
@@ -167,10 +912,24 @@ class FamlyBrowserAuth:
     """
 
     @staticmethod
-    def get_credentials_from_browser() -> dict:
+    def get_credentials_from_browser(
+        profile_dir: Path = BROWSER_PROFILE_DIR, cdp_endpoint: str | None = None
+    ) -> dict:
         """
         Open a browser for the user to login and extract credentials.
 
+        The browser profile is kept between runs, so while the Famly session
+        is still valid no sign-in is needed and the window closes by itself.
+
+        Parameters
+        ----------
+        profile_dir : Path
+            Directory holding the persistent Chromium profile.
+        cdp_endpoint : str | None
+            DevTools endpoint of an already running Chromium (started with
+            --remote-debugging-port). A tab is opened in it instead of
+            launching a browser, and the browser is left running.
+
         Returns
         -------
         dict
@@ -192,40 +951,81 @@ class FamlyBrowserAuth:
         credentials = {"access_token": None, "children": []}
 
         with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)
-            context = browser.new_context()
-            page = context.new_page()
+            if cdp_endpoint:
+                browser = p.chromium.connect_over_cdp(cdp_endpoint)
+                context = browser.contexts[0] if browser.contexts else browser.new_context()
+                page = context.new_page()
+            else:
+                profile_dir.mkdir(parents=True, exist_ok=True)
+                context = p.chromium.launch_persistent_context(str(profile_dir), headless=False)
+                page = context.pages[0] if context.pages else context.new_page()
+
+            # Only the API traffic matters here; skip photos, fonts and video so
+            # the app reaches the account page sooner. Stylesheets still load so
+            # the login form stays usable.
+            page.route(
+                "**/*",
+                lambda route: (
+                    route.abort()
+                    if route.request.resource_type in BLOCKED_LOGIN_RESOURCES
+                    else route.continue_()
+                ),
+            )
 
             access_token = None
+            sidebar = None
+
+            def request_token(request) -> str | None:
+                if "app.famly.co/api" in request.url or "app.famly.co/graphql" in request.url:
+                    return request.headers.get("x-famly-accesstoken")
+                return None
 
             def handle_request(request):
                 nonlocal access_token
-                if "app.famly.co/api" in request.url or "app.famly.co/graphql" in request.url:
-                    headers = request.headers
-                    if "x-famly-accesstoken" in headers:
-                        access_token = headers["x-famly-accesstoken"]
+                token = request_token(request)
+                if token:
+                    access_token = token
+
+            def handle_response(response):
+                # The app loads the sidebar, which lists the children, right
+                # after login; keep it so it doesn't have to be fetched again
+                nonlocal sidebar
+                if "app.famly.co/api/v2/sidebar" in response.url and response.ok:
+                    with contextlib.suppress(Exception):
+                        sidebar = json_loads(response.body())
 
             page.on("request", handle_request)
+            page.on("response", handle_response)
 
-            page.goto("https://app.famly.co/#/login")
+            # The app routes to the login form, or straight to the account when
+            # the saved session is still valid
+            page.goto("https://app.famly.co/")
 
             print("Waiting for login...")
             try:
                 page.wait_for_url("**/account/**", timeout=300000)
-                time.sleep(2)
+                # Return as soon as an API call has carried the token rather
+                # than waiting a fixed time
+                if access_token is None:
+                    page.wait_for_request(request_token, timeout=10000)
             except Exception as e:
                 print(f"Timeout or error waiting for login: {e}")
 
-            browser.close()
+            # A browser we connected to belongs to the user; only close our tab
+            if cdp_endpoint:
+                page.close()
+            else:
+                context.close()
 
         if access_token:
             credentials["access_token"] = access_token
-            credentials["children"] = FamlyBrowserAuth._fetch_children(access_token)
+            children = FamlyBrowserAuth._children_from_sidebar(sidebar) if sidebar else []
+            credentials["children"] = children or FamlyBrowserAuth._fetch_children(access_token)
 
         return credentials
 
     @staticmethod
-    def _fetch_children(access_token: str) -> list:
+    def _fetch_children(access_token: str, session: requests.Session | None = None) -> list:
         """
         Fetch children list directly from the API.
 
@@ -233,42 +1033,61 @@ class FamlyBrowserAuth:
         ----------
         access_token : str
             The Famly API access token.
+        session : requests.Session | None
+            Session to reuse for the request. A pooled one-off session is used if None.
 
         Returns
         -------
         list
             List of child dictionaries with 'id' and 'name'.
         """
-        children = []
         headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:146.0) Gecko/20100101 Firefox/146.0",
             "Accept": "*/*",
             "x-famly-accesstoken": access_token,
         }
 
-        # Fetch sidebar - children appear as items with type "Famly.Daycare:Child"
+        owns_session = session is None
+        if owns_session:
+            session = requests.Session()
+            mount_pooled_adapter(session)
+
         try:
-            response = requests.get(
+            response = session.get(
                 "https://app.famly.co/api/v2/sidebar",
                 headers=headers,
                 timeout=10,
             )
             response.raise_for_status()
-            data = response.json()
-
-            for item in data.get("items", []):
-                item_type = item.get("type", "")
-                if "Child" in item_type:
-                    children.append(
-                        {
-                            "id": item.get("id"),
-                            "name": item.get("title", "Unknown"),
-                        }
-                    )
+            return FamlyBrowserAuth._children_from_sidebar(json_loads(response.content))
         except Exception as e:
             print(f"  Warning: Could not fetch children: {e}")
+            return []
+        finally:
+            if owns_session:
+                session.close()
 
-        return children
+    @staticmethod
+    def _children_from_sidebar(data: dict) -> list:
+        """
+        Extract the children from a sidebar API response.
+
+        Parameters
+        ----------
+        data : dict
+            Decoded response of the /api/v2/sidebar endpoint.
+
+        Returns
+        -------
+        list
+            List of child dictionaries with 'id' and 'name'.
+        """
+        # Children appear as items with type "Famly.Daycare:Child"
+        return [
+            {"id": item.get("id"), "name": item.get("title", "Unknown")}
+            for item in data.get("items", [])
+            if "Child" in item.get("type", "")
+        ]
 
 
 class FamlyDownloader:
@@ -287,9 +1106,68 @@ class FamlyDownloader:
         Whether to download high-resolution versions.
     max_workers : int
         Number of parallel download threads.
+    max_connections : int | None
+        Cap on concurrent connections per host, or None for no cap.
+    executor : ThreadPoolExecutor | None
+        Download pool to share with other downloaders; one is created if None.
+    sessions : tuple[requests.Session, requests.Session] | None
+        API and media sessions from create_sessions to share with other
+        downloaders; new ones are created if None.
     """
 
     BASE_URL = "https://app.famly.co/api/v2"
+    IMAGES_URL = f"{BASE_URL}/images/tagged"
+    CONVERSATIONS_URL = f"{BASE_URL}/conversations"
+    GRAPHQL_URL = "https://app.famly.co/graphql"
+
+    OBSERVATIONS_QUERY = """
+    query GetObservations($childIds: [ChildId!], $first: Int!, $after: ObservationCursor) {
+      childDevelopment {
+        observations(childIds: $childIds, first: $first, after: $after) {
+          results {
+            id
+            createdBy { name { fullName } profileImage { url } }
+            remark { id date body richTextBody }
+            children { id name }
+            images { id width height url secret { prefix key path expires } }
+            files { id name url }
+            videos {
+              ... on TranscodedVideo {
+                id
+                videoUrl
+                thumbnailUrl
+                duration
+                width
+                height
+              }
+            }
+            behaviors { behaviorId }
+            likes {
+              count
+              likedByMe
+              likes {
+                likedBy { name { fullName } }
+                reaction
+              }
+            }
+            comments {
+              count
+              results {
+                id
+                body
+                sentBy { name { fullName } profileImage { url } }
+                sentAt
+              }
+            }
+          }
+          next
+        }
+      }
+    }
+    """
+
+    # JSON request body up to (but excluding) the closing brace
+    _OBSERVATIONS_BODY_PREFIX = json.dumps({"query": OBSERVATIONS_QUERY})[:-1].encode()
 
     def __init__(
         self,
@@ -298,31 +1176,148 @@ class FamlyDownloader:
         output_dir: str = "./famly_photos",
         download_big: bool = True,
         max_workers: int = 4,
+        max_connections: int | None = None,
+        executor: ThreadPoolExecutor | None = None,
+        sessions: tuple[requests.Session, requests.Session] | None = None,
     ):
         self.child_id = child_id
         self.access_token = access_token
         self.output_dir = Path(output_dir)
         self.download_big = download_big
         self.max_workers = max_workers
+        self.max_connections = max_connections
+
+        # Query parameters shared by every page of the image list
+        self._image_params = {"childId": child_id}
+
+        # API and media sessions from create_sessions. Like the executor, sessions
+        # passed in by the caller keep their warm connections after close().
+        self._owns_sessions = sessions is None
+        if sessions is None:
+            sessions = self.create_sessions(access_token, max_workers, max_connections)
+        self.session, self.download_session = sessions
+
+        # Shared download pool, bounded by max_workers. A pool passed in by the
+        # caller (e.g. one reused across children) is left running on close().
+        self._executor = executor
+        self._owns_executor = executor is None
+
+        # Fetches the extra ranges of large files; kept apart from the main
+        # pool so a download waiting on its ranges can't starve them
+        self._range_executor = ThreadPoolExecutor(max_workers=MULTIPART_PARTS)
+
+        # Directories known to exist, and parents whose subdirectories were
+        # all recorded in _known_dirs by a single listing
+        self._known_dirs: set[Path] = set()
+        self._scanned_dirs: set[Path] = set()
+
+        # Local copy of each media URL seen this run, so an attachment shared
+        # by several observations or messages is only downloaded once
+        self._url_paths: dict[str, Path] = {}
+
+        # Directory name of each observation seen this run, by observation id;
+        # it is needed for its attachments, its page and the feed
+        self._observation_dir_names: dict[str, str] = {}
+
+        # Conversations with message images that failed to download this run;
+        # the conversations sync mark must not move past them
+        self.incomplete_conversations: set[str] = set()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the shared download thread pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _ensure_dir(self, path: Path) -> None:
+        """Create a directory (and parents) unless it was already created this run."""
+        if path not in self._known_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(path)
+
+    def close(self) -> None:
+        """Shut down the download pool and close pooled connections."""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._range_executor.shutdown(wait=True)
+        if self._owns_sessions:
+            self.session.close()
+            self.download_session.close()
+
+    def __enter__(self) -> "FamlyDownloader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def create_sessions(
+        access_token: str,
+        max_workers: int = 4,
+        max_connections: int | None = None,
+        rate_limit: float | None = None,
+    ) -> tuple[requests.Session, requests.Session]:
+        """
+        Create the API and media download sessions.
+
+        Media gets a connection pool of its own so large downloads never starve
+        API calls. The sessions can be shared by several downloaders using the
+        same access token.
+
+        Parameters
+        ----------
+        access_token : str
+            The Famly API access token.
+        max_workers : int
+            Number of threads that will share the sessions.
+        max_connections : int | None
+            Hard cap on open connections per host, or None for no cap.
+        rate_limit : float | None
+            Most requests per second across both sessions, or None for no limit.
 
-        self.session = requests.Session()
-        self._setup_session()
+        Returns
+        -------
+        tuple[requests.Session, requests.Session]
+            The API session and the media download session.
+        """
+        user_agent = (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:146.0) Gecko/20100101 Firefox/146.0"
+        )
 
-    def _setup_session(self):
-        """Configure the requests session with necessary headers."""
-        self.session.headers.update(
+        rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+
+        session = requests.Session()
+        mount_pooled_adapter(session, max_workers, max_connections, rate_limiter)
+        session.headers.update(
             {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:146.0) Gecko/20100101 Firefox/146.0",
+                "User-Agent": user_agent,
                 "Accept": "*/*",
                 "Accept-Language": "en-GB,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate, br",
+                # Only advertise encodings urllib3 can decode (br needs brotli installed)
+                "Accept-Encoding": ACCEPT_ENCODING,
                 "Referer": "https://app.famly.co/",
                 "content-type": "application/json",
-                "x-famly-accesstoken": self.access_token,
+                "x-famly-accesstoken": access_token,
                 "x-famly-platform": "docker",
             }
         )
 
+        download_session = requests.Session()
+        mount_pooled_adapter(download_session, max_workers, max_connections, rate_limiter)
+        download_session.headers.update(
+            {
+                "User-Agent": user_agent,
+                "Accept": "*/*",
+                # Media is already compressed; ask for the raw bytes
+                "Accept-Encoding": "identity",
+                "Referer": "https://app.famly.co/",
+                "x-famly-accesstoken": access_token,
+            }
+        )
+
+        return session, download_session
+
     def fetch_image_list(self, older_than: str | None = None, limit: int = 100) -> list:
         """
         Fetch a batch of images from the Famly API.
@@ -339,17 +1334,76 @@ class FamlyDownloader:
         list
             List of image metadata dictionaries.
         """
-        url = f"{self.BASE_URL}/images/tagged"
-        params = {
-            "childId": self.child_id,
-            "limit": limit,
-        }
+        params = {**self._image_params, "limit": limit}
         if older_than:
             params["olderThan"] = older_than
 
-        response = self.session.get(url, params=params)
+        response = self.session.get(self.IMAGES_URL, params=params, timeout=30)
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
+
+    def iter_image_pages(
+        self, batch_size: int = 100, stop_at: str | None = None
+    ) -> Iterator[list[dict]]:
+        """
+        Yield the child's images one page at a time, newest first.
+
+        The next page is fetched in the background while the caller works on
+        the current one, so downloads and page fetches overlap.
+
+        Parameters
+        ----------
+        batch_size : int
+            Number of images to fetch per request.
+        stop_at : str | None
+            Stop fetching when reaching images older than this timestamp.
+
+        Yields
+        ------
+        list[dict]
+            A non-empty page of image metadata.
+        """
+        # An incremental sync usually finds only a handful of new images, so
+        # start with a small page and double it while pages keep coming back full
+        limit = min(batch_size, 20) if stop_at else batch_size
+
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(self.fetch_image_list, limit=limit)
+            while pending is not None:
+                batch = pending.result()
+                pending = None
+
+                if not batch:
+                    break
+                page_full = len(batch) >= limit
+
+                # Filter out images we've already synced. Pages are sorted newest
+                # first, so only a page whose oldest image is synced needs scanning,
+                # and everything from the first synced image onwards is dropped.
+                reached_existing = False
+                if stop_at and batch[-1].get("createdAt", "") <= stop_at:
+                    cut = next(
+                        i for i, img in enumerate(batch) if img.get("createdAt", "") <= stop_at
+                    )
+                    batch = batch[:cut]
+                    reached_existing = True
+
+                # Use the oldest image's timestamp for the next page
+                older_than = batch[-1].get("createdAt") if batch else None
+                if not reached_existing and page_full and older_than:
+                    limit = min(batch_size, limit * 2)
+                    pending = prefetcher.submit(
+                        _fetch_after_delay,
+                        self.fetch_image_list,
+                        older_than=older_than,
+                        limit=limit,
+                    )
+
+                if batch:
+                    yield batch
+
+                if reached_existing:
+                    print("  Reached previously synced images")
 
     def fetch_all_images(self, batch_size: int = 100, stop_at: str | None = None) -> list:
         """
@@ -368,47 +1422,16 @@ class FamlyDownloader:
             Complete list of all image metadata.
         """
         all_images = []
-        older_than = None
-        reached_existing = False
 
         if stop_at:
             print("Fetching new images since last sync...")
         else:
             print("Fetching all images from Famly...")
 
-        while True:
-            batch = self.fetch_image_list(older_than=older_than, limit=batch_size)
-
-            if not batch:
-                break
-
-            # Filter out images we've already synced
-            if stop_at:
-                new_batch = []
-                for img in batch:
-                    if img.get("createdAt", "") <= stop_at:
-                        reached_existing = True
-                        break
-                    new_batch.append(img)
-                batch = new_batch
-
-            if batch:
-                all_images.extend(batch)
-                print(f"  Found {len(all_images)} new images so far...")
-
-            if reached_existing or len(batch) < batch_size:
-                break
-
-            # Use the oldest image's timestamp for the next page
-            last_image = batch[-1]
-            older_than = last_image.get("createdAt")
-            if not older_than:
-                break
-
-            time.sleep(0.5)
+        for batch in self.iter_image_pages(batch_size, stop_at):
+            all_images.extend(batch)
+            print(f"  Found {len(all_images)} new images so far...")
 
-        if reached_existing:
-            print("  Reached previously synced images")
         print(f"Total new images found: {len(all_images)}")
         return all_images
 
@@ -428,51 +1451,6 @@ class FamlyDownloader:
         dict
             GraphQL response with 'results' list and 'next' cursor.
         """
-        query = """
-        query GetObservations($childIds: [ChildId!], $first: Int!, $after: ObservationCursor) {
-          childDevelopment {
-            observations(childIds: $childIds, first: $first, after: $after) {
-              results {
-                id
-                createdBy { name { fullName } profileImage { url } }
-                remark { id date body richTextBody }
-                children { id name }
-                images { id width height url secret { prefix key path expires } }
-                files { id name url }
-                videos {
-                  ... on TranscodedVideo {
-                    id
-                    videoUrl
-                    thumbnailUrl
-                    duration
-                    width
-                    height
-                  }
-                }
-                behaviors { behaviorId }
-                likes {
-                  count
-                  likedByMe
-                  likes {
-                    likedBy { name { fullName } }
-                    reaction
-                  }
-                }
-                comments {
-                  count
-                  results {
-                    id
-                    body
-                    sentBy { name { fullName } profileImage { url } }
-                    sentAt
-                  }
-                }
-              }
-              next
-            }
-          }
-        }
-        """
         variables = {
             "childIds": [self.child_id],
             "first": first,
@@ -480,55 +1458,87 @@ class FamlyDownloader:
         if after:
             variables["after"] = after
 
-        response = self.session.post(
-            "https://app.famly.co/graphql",
-            json={"query": query, "variables": variables},
+        # Only the variables change between pages; the query is pre-encoded
+        body = b"".join(
+            (
+                self._OBSERVATIONS_BODY_PREFIX,
+                b', "variables": ',
+                json.dumps(variables).encode(),
+                b"}",
+            )
         )
+        response = self.session.post(self.GRAPHQL_URL, data=body, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
 
         if "errors" in data:
             raise ValueError(f"GraphQL errors: {data['errors']}")
 
         return data["data"]["childDevelopment"]["observations"]
 
-    def fetch_all_observations(self, batch_size: int = 50) -> list:
+    def iter_observation_pages(self, batch_size: int = 50) -> Iterator[list[dict]]:
         """
-        Fetch all observations for the child with cursor-based pagination.
+        Yield the child's observations one page at a time.
+
+        The next page is fetched in the background while the caller works on
+        the current one, so downloads and page fetches overlap.
 
         Parameters
         ----------
         batch_size : int
             Number of observations to fetch per request.
 
-        Returns
-        -------
-        list
-            Complete list of all observation dictionaries.
+        Yields
+        ------
+        list[dict]
+            A page of observation dictionaries.
         """
-        all_observations = []
-        cursor = None
+        total = 0
 
         print("Fetching observations from Famly...")
 
-        while True:
-            result = self.fetch_observations(first=batch_size, after=cursor)
-            batch = result.get("results", [])
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(self.fetch_observations, first=batch_size)
+            while pending is not None:
+                result = pending.result()
+                batch = result.get("results", [])
+
+                if not batch:
+                    break
+
+                cursor = result.get("next")
+                pending = (
+                    prefetcher.submit(
+                        _fetch_after_delay,
+                        self.fetch_observations,
+                        first=batch_size,
+                        after=cursor,
+                    )
+                    if cursor
+                    else None
+                )
 
-            if not batch:
-                break
+                total += len(batch)
+                print(f"  Found {total} observations so far...")
+                yield batch
 
-            all_observations.extend(batch)
-            print(f"  Found {len(all_observations)} observations so far...")
+        print(f"Total observations found: {total}")
 
-            cursor = result.get("next")
-            if not cursor:
-                break
+    def fetch_all_observations(self, batch_size: int = 50) -> list:
+        """
+        Fetch all observations for the child with cursor-based pagination.
 
-            time.sleep(0.5)
+        Parameters
+        ----------
+        batch_size : int
+            Number of observations to fetch per request.
 
-        print(f"Total observations found: {len(all_observations)}")
-        return all_observations
+        Returns
+        -------
+        list
+            Complete list of all observation dictionaries.
+        """
+        return [obs for page in self.iter_observation_pages(batch_size) for obs in page]
 
     def fetch_conversations(self) -> list[dict]:
         """
@@ -539,10 +1549,9 @@ class FamlyDownloader:
         list[dict]
             List of conversation summaries with conversationId, participants, etc.
         """
-        url = "https://app.famly.co/api/v2/conversations"
-        response = self.session.get(url, timeout=30)
+        response = self.session.get(self.CONVERSATIONS_URL, timeout=30)
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
 
     def fetch_conversation_messages(self, conversation_id: str) -> dict:
         """
@@ -558,12 +1567,43 @@ class FamlyDownloader:
         dict
             Full conversation data including messages array.
         """
-        url = f"https://app.famly.co/api/v2/conversations/{conversation_id}"
-        response = self.session.get(url, timeout=30)
+        response = self.session.get(f"{self.CONVERSATIONS_URL}/{conversation_id}", timeout=30)
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
 
-    def _slugify(self, text: str, max_length: int = 30) -> str:
+    def iter_conversation_messages(self, conversation_ids: list[str]) -> Iterator[dict]:
+        """
+        Fetch several conversations concurrently, yielding them in order.
+
+        Parameters
+        ----------
+        conversation_ids : list[str]
+            Conversation UUIDs to fetch.
+
+        Yields
+        ------
+        dict
+            Full conversation data, in the order of conversation_ids.
+        """
+        # A pool of its own: callers download message images on the shared
+        # pool while later conversations are still being fetched. At most
+        # 2 * max_workers conversations are fetched ahead of the caller, so
+        # a long history is never held in memory all at once.
+        ids = iter(conversation_ids)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as fetcher:
+            pending = deque(
+                fetcher.submit(self.fetch_conversation_messages, conv_id)
+                for conv_id in itertools.islice(ids, 2 * self.max_workers)
+            )
+            while pending:
+                conversation = pending.popleft().result()
+                for conv_id in itertools.islice(ids, 1):
+                    pending.append(fetcher.submit(self.fetch_conversation_messages, conv_id))
+                yield conversation
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _slugify(text: str, max_length: int = 30) -> str:
         """
         Convert text to a URL/filesystem-safe slug.
 
@@ -580,12 +1620,16 @@ class FamlyDownloader:
             Slugified text.
         """
         slug = text.lower()
-        slug = re.sub(r"[^\w\s-]", "", slug)
-        slug = re.sub(r"[\s_]+", "-", slug)
+        if slug.isascii():
+            slug = slug.translate(_SLUG_ASCII_STRIP)
+        else:
+            slug = _SLUG_STRIP_RE.sub("", slug)
+        slug = _SLUG_DASH_RE.sub("-", slug)
         slug = slug.strip("-")
         return slug[:max_length].rstrip("-")
 
-    def _get_observation_dir_name(self, observation: dict) -> str:
+    @staticmethod
+    def _get_observation_dir_name(observation: dict) -> str:
         """
         Generate a directory name for an observation.
 
@@ -604,37 +1648,316 @@ class FamlyDownloader:
         obs_id = observation.get("id", "unknown")[:8]
 
         # Get first line or first few words for the slug
-        first_line = body.split("\n")[0] if body else "observation"
-        slug = self._slugify(first_line)
+        first_line = body.partition("\n")[0] if body else "observation"
+        slug = FamlyDownloader._slugify(first_line)
         if not slug:
             slug = "observation"
 
         return f"{date}_{slug}_{obs_id}"
 
-    def download_observation_images(self, observation: dict, obs_dir: Path) -> list[Path]:
+    def _cached_observation_dir_name(self, observation: dict) -> str:
         """
-        Download all images for an observation to obs_dir/img/.
+        Get an observation's directory name, computing it once per run.
 
         Parameters
         ----------
         observation : dict
             Observation data from API.
-        obs_dir : Path
-            Directory for this observation.
+
+        Returns
+        -------
+        str
+            Directory name, as from _get_observation_dir_name.
+        """
+        obs_id = observation.get("id")
+        if obs_id is None:
+            return self._get_observation_dir_name(observation)
+        dir_name = self._observation_dir_names.get(obs_id)
+        if dir_name is None:
+            dir_name = self._observation_dir_names[obs_id] = self._get_observation_dir_name(
+                observation
+            )
+        return dir_name
+
+    @staticmethod
+    def _stream_to_file(response: requests.Response, filepath: Path) -> None:
+        """
+        Copy a streamed response body to disk.
+
+        The body is written to a ".part" file that is renamed into place once
+        complete, so an interrupted download never leaves a truncated file that
+        later runs would treat as already downloaded. A body shorter than its
+        Content-Length is rejected for the same reason.
+
+        Parameters
+        ----------
+        response : requests.Response
+            Response opened with stream=True.
+        filepath : Path
+            Destination file path.
+        """
+        part_path = filepath.with_name(filepath.name + ".part")
+        try:
+            # Let urllib3 undo any Content-Encoding, then copy in large blocks
+            response.raw.decode_content = True
+            length = _body_length(response)
+            with open(part_path, "wb") as f:
+                _preallocate(f, length)
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                written = f.tell()
+                # Drop any reserved space the body did not fill
+                f.truncate()
+            # Older urllib3 releases don't check this themselves
+            if length is not None and written != length:
+                raise OSError(f"Incomplete download: got {written} of {length} bytes")
+            os.replace(part_path, filepath)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+    def _stream_in_parts(
+        self, response: requests.Response, url: str, filepath: Path, length: int, timeout: int
+    ) -> None:
+        """
+        Download a large file as several byte ranges fetched in parallel.
+
+        The open response supplies the first range; the others are requested
+        with Range headers and written at their offsets in the ".part" file,
+        which is renamed into place once every range is complete. A range whose
+        transfer fails is requested again under RETRY_POLICY, so the completed
+        ones are kept; _RangeNotHonoured is raised if the server ignores a
+        Range header.
+
+        Parameters
+        ----------
+        response : requests.Response
+            Response opened with stream=True for the whole file.
+        url : str
+            URL of the file, for the range requests.
+        filepath : Path
+            Destination file path.
+        length : int
+            Size of the file, from _body_length.
+        timeout : int
+            Request timeout in seconds.
+        """
+        part_size = -(-length // MULTIPART_PARTS)
+        ranges = [
+            (start, min(start + part_size, length) - 1)
+            for start in range(part_size, length, part_size)
+        ]
+        part_path = filepath.with_name(filepath.name + ".part")
+        futures = []
+
+        def fetch_range(start: int, end: int) -> None:
+            headers = {"Range": f"bytes={start}-{end}"}
+            retries = RETRY_POLICY.new()
+            while True:
+                try:
+                    with self.download_session.get(
+                        url, headers=headers, stream=True, timeout=timeout
+                    ) as ranged:
+                        ranged.raise_for_status()
+                        content_range = ranged.headers.get("Content-Range", "")
+                        if ranged.status_code != 206 or not content_range.startswith(
+                            f"bytes {start}-{end}/"
+                        ):
+                            raise _RangeNotHonoured(
+                                f"Server ignored range request for bytes {start}-{end}"
+                            )
+                        with open(part_path, "r+b") as f:
+                            f.seek(start)
+                            _copy_exact(ranged.raw, f, end - start + 1)
+                    return
+                except RANGE_RETRY_ERRORS as e:
+                    # Raises MaxRetryError once the policy's attempts are spent
+                    retries = retries.increment("GET", url, error=e)
+                    retries.sleep()
+
+        try:
+            with open(part_path, "wb") as f:
+                _preallocate(f, length)
+                f.truncate(length)
+
+            futures = [self._range_executor.submit(fetch_range, *r) for r in ranges]
+
+            # Read the first range from the response already open, then drop
+            # the rest of its body
+            try:
+                with open(part_path, "r+b") as f:
+                    _copy_exact(response.raw, f, part_size)
+            except RANGE_RETRY_ERRORS:
+                # The open response broke off; request its range like the others
+                response.close()
+                fetch_range(0, part_size - 1)
+            response.close()
+
+            for future in futures:
+                future.result()
+            os.replace(part_path, filepath)
+        except BaseException:
+            # Let running ranges finish before their file is removed
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            part_path.unlink(missing_ok=True)
+            raise
+
+    def _download_stream(self, url: str, filepath: Path, timeout: int, label: str) -> Path | None:
+        """
+        Stream a URL to a local file.
+
+        Parameters
+        ----------
+        url : str
+            URL to download.
+        filepath : Path
+            Destination file path.
+        timeout : int
+            Request timeout in seconds.
+        label : str
+            Human-readable description used in warnings (e.g. "image 1a2b3c4d").
+
+        Returns
+        -------
+        Path | None
+            The destination path on success, or None if the download failed.
+        """
+        try:
+            # Closing the response hands its connection back to the pool even
+            # when the request fails before the body is read
+            with self.download_session.get(url, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                length = _body_length(response)
+                if (
+                    length is None
+                    or length < MULTIPART_MIN_SIZE
+                    or response.headers.get("Accept-Ranges") != "bytes"
+                ):
+                    self._stream_to_file(response, filepath)
+                    return filepath
+                try:
+                    self._stream_in_parts(response, url, filepath, length, timeout)
+                    return filepath
+                except _RangeNotHonoured:
+                    # Range support can be advertised but broken; fetch it whole
+                    pass
+
+            with self.download_session.get(url, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                self._stream_to_file(response, filepath)
+            return filepath
+        except Exception as e:
+            print(f"  Warning: Failed to download {label}: {e}")
+            return None
+
+    def _download_many(
+        self, tasks: list[tuple[str, Path, int, str]], progress: str | None = None
+    ) -> list[Path]:
+        """
+        Download several files in parallel.
+
+        Parameters
+        ----------
+        tasks : list[tuple[str, Path, int, str]]
+            (url, filepath, timeout, label) tuples; see _download_stream.
+        progress : str | None
+            Description for a progress bar, or None to download silently.
 
         Returns
         -------
         list[Path]
-            List of paths to downloaded images.
+            Paths of the successful downloads, in task order.
+        """
+        if not tasks:
+            return []
+        if len(tasks) == 1 and progress is None:
+            results = [self._download_stream(*tasks[0])]
+        elif progress is None:
+            executor = self._get_executor()
+            results = list(executor.map(lambda task: self._download_stream(*task), tasks))
+        else:
+            executor = self._get_executor()
+            futures = [executor.submit(self._download_stream, *task) for task in tasks]
+            for _ in tqdm(
+                as_completed(futures),
+                total=len(futures),
+                desc=progress,
+                unit="file",
+                miniters=progress_miniters(len(futures)),
+            ):
+                pass
+            results = [future.result() for future in futures]
+        return [path for path in results if path is not None]
+
+    def _download_missing(
+        self, tasks: list[tuple[str, Path, int, str]], progress: str | None = None
+    ) -> list[Path]:
+        """
+        Download the tasks whose files do not exist yet, keeping task order.
+
+        Parameters
+        ----------
+        tasks : list[tuple[str, Path, int, str]]
+            (url, filepath, timeout, label) tuples; see _download_stream.
+        progress : str | None
+            Description for a progress bar, or None to download silently.
+
+        Returns
+        -------
+        list[Path]
+            Paths of existing and successfully downloaded files, in task order.
         """
-        images = observation.get("images", [])
+        # Check existence up front (one scandir per directory rather than a
+        # stat per file) so worker threads never race on it
+        listings: dict[Path, set[str]] = {}
+        existing = set()
+        for task in tasks:
+            filepath = task[1]
+            if filepath.parent not in listings:
+                listings[filepath.parent] = list_filenames(filepath.parent)
+            if filepath.name in listings[filepath.parent]:
+                existing.add(filepath)
+                self._url_paths.setdefault(task[0], filepath)
+
+        # Fetch each missing path once, even if several tasks share it, and
+        # each URL once: paths whose URL is already on disk are linked to it
+        to_fetch: dict[str, tuple[str, Path, int, str]] = {}
+        to_link = []
+        for task in {task[1]: task for task in tasks if task[1] not in existing}.values():
+            if task[0] in self._url_paths or task[0] in to_fetch:
+                to_link.append(task)
+            else:
+                to_fetch[task[0]] = task
+
+        # Only directories that will receive a file need creating
+        for parent in {task[1].parent for task in (*to_fetch.values(), *to_link)}:
+            self._ensure_dir(parent)
+
+        # Start the slowest kinds (videos, then files) first so a mixed batch
+        # does not finish with a lone large download straggling on one worker
+        missing = sorted(to_fetch.values(), key=lambda task: task[2], reverse=True)
+        fetched = set(self._download_many(missing, progress))
+        for task in missing:
+            if task[1] in fetched:
+                self._url_paths[task[0]] = task[1]
+        for task in to_link:
+            source = self._url_paths.get(task[0])
+            if source is not None and _link_or_copy(source, task[1]):
+                fetched.add(task[1])
+
+        return [task[1] for task in tasks if task[1] in existing or task[1] in fetched]
+
+    def _observation_image_tasks(
+        self, images: list[dict], obs_dir: Path
+    ) -> list[tuple[str, Path, int, str]]:
+        """Build download tasks for an observation's images under obs_dir/img/."""
         if not images:
             return []
 
         img_dir = obs_dir / "img"
-        img_dir.mkdir(parents=True, exist_ok=True)
 
-        downloaded = []
+        tasks = []
         for img in images:
             img_id = img.get("id", "unknown")
             url = img.get("url", "")
@@ -648,29 +1971,55 @@ class FamlyDownloader:
                 ext = ".jpg"
 
             filename = f"{img_id[:8]}{ext}"
-            filepath = img_dir / filename
+            tasks.append((url, img_dir / filename, 30, f"image {img_id[:8]}"))
+
+        return tasks
+
+    def _observation_file_tasks(
+        self, files: list[dict], obs_dir: Path
+    ) -> list[tuple[str, Path, int, str]]:
+        """Build download tasks for an observation's attachments under obs_dir/files/."""
+        if not files:
+            return []
+
+        files_dir = obs_dir / "files"
 
-            if filepath.exists():
-                downloaded.append(filepath)
+        tasks = []
+        for file in files:
+            file_id = file.get("id", "unknown")
+            url = file.get("url", "")
+            name = file.get("name", f"{file_id}.pdf")
+            if not url:
                 continue
 
-            try:
-                response = self.session.get(url, stream=True, timeout=30)
-                response.raise_for_status()
+            tasks.append((url, files_dir / name, 60, f"file {name}"))
 
-                with open(filepath, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+        return tasks
 
-                downloaded.append(filepath)
-            except Exception as e:
-                print(f"  Warning: Failed to download image {img_id[:8]}: {e}")
+    def _observation_video_tasks(
+        self, videos: list[dict], obs_dir: Path
+    ) -> list[tuple[str, Path, int, str]]:
+        """Build download tasks for an observation's videos under obs_dir/videos/."""
+        if not videos:
+            return []
 
-        return downloaded
+        videos_dir = obs_dir / "videos"
 
-    def download_observation_files(self, observation: dict, obs_dir: Path) -> list[Path]:
+        tasks = []
+        for video in videos:
+            video_id = video.get("id", "unknown")
+            url = video.get("videoUrl", "")
+            if not url:
+                continue
+
+            filename = f"{video_id[:8]}.mp4"
+            tasks.append((url, videos_dir / filename, 120, f"video {video_id[:8]}"))
+
+        return tasks
+
+    def download_observation_images(self, observation: dict, obs_dir: Path) -> list[Path]:
         """
-        Download all file attachments for an observation to obs_dir/files/.
+        Download all images for an observation to obs_dir/img/.
 
         Parameters
         ----------
@@ -682,42 +2031,29 @@ class FamlyDownloader:
         Returns
         -------
         list[Path]
-            List of paths to downloaded files.
+            List of paths to downloaded images.
         """
-        files = observation.get("files", [])
-        if not files:
-            return []
-
-        files_dir = obs_dir / "files"
-        files_dir.mkdir(parents=True, exist_ok=True)
-
-        downloaded = []
-        for file in files:
-            file_id = file.get("id", "unknown")
-            url = file.get("url", "")
-            name = file.get("name", f"{file_id}.pdf")
-            if not url:
-                continue
-
-            filepath = files_dir / name
-
-            if filepath.exists():
-                downloaded.append(filepath)
-                continue
-
-            try:
-                response = self.session.get(url, stream=True, timeout=60)
-                response.raise_for_status()
+        images, _, _ = observation_media(observation)
+        return self._download_missing(self._observation_image_tasks(images, obs_dir))
 
-                with open(filepath, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+    def download_observation_files(self, observation: dict, obs_dir: Path) -> list[Path]:
+        """
+        Download all file attachments for an observation to obs_dir/files/.
 
-                downloaded.append(filepath)
-            except Exception as e:
-                print(f"  Warning: Failed to download file {name}: {e}")
+        Parameters
+        ----------
+        observation : dict
+            Observation data from API.
+        obs_dir : Path
+            Directory for this observation.
 
-        return downloaded
+        Returns
+        -------
+        list[Path]
+            List of paths to downloaded files.
+        """
+        _, files, _ = observation_media(observation)
+        return self._download_missing(self._observation_file_tasks(files, obs_dir))
 
     def download_observation_videos(self, observation: dict, obs_dir: Path) -> list[Path]:
         """
@@ -735,40 +2071,119 @@ class FamlyDownloader:
         list[Path]
             List of paths to downloaded videos.
         """
-        videos = observation.get("videos", [])
-        if not videos:
-            return []
-
-        videos_dir = obs_dir / "videos"
-        videos_dir.mkdir(parents=True, exist_ok=True)
-
-        downloaded = []
-        for video in videos:
-            video_id = video.get("id", "unknown")
-            url = video.get("videoUrl", "")
-            if not url:
-                continue
-
-            filename = f"{video_id[:8]}.mp4"
-            filepath = videos_dir / filename
+        _, _, videos = observation_media(observation)
+        return self._download_missing(self._observation_video_tasks(videos, obs_dir))
 
-            if filepath.exists():
-                downloaded.append(filepath)
-                continue
+    def download_observation_assets(
+        self, observations: list[dict], obs_dir: Path
+    ) -> list[dict[str, list[Path]]]:
+        """
+        Download the images, files and videos of many observations as one batch.
 
-            try:
-                response = self.session.get(url, stream=True, timeout=120)
-                response.raise_for_status()
+        All attachments go through a single task queue so the worker pool
+        stays busy across observation boundaries instead of draining after
+        each small per-observation batch.
 
-                with open(filepath, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+        Parameters
+        ----------
+        observations : list[dict]
+            Observation data from API.
+        obs_dir : Path
+            Parent directory holding one subdirectory per observation.
 
-                downloaded.append(filepath)
-            except Exception as e:
-                print(f"  Warning: Failed to download video {video_id[:8]}: {e}")
+        Returns
+        -------
+        list[dict[str, list[Path]]]
+            One entry per observation, in order, mapping "images", "files"
+            and "videos" to the paths of existing or downloaded files.
+        """
+        builders = {
+            "images": self._observation_image_tasks,
+            "files": self._observation_file_tasks,
+            "videos": self._observation_video_tasks,
+        }
+        # Observation folders from earlier runs need no mkdir
+        if obs_dir not in self._scanned_dirs:
+            self._known_dirs.update(obs_dir / name for name in list_filenames(obs_dir))
+            self._scanned_dirs.add(obs_dir)
+
+        tasks = []
+        owners = []
+        for index, obs in enumerate(observations):
+            obs_path = obs_dir / self._cached_observation_dir_name(obs)
+            self._ensure_dir(obs_path)
+            for (kind, build), media in zip(builders.items(), observation_media(obs), strict=True):
+                for task in build(media, obs_path):
+                    tasks.append(task)
+                    owners.append((index, kind))
+
+        assets: list[dict[str, list[Path]]] = [
+            {kind: [] for kind in builders} for _ in observations
+        ]
+        done = set(self._download_missing(tasks, progress="Downloading attachments"))
+        for task, (index, kind) in zip(tasks, owners, strict=True):
+            if task[1] in done:
+                assets[index][kind].append(task[1])
+        return assets
+
+    def write_observation_pages(
+        self,
+        formatter: OutputFormatter,
+        observations: list[dict],
+        assets: list[dict[str, list[Path]]],
+        obs_dir: Path,
+        signatures: dict[str, str] | None = None,
+        render_pool: Executor | None = None,
+    ) -> None:
+        """
+        Render and write the index page of each observation.
 
-        return downloaded
+        Parameters
+        ----------
+        formatter : OutputFormatter
+            Formatter used to render the pages.
+        observations : list[dict]
+            Observation data from API.
+        assets : list[dict[str, list[Path]]]
+            Downloaded attachments per observation, as returned by
+            download_observation_assets.
+        obs_dir : Path
+            Parent directory holding one subdirectory per observation.
+        signatures : dict[str, str] | None
+            Signatures of pages written by earlier runs, keyed by directory
+            name. Pages whose inputs are unchanged are not rewritten, and the
+            dict is updated with the pages written now.
+        render_pool : Executor | None
+            Process pool to spread rendering across CPU cores when there are
+            at least PROCESS_RENDER_MIN_PAGES pages to write. Pages are
+            rendered in this thread otherwise.
+        """
+        ext = formatter.file_extension
+        pending = []
+        for obs, obs_assets in zip(observations, assets, strict=True):
+            dir_name = self._cached_observation_dir_name(obs)
+            output_file = obs_dir / dir_name / f"index.{ext}"
+            if signatures is not None:
+                signature = page_signature(formatter, obs, obs_assets)
+                if signatures.get(dir_name) == signature and output_file.exists():
+                    continue
+                signatures[dir_name] = signature
+            pending.append((output_file, obs, obs_assets))
+
+        if render_pool is not None and len(pending) >= PROCESS_RENDER_MIN_PAGES:
+            # Each task carries its own copy of the formatter, so workers
+            # never share per-card state
+            list(
+                render_pool.map(
+                    write_observation_page,
+                    itertools.repeat(formatter),
+                    *zip(*pending, strict=True),
+                    chunksize=8,
+                )
+            )
+        else:
+            for task in pending:
+                write_observation_page(formatter, *task)
 
     def download_message_images(self, conversation: dict, conv_dir: Path) -> dict[str, list[Path]]:
         """
@@ -784,11 +2199,15 @@ class FamlyDownloader:
         Returns
         -------
         dict[str, list[Path]]
-            Map of messageId to list of downloaded image paths.
+            Map of messageId to list of downloaded image paths. A conversation
+            with images that failed is added to incomplete_conversations.
         """
         images_dir = conv_dir / "images"
         message_images: dict[str, list[Path]] = {}
 
+        # Download every message's images as one batch, then group them
+        tasks = []
+        owners = []
         messages = conversation.get("messages", [])
         for msg in messages:
             msg_id = msg.get("messageId", "")
@@ -796,9 +2215,6 @@ class FamlyDownloader:
             if not images:
                 continue
 
-            images_dir.mkdir(parents=True, exist_ok=True)
-            downloaded = []
-
             for img in images:
                 img_id = img.get("imageId", "unknown")
                 prefix = img.get("prefix", "")
@@ -809,26 +2225,15 @@ class FamlyDownloader:
 
                 url = f"{prefix}/{key}"
                 filename = f"{img_id[:8]}.jpg"
-                filepath = images_dir / filename
-
-                if filepath.exists():
-                    downloaded.append(filepath)
-                    continue
-
-                try:
-                    response = self.session.get(url, stream=True, timeout=60)
-                    response.raise_for_status()
-
-                    with open(filepath, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
+                tasks.append((url, images_dir / filename, 60, f"message image {img_id[:8]}"))
+                owners.append(msg_id)
 
-                    downloaded.append(filepath)
-                except Exception as e:
-                    print(f"  Warning: Failed to download message image {img_id[:8]}: {e}")
-
-            if downloaded:
-                message_images[msg_id] = downloaded
+        done = set(self._download_missing(tasks))
+        if any(task[1] not in done for task in tasks):
+            self.incomplete_conversations.add(conversation.get("conversationId", ""))
+        for task, msg_id in zip(tasks, owners, strict=True):
+            if task[1] in done:
+                message_images.setdefault(msg_id, []).append(task[1])
 
         return message_images
 
@@ -846,12 +2251,18 @@ class FamlyDownloader:
         str
             URL to download.
         """
-        if self.download_big and "big" in image and image["big"]:
-            return image["big"]["url"]
-        elif self.download_big and "url_big" in image:
-            return image["url_big"]
-        elif "thumbnail" in image and image["thumbnail"]:
-            return image["thumbnail"]["url"]
+        if self.download_big:
+            # The API returns the same shape for every image, so go straight for
+            # the usual field and only fall back to the checks when it's missing
+            try:
+                return image["big"]["url"]
+            except (KeyError, TypeError):
+                pass
+            if "url_big" in image:
+                return image["url_big"]
+        thumbnail = image.get("thumbnail")
+        if thumbnail:
+            return thumbnail["url"]
         return image.get("url", "")
 
     def _generate_filename(self, image: dict) -> str:
@@ -869,9 +2280,19 @@ class FamlyDownloader:
             Generated filename.
         """
         image_id = image.get("imageId", "unknown")
-        created_at = image.get("createdAt", "")
-
-        if created_at:
+        created_at = image.get("createdAt") or ""
+
+        # Famly returns ISO-8601 timestamps ("2024-01-15T14:23:05.123+00:00"), so the
+        # local date and time can be sliced out without parsing
+        if (
+            len(created_at) >= 19
+            and created_at[10] == "T"
+            and created_at[13] == created_at[16] == ":"
+        ):
+            date_str = f"{created_at[:10]}_{created_at[11:19].replace(':', '')}"
+        elif created_at:
+            # Other forms (e.g. a bare date) go through the full parser, so they
+            # keep the names earlier versions gave them
             try:
                 dt = datetime.fromisoformat(created_at.replace("+00:00", "+0000"))
                 date_str = dt.strftime("%Y-%m-%d_%H%M%S")
@@ -880,10 +2301,9 @@ class FamlyDownloader:
         else:
             date_str = "unknown_date"
 
-        short_id = image_id[:8] if len(image_id) >= 8 else image_id
-        return f"{date_str}_{short_id}.jpg"
+        return f"{date_str}_{image_id[:8]}.jpg"
 
-    def download_image(self, image: dict) -> tuple[bool, str]:
+    def download_image(self, image: dict, existing: set[str] | None = None) -> tuple[bool, str]:
         """
         Download a single image.
 
@@ -891,6 +2311,9 @@ class FamlyDownloader:
         ----------
         image : dict
             Image metadata from API.
+        existing : set[str] | None
+            Filenames already in the output directory. If None, the file is
+            checked on disk.
 
         Returns
         -------
@@ -904,60 +2327,138 @@ class FamlyDownloader:
         filename = self._generate_filename(image)
         filepath = self.output_dir / filename
 
-        if filepath.exists():
+        already_exists = filename in existing if existing is not None else filepath.exists()
+        if already_exists:
             return True, f"{filename} (skipped, exists)"
 
-        try:
-            response = self.session.get(url, stream=True, timeout=30)
-            response.raise_for_status()
+        return self._fetch_image(url, filepath)
+
+    def _fetch_image(self, url: str, filepath: Path) -> tuple[bool, str]:
+        """
+        Download an image whose URL and destination are already resolved.
+
+        Parameters
+        ----------
+        url : str
+            URL to download.
+        filepath : Path
+            Destination file path.
 
-            with open(filepath, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+        Returns
+        -------
+        tuple[bool, str]
+            Success status and filename or error message.
+        """
+        try:
+            with self.download_session.get(url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                self._stream_to_file(response, filepath)
 
-            return True, filename
+            return True, filepath.name
         except Exception as e:
             return False, str(e)
 
-    def download_all(self, images: list) -> dict:
+    def download_all(self, images: Iterable[dict]) -> dict:
         """
         Download all images with parallel execution.
 
+        Images are submitted as they are consumed, so passing a lazy iterable
+        such as the pages from `iter_image_pages` overlaps pagination with the
+        downloads of pages already fetched.
+
         Parameters
         ----------
-        images : list
-            List of image metadata dictionaries.
+        images : Iterable[dict]
+            Image metadata dictionaries; a list or any other iterable.
 
         Returns
         -------
         dict
             Statistics about the download operation.
         """
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self.output_dir)
 
         stats = {"success": 0, "failed": 0, "skipped": 0}
         failed_images = []
 
-        print(f"\nDownloading {len(images)} images to {self.output_dir}")
+        # A list gives a fixed total; a lazy iterable grows the bar as it goes
+        total = len(images) if isinstance(images, Sized) else None
+        count = f"{total} images" if total is not None else "images"
+        print(f"\nDownloading {count} to {self.output_dir}")
         print(f"Using {self.max_workers} parallel workers\n")
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(self.download_image, img): img for img in images}
-
-            with tqdm(total=len(images), unit="image") as pbar:
-                for future in as_completed(futures):
-                    success, result = future.result()
+        # Resolve URLs and filenames in the main thread so workers only do
+        # network I/O, and skip files that already exist without submitting them
+        existing = list_filenames(self.output_dir)
+        executor = self._get_executor()
+        in_flight: dict = {}
+        max_in_flight = self.max_workers * 4
+
+        pbar = tqdm(
+            total=total or 0,
+            unit="image",
+            miniters=progress_miniters(total) if total else None,
+        )
 
-                    if success:
-                        if "skipped" in result:
-                            stats["skipped"] += 1
-                        else:
-                            stats["success"] += 1
-                    else:
-                        stats["failed"] += 1
-                        failed_images.append((futures[future], result))
+        # Images seen so far, and those settled without a download (skipped or
+        # without a URL) that the bar has not been told about yet. Both are
+        # applied in batches rather than touching the bar for every image.
+        seen = 0
+        settled = 0
+
+        def flush() -> None:
+            nonlocal settled
+            if total is None:
+                pbar.total = seen
+            if settled:
+                pbar.update(settled)
+                settled = 0
+
+        def record(future) -> None:
+            success, result = future.result()
+            image_id = in_flight.pop(future)
+            if success:
+                stats["success"] += 1
+            else:
+                stats["failed"] += 1
+                failed_images.append((image_id, result))
+            pbar.update(1)
 
-                    pbar.update(1)
+        with pbar:
+            for img in images:
+                seen += 1
+                url = self._get_image_url(img)
+                filename = self._generate_filename(img)
+                if not url:
+                    stats["failed"] += 1
+                    failed_images.append((img.get("imageId", "unknown"), "No URL available"))
+                    settled += 1
+                elif filename in existing:
+                    stats["skipped"] += 1
+                    settled += 1
+                else:
+                    # Claim the name now so an image repeated across pages is
+                    # not written by two workers at once
+                    existing.add(filename)
+                    future = executor.submit(self._fetch_image, url, self.output_dir / filename)
+                    # Only the ID is needed to report a failure; the rest of
+                    # the metadata can be freed as soon as its page is done
+                    in_flight[future] = img.get("imageId", "unknown")
+
+                if settled >= 32:
+                    flush()
+
+                # Bound the queue so a long lazy iterable doesn't hold every
+                # pending download in memory
+                if len(in_flight) >= max_in_flight:
+                    flush()
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future)
+
+            flush()
+            for future in as_completed(list(in_flight)):
+                record(future)
 
         print("\n" + "=" * 50)
         print("Download complete!")
@@ -967,8 +2468,8 @@ class FamlyDownloader:
 
         if failed_images:
             print("\nFailed downloads:")
-            for img, error in failed_images[:10]:
-                print(f"  - {img.get('imageId', 'unknown')}: {error}")
+            for image_id, error in failed_images[:10]:
+                print(f"  - {image_id}: {error}")
             if len(failed_images) > 10:
                 print(f"  ... and {len(failed_images) - 10} more")
 
@@ -1012,7 +2513,17 @@ def select_child(children: list) -> dict:
         print("Invalid choice. Please try again.")
 
 
-def main():
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command-line parser, once per process.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        The parser for main()'s arguments. Environment variable fallbacks
+        are applied by main() at parse time, not baked in here.
+    """
     parser = argparse.ArgumentParser(
         description="Download all photos of your child from Famly.co",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1042,18 +2553,29 @@ How to get credentials manually:
         action="store_true",
         help="Open browser for interactive login (recommended)",
     )
+    parser.add_argument(
+        "--cdp-endpoint",
+        metavar="URL",
+        help="With --login, use a running Chromium started with --remote-debugging-port "
+        "(e.g. http://localhost:9222) instead of launching one",
+    )
     parser.add_argument(
         "--child-id",
         "-c",
-        default=os.environ.get("FAMLY_CHILD_ID", ""),
+        default=None,
         help="Your child's UUID (or set FAMLY_CHILD_ID env var)",
     )
     parser.add_argument(
         "--access-token",
         "-t",
-        default=os.environ.get("FAMLY_ACCESS_TOKEN", ""),
+        default=None,
         help="Your Famly access token (or set FAMLY_ACCESS_TOKEN env var)",
     )
+    parser.add_argument(
+        "--all-children",
+        action="store_true",
+        help="Download every child without prompting (for scripted runs)",
+    )
     parser.add_argument(
         "--output",
         "-o",
@@ -1065,7 +2587,20 @@ How to get credentials manually:
         "-w",
         type=int,
         default=DEFAULT_CONFIG["max_workers"],
-        help="Number of parallel download workers",
+        help=f"Number of parallel download workers (default: {DEFAULT_CONFIG['max_workers']})",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=None,
+        help="Cap on concurrent connections to each host; lower it if you get rate-limited",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        metavar="PER_SECOND",
+        help="Most requests per second to send, across all workers (default: no limit)",
     )
     parser.add_argument(
         "--thumbnail-only",
@@ -1078,6 +2613,11 @@ How to get credentials manually:
         help="Fetch all images, ignoring last sync timestamp",
     )
     parser.add_argument("--dry-run", action="store_true", help="List images without downloading")
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Also write gzipped copies (.html.gz, .css.gz) of pages for static hosting",
+    )
     parser.add_argument(
         "--no-photos",
         action="store_true",
@@ -1121,7 +2661,15 @@ How to get credentials manually:
         help="Output format for observations and gallery (default: html)",
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def main(argv: list[str] | None = None):
+    args = build_parser().parse_args(argv)
+    if args.child_id is None:
+        args.child_id = os.environ.get("FAMLY_CHILD_ID", "")
+    if args.access_token is None:
+        args.access_token = os.environ.get("FAMLY_ACCESS_TOKEN", "")
 
     print("=" * 60)
     print("  Famly Photo Downloader")
@@ -1133,17 +2681,18 @@ How to get credentials manually:
     children_to_download = []
     children = []
 
-    # Try to load cached credentials if not doing fresh login and no manual creds
-    if not args.login and not access_token and not child_id:
-        cached = load_cached_credentials(output_dir)
-        if cached:
-            print("\n✓ Using cached credentials")
-            access_token = cached["access_token"]
-            children = cached["children"]
-            print(f"✓ Found {len(children)} cached child(ren)")
+    # Read the cache once; it also holds the last sync timestamps
+    cached = load_cached_credentials(output_dir) or {}
+
+    # Use cached credentials if not doing fresh login and no manual creds
+    if cached and not args.login and not access_token and not child_id:
+        print("\n✓ Using cached credentials")
+        access_token = cached["access_token"]
+        children = cached["children"]
+        print(f"✓ Found {len(children)} cached child(ren)")
 
     if args.login:
-        credentials = FamlyBrowserAuth.get_credentials_from_browser()
+        credentials = FamlyBrowserAuth.get_credentials_from_browser(cdp_endpoint=args.cdp_endpoint)
 
         if not credentials.get("access_token"):
             print("\nError: Could not obtain access token from browser.")
@@ -1160,7 +2709,14 @@ How to get credentials manually:
         if children:
             save_cached_credentials(output_dir, access_token, children)
 
-    if children:
+    if children and args.all_children:
+        children_to_download = children
+    elif len(children) > 1 and not sys.stdin.isatty():
+        # select_child would block (or fail) waiting for input
+        print("\nMultiple children found but there is no terminal to choose one.")
+        print("Run with --all-children, or --child-id and --access-token, instead.")
+        sys.exit(1)
+    elif children:
         selected = select_child(children)
         if isinstance(selected, list):
             children_to_download = selected
@@ -1172,6 +2728,10 @@ How to get credentials manually:
             print("\nNo children found. Please provide --child-id manually.")
             print("You can find the child ID in the URL when viewing their profile:")
             print("  https://app.famly.co/#/account/childProfile/CHILD_ID_HERE/activity")
+            if not sys.stdin.isatty():
+                # input would block (or fail) with no one to answer
+                print("There is no terminal to enter it in; run with --child-id instead.")
+                sys.exit(1)
             child_id = input("\nEnter child ID: ").strip()
             if child_id:
                 children_to_download = [{"id": child_id, "name": "Unknown"}]
@@ -1188,219 +2748,362 @@ How to get credentials manually:
         print("\nNo child selected. Exiting.")
         sys.exit(1)
 
-    # Load last sync timestamps from cache
-    last_sync = {}
-    cached = load_cached_credentials(output_dir)
-    if cached:
-        last_sync = cached.get("last_sync", {})
+    last_sync = load_sync_state(output_dir)
 
-    for child in children_to_download:
-        child_id = child["id"]
-        child_name = child.get("name", "Unknown")
+    formatter = get_formatter(args.format)
+    ext = formatter.file_extension
 
-        if len(children_to_download) > 1:
-            child_output_dir = Path(args.output) / child_name.replace(" ", "_")
-        else:
-            child_output_dir = Path(args.output)
-
-        print(f"\n{'=' * 60}")
-        print(f"Processing: {child_name}")
-        print(f"Child ID: {child_id[:8]}...{child_id[-4:]}")
-        print(f"Output: {child_output_dir}")
-        print("=" * 60)
-
-        downloader = FamlyDownloader(
-            child_id=child_id,
-            access_token=access_token,
-            output_dir=str(child_output_dir),
-            download_big=not args.thumbnail_only,
-            max_workers=args.workers,
-        )
+    # Each child gets a subdirectory only when several are downloaded
+    per_child_dirs = len(children_to_download) > 1
+
+    # One download pool and one set of warm connections for the whole run;
+    # each child's downloader borrows them
+    executor = ThreadPoolExecutor(max_workers=args.workers)
+    # Observation pages are CPU-bound to render; worker processes start on
+    # first use. They are spawned rather than forked because the download
+    # threads above may hold locks at fork time.
+    render_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    sessions = FamlyDownloader.create_sessions(
+        access_token, args.workers, args.max_connections, args.rate
+    )
 
-        # Get last sync timestamp for this child (skip if --login or --full)
-        stop_at = last_sync.get(child_id) if not (args.login or args.full) else None
+    try:
+        for child in children_to_download:
+            child_id = child["id"]
+            child_name = child.get("name", "Unknown")
 
-        # Determine what to download based on flags
-        download_photos = not (args.no_photos or args.observations_only or args.messages_only)
-        download_observations = not (args.no_observations or args.photos_only or args.messages_only)
-        download_messages = not (args.no_messages or args.photos_only or args.observations_only)
-        generate_gallery = not args.no_gallery
+            if per_child_dirs:
+                child_output_dir = output_dir / child_name.replace(" ", "_")
+            else:
+                child_output_dir = output_dir
+
+            print(f"\n{'=' * 60}")
+            print(f"Processing: {child_name}")
+            print(f"Child ID: {child_id[:8]}...{child_id[-4:]}")
+            print(f"Output: {child_output_dir}")
+            print("=" * 60)
+
+            downloader = FamlyDownloader(
+                child_id=child_id,
+                access_token=access_token,
+                output_dir=str(child_output_dir),
+                download_big=not args.thumbnail_only,
+                max_workers=args.workers,
+                max_connections=args.max_connections,
+                executor=executor,
+                sessions=sessions,
+            )
 
-        # Track counts for index page
-        observations = []
-        photos = []
+            # Get last sync timestamp for this child (skip if --login or --full)
+            incremental = not (args.login or args.full)
+            stop_at = get_last_sync(last_sync, child_id) if incremental else None
+            conv_stop_at = (
+                get_last_sync(last_sync, child_id, "conversations") if incremental else None
+            )
 
-        try:
-            # Download photos
-            if download_photos:
-                print(f"\nResolution: {'Thumbnail' if args.thumbnail_only else 'Full'}")
-                images = downloader.fetch_all_images(stop_at=stop_at)
-
-                if not images:
-                    print("No new images found for this child.")
-                elif args.dry_run:
-                    print(f"\nDry run - would download {len(images)} images:")
-                    for img in images[:5]:
-                        print(f"  - {downloader._generate_filename(img)}")
-                    if len(images) > 5:
-                        print(f"  ... and {len(images) - 5} more")
-                else:
-                    downloader.download_all(images)
-
-                    # Update last sync timestamp with newest image
-                    if images:
-                        newest_timestamp = images[0].get("createdAt")
-                        if newest_timestamp:
-                            update_last_sync(output_dir, child_id, newest_timestamp)
-
-            # Download observations
-            if download_observations:
-                print("\n" + "-" * 40)
-                observations = downloader.fetch_all_observations()
-
-                if observations:
-                    formatter = get_formatter(args.format)
-                    ext = formatter.file_extension
+            # Determine what to download based on flags
+            download_photos = not (args.no_photos or args.observations_only or args.messages_only)
+            download_observations = not (
+                args.no_observations or args.photos_only or args.messages_only
+            )
+            download_messages = not (args.no_messages or args.photos_only or args.observations_only)
+            generate_gallery = not args.no_gallery
+
+            # Track counts for index page; photos is scanned at most once
+            observations = []
+            photos: list[Path] | None = None
+
+            # Observation page render in flight on the shared pool
+            pending_write = None
+
+            # Gallery file, signature and render in flight in a render process
+            pending_gallery = None
+
+            # Signatures of the gallery and index pages from the last run
+            summary_signatures = load_page_signatures(child_output_dir)
+
+            try:
+                # Pages link to shared assets such as the stylesheet
+                downloader._ensure_dir(child_output_dir)
+                formatter.write_static_assets(child_output_dir)
+
+                # The conversation list is a single API call; let it complete in
+                # the background while photos and observations download
+                conversations_future = (
+                    downloader._get_executor().submit(downloader.fetch_conversations)
+                    if download_messages
+                    else None
+                )
+
+                # Download photos
+                if download_photos:
+                    print(f"\nResolution: {'Thumbnail' if args.thumbnail_only else 'Full'}")
+                    if args.dry_run:
+                        images = downloader.fetch_all_images(stop_at=stop_at)
+                        if not images:
+                            print("No new images found for this child.")
+                        else:
+                            print(f"\nDry run - would download {len(images)} images:")
+                            for img in images[:5]:
+                                print(f"  - {downloader._generate_filename(img)}")
+                            if len(images) > 5:
+                                print(f"  ... and {len(images) - 5} more")
+                    else:
+                        # Download each page of images while the next one is fetched
+                        print(
+                            "Fetching new images since last sync..."
+                            if stop_at
+                            else "Fetching images..."
+                        )
+                        pages = downloader.iter_image_pages(stop_at=stop_at)
+                        first_page = next(pages, None)
+
+                        if not first_page:
+                            print("No new images found for this child.")
+                        else:
+                            downloader.download_all(
+                                itertools.chain(first_page, itertools.chain.from_iterable(pages))
+                            )
+
+                            # Update last sync timestamp with newest image
+                            newest_timestamp = first_page[0].get("createdAt")
+                            if newest_timestamp:
+                                update_last_sync(output_dir, child_id, newest_timestamp)
+
+                # Download observations
+                if download_observations:
+                    print("\n" + "-" * 40)
                     obs_dir = child_output_dir / "observations"
-                    obs_dir.mkdir(parents=True, exist_ok=True)
 
-                    print(
-                        f"\nProcessing {len(observations)} observations (format: {args.format})..."
-                    )
-                    with tqdm(total=len(observations), unit="obs") as pbar:
-                        for obs in observations:
-                            # Create observation directory
-                            obs_name = downloader._get_observation_dir_name(obs)
-                            obs_path = obs_dir / obs_name
-                            obs_path.mkdir(parents=True, exist_ok=True)
-
-                            # Download images for this observation
-                            image_paths = downloader.download_observation_images(obs, obs_path)
-
-                            # Download file attachments for this observation
-                            file_paths = downloader.download_observation_files(obs, obs_path)
-
-                            # Download videos for this observation
-                            video_paths = downloader.download_observation_videos(obs, obs_path)
-
-                            # Generate observation output
-                            output = formatter.format_observation(
-                                obs,
-                                image_paths,
-                                downloader._get_observation_dir_name,
-                                file_paths=file_paths,
-                                video_paths=video_paths,
+                    # Download each page while the next one is fetched, and render
+                    # a page's observations while the following page downloads.
+                    # Formatters keep per-card state, so only one render runs at once.
+                    page_signatures = load_page_signatures(obs_dir)
+                    for page in downloader.iter_observation_pages():
+                        downloader._ensure_dir(obs_dir)
+                        print(f"Processing {len(page)} observations (format: {args.format})...")
+                        assets = downloader.download_observation_assets(page, obs_dir)
+                        if pending_write is not None:
+                            pending_write.result()
+                        pending_write = downloader._get_executor().submit(
+                            downloader.write_observation_pages,
+                            formatter,
+                            page,
+                            assets,
+                            obs_dir,
+                            page_signatures,
+                            render_pool,
+                        )
+                        observations.extend(page)
+                    if pending_write is not None:
+                        pending_write.result()
+                        save_page_signatures(obs_dir, page_signatures)
+
+                    if observations:
+                        # Generate observations feed index
+                        feed_output = formatter.format_observations_feed(
+                            observations, downloader._cached_observation_dir_name
+                        )
+                        feed_file = obs_dir / f"index.{ext}"
+                        feed_file.write_bytes(feed_output.encode("utf-8"))
+
+                        print(f"Generated observations feed: {feed_file}")
+                    else:
+                        print("No observations found for this child.")
+
+                # Generate photo gallery
+                if generate_gallery:
+                    print("\n" + "-" * 40)
+                    print(f"Generating photo gallery (format: {args.format})...")
+                    photos = get_photos_from_directory(child_output_dir)
+                    if photos:
+                        gallery_file = child_output_dir / f"gallery.{ext}"
+                        gallery_signature = page_signature(
+                            formatter, sorted(p.name for p in photos)
+                        )
+                        if (
+                            summary_signatures.get(gallery_file.name) == gallery_signature
+                            and gallery_file.exists()
+                        ):
+                            print(f"Photo gallery unchanged: {gallery_file}")
+                        elif len(photos) >= PROCESS_RENDER_MIN_PHOTOS:
+                            # Written once messages are done
+                            pending_gallery = (
+                                gallery_file,
+                                gallery_signature,
+                                render_pool.submit(formatter.format_photo_gallery, photos),
+                            )
+                        elif write_page(
+                            gallery_file,
+                            gallery_signature,
+                            summary_signatures,
+                            gallery_file.name,
+                            formatter.format_photo_gallery,
+                            photos,
+                        ):
+                            print(f"Generated photo gallery: {gallery_file}")
+                    else:
+                        print("No photos found for gallery.")
+
+                # Download messages
+                conversations = []
+                if download_messages:
+                    print("\n" + "-" * 40)
+                    print("Fetching conversations...")
+                    conversation_summaries = conversations_future.result()
+                    print(f"Found {len(conversation_summaries)} conversations")
+
+                    if conversation_summaries:
+                        messages_dir = child_output_dir / "messages"
+                        downloader._ensure_dir(messages_dir)
+
+                        print(f"Processing {len(conversation_summaries)} conversations...")
+                        conv_ids = [c.get("conversationId", "") for c in conversation_summaries]
+
+                        # Conversations with no activity since the last sync keep
+                        # their existing pages; only the rest are fetched
+                        unchanged = set()
+                        if conv_stop_at:
+                            for conv_id, summary in zip(
+                                conv_ids, conversation_summaries, strict=True
+                            ):
+                                last_activity = summary.get("lastActivityAt") or ""
+                                conv_file = messages_dir / conv_id[:8] / f"index.{ext}"
+                                if (
+                                    last_activity
+                                    and last_activity <= conv_stop_at
+                                    and conv_file.exists()
+                                ):
+                                    unchanged.add(conv_id)
+                        if unchanged:
+                            print(
+                                f"Skipping {len(unchanged)} conversations unchanged since last sync"
                             )
-                            output_file = obs_path / f"index.{ext}"
-                            with open(output_file, "w", encoding="utf-8") as f:
-                                f.write(output)
 
-                            pbar.update(1)
+                        fetched = downloader.iter_conversation_messages(
+                            [conv_id for conv_id in conv_ids if conv_id not in unchanged]
+                        )
+                        for conv_id, summary in tqdm(
+                            zip(conv_ids, conversation_summaries, strict=True),
+                            total=len(conv_ids),
+                            desc="Conversations",
+                            unit="conv",
+                            miniters=progress_miniters(len(conv_ids)),
+                        ):
+                            if conv_id in unchanged:
+                                conversations.append(conversation_index_entry(summary))
+                                continue
+
+                            conversation = next(fetched)
+                            conv_dir_name = conv_id[:8]
+                            conv_dir = messages_dir / conv_dir_name
+                            downloader._ensure_dir(conv_dir)
+                            conversations.append(conversation_index_entry(summary, conversation))
+
+                            # Download images from messages
+                            message_images = downloader.download_message_images(
+                                conversation, conv_dir
+                            )
 
-                    # Generate observations feed index
-                    feed_output = formatter.format_observations_feed(
-                        observations, downloader._get_observation_dir_name
+                            # Generate conversation page
+                            conv_output = formatter.format_conversation(
+                                conversation, message_images
+                            )
+                            conv_file = conv_dir / f"index.{ext}"
+                            conv_file.write_bytes(conv_output.encode("utf-8"))
+
+                        newest_activity = max(
+                            (c.get("lastActivityAt") or "" for c in conversation_summaries),
+                            default="",
+                        )
+                        if downloader.incomplete_conversations:
+                            # Leave the mark where it was so the next run fetches
+                            # these conversations again and retries their images
+                            print(
+                                f"Some images failed in {len(downloader.incomplete_conversations)} "
+                                "conversations; they will be checked again next run"
+                            )
+                        elif newest_activity:
+                            update_last_sync(output_dir, child_id, newest_activity, "conversations")
+
+                        # Generate conversations index
+                        index_file = messages_dir / f"index.{ext}"
+                        if write_page(
+                            index_file,
+                            page_signature(formatter, conversations),
+                            summary_signatures,
+                            f"messages/{index_file.name}",
+                            formatter.format_conversations_index,
+                            conversations,
+                        ):
+                            print(f"Generated messages index: {index_file}")
+
+                if pending_gallery is not None:
+                    gallery_file, gallery_signature, gallery_render = pending_gallery
+                    write_page(
+                        gallery_file,
+                        gallery_signature,
+                        summary_signatures,
+                        gallery_file.name,
+                        gallery_render.result,
                     )
-                    feed_file = obs_dir / f"index.{ext}"
-                    with open(feed_file, "w", encoding="utf-8") as f:
-                        f.write(feed_output)
-
-                    print(f"Generated observations feed: {feed_file}")
+                    print(f"\nGenerated photo gallery: {gallery_file}")
+
+                # Generate main index page
+                obs_count = (
+                    len(observations)
+                    if observations
+                    else get_observations_count_from_directory(child_output_dir)
+                )
+                conv_count = (
+                    len(conversations)
+                    if conversations
+                    else get_conversations_count_from_directory(child_output_dir)
+                )
+                if photos is None:
+                    photos = get_photos_from_directory(child_output_dir)
+                index_file = child_output_dir / f"index.{ext}"
+                index_inputs = (obs_count, len(photos), conv_count, child_name)
+                if write_page(
+                    index_file,
+                    page_signature(formatter, *index_inputs),
+                    summary_signatures,
+                    index_file.name,
+                    formatter.format_index,
+                    *index_inputs,
+                ):
+                    print(f"\nGenerated main index: {index_file}")
+                save_page_signatures(child_output_dir, summary_signatures)
+
+                if args.precompress:
+                    compressed = precompress_pages(child_output_dir, render_pool)
+                    print(f"Compressed {compressed} pages")
+
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code == 401:
+                    print("\nError: Authentication failed (401)")
+                    print("Your access token may have expired. Please run with --login again.")
+                elif e.response.status_code == 403:
+                    print("\nError: Access forbidden (403)")
+                    print("You may not have permission to access these photos.")
                 else:
-                    print("No observations found for this child.")
-
-            # Generate photo gallery
-            photos = []
-            if generate_gallery:
-                print("\n" + "-" * 40)
-                print(f"Generating photo gallery (format: {args.format})...")
-                formatter = get_formatter(args.format)
-                ext = formatter.file_extension
-                photos = get_photos_from_directory(child_output_dir)
-                if photos:
-                    gallery_output = formatter.format_photo_gallery(photos)
-                    gallery_file = child_output_dir / f"gallery.{ext}"
-                    with open(gallery_file, "w", encoding="utf-8") as f:
-                        f.write(gallery_output)
-                    print(f"Generated photo gallery: {gallery_file}")
-                else:
-                    print("No photos found for gallery.")
-
-            # Download messages
-            conversations = []
-            if download_messages:
-                print("\n" + "-" * 40)
-                print("Fetching conversations...")
-                conversation_summaries = downloader.fetch_conversations()
-                print(f"Found {len(conversation_summaries)} conversations")
-
-                if conversation_summaries:
-                    formatter = get_formatter(args.format)
-                    ext = formatter.file_extension
-                    messages_dir = child_output_dir / "messages"
-                    messages_dir.mkdir(parents=True, exist_ok=True)
-
-                    print(f"Processing {len(conversation_summaries)} conversations...")
-                    for conv_summary in tqdm(
-                        conversation_summaries, desc="Conversations", unit="conv"
-                    ):
-                        conv_id = conv_summary.get("conversationId", "")
-                        conv_dir_name = conv_id[:8]
-                        conv_dir = messages_dir / conv_dir_name
-                        conv_dir.mkdir(parents=True, exist_ok=True)
-
-                        # Fetch full conversation with messages
-                        conversation = downloader.fetch_conversation_messages(conv_id)
-                        conversations.append(conversation)
-
-                        # Download images from messages
-                        message_images = downloader.download_message_images(conversation, conv_dir)
-
-                        # Generate conversation page
-                        conv_output = formatter.format_conversation(conversation, message_images)
-                        conv_file = conv_dir / f"index.{ext}"
-                        with open(conv_file, "w", encoding="utf-8") as f:
-                            f.write(conv_output)
-
-                    # Generate conversations index
-                    index_output = formatter.format_conversations_index(conversations)
-                    index_file = messages_dir / f"index.{ext}"
-                    with open(index_file, "w", encoding="utf-8") as f:
-                        f.write(index_output)
-                    print(f"Generated messages index: {index_file}")
-
-            # Generate main index page
-            formatter = get_formatter(args.format)
-            ext = formatter.file_extension
-            obs_count = (
-                len(observations)
-                if observations
-                else get_observations_count_from_directory(child_output_dir)
-            )
-            conv_count = (
-                len(conversations)
-                if conversations
-                else get_conversations_count_from_directory(child_output_dir)
-            )
-            if not photos:
-                photos = get_photos_from_directory(child_output_dir)
-            index_output = formatter.format_index(obs_count, len(photos), conv_count, child_name)
-            index_file = child_output_dir / f"index.{ext}"
-            with open(index_file, "w", encoding="utf-8") as f:
-                f.write(index_output)
-            print(f"\nGenerated main index: {index_file}")
-
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
-                print("\nError: Authentication failed (401)")
-                print("Your access token may have expired. Please run with --login again.")
-            elif e.response.status_code == 403:
-                print("\nError: Access forbidden (403)")
-                print("You may not have permission to access these photos.")
-            else:
-                print(f"\nHTTP Error: {e}")
-        except requests.exceptions.RequestException as e:
-            print(f"\nNetwork error: {e}")
+                    print(f"\nHTTP Error: {e}")
+            except requests.exceptions.RequestException as e:
+                print(f"\nNetwork error: {e}")
+            finally:
+                # Renders share the formatter, so one left behind by an error must
+                # finish before the next child starts rendering
+                if pending_write is not None:
+                    wait([pending_write])
+                downloader.close()
+                flush_sync_state(output_dir)
+    finally:
+        # Drop queued work if a child's run was interrupted, so shutdown only
+        # waits for tasks already running
+        executor.shutdown(wait=True, cancel_futures=True)
+        render_pool.shutdown(wait=True, cancel_futures=True)
+        for session in sessions:
+            session.close()
 
     print("\n" + "=" * 60)
     print("All done!")
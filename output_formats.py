@@ -5,12 +5,23 @@ This module provides different output format implementations for observations
 and photo galleries. New formats can be added by subclassing OutputFormatter.
 """
 
+import functools
+import itertools
+import json
+import operator
+import os
+import re
 from abc import ABC, abstractmethod
-from collections import defaultdict
 from datetime import datetime
+from html import escape
 from pathlib import Path
 from typing import Protocol
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; the standard library is used otherwise
+    orjson = None
+
 
 class ObservationData(Protocol):
     """Protocol for observation data structure from the API."""
@@ -18,6 +29,329 @@ class ObservationData(Protocol):
     def get(self, key: str, default=None): ...
 
 
+# The observations query always selects these fields, so one C-level lookup
+# replaces three .get() calls on the common path
+_OBSERVATION_MEDIA = operator.itemgetter("images", "files", "videos")
+
+
+def observation_media(observation: ObservationData) -> tuple[list, list, list]:
+    """
+    Get the images, files and videos of an observation.
+
+    Parameters
+    ----------
+    observation : ObservationData
+        Observation data from the API.
+
+    Returns
+    -------
+    tuple[list, list, list]
+        The images, files and videos lists; missing or null fields become [].
+    """
+    try:
+        images, files, videos = _OBSERVATION_MEDIA(observation)
+    except KeyError:
+        images = observation.get("images")
+        files = observation.get("files")
+        videos = observation.get("videos")
+    return images or [], files or [], videos or []
+
+
+def _pad_none(items: list) -> itertools.chain:
+    """Iterate over items and then None forever, for zipping against a longer list."""
+    return itertools.chain(items, itertools.repeat(None))
+
+
+def _dump_json_bytes(data) -> bytes:
+    """Serialize formatter output as indented UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _dump_json(data) -> str:
+    """Serialize formatter output as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return _dump_json_bytes(data).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=1024)
+def _escape_name(name: str) -> str:
+    """
+    Escape a person's or child's name for HTML.
+
+    The same few names appear on nearly every card, so each is only
+    escaped once.
+
+    Parameters
+    ----------
+    name : str
+        Name as returned by the API.
+
+    Returns
+    -------
+    str
+        The name with HTML special characters, including quotes, escaped.
+    """
+    return escape(name)
+
+
+# Month names by month number, for labels built without datetime
+_MONTH_NAMES = (
+    "",
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+_MONTHS_SHORT = tuple(name[:3] for name in _MONTH_NAMES)
+
+
+def _month_of(date: str) -> str:
+    """
+    Get the month grouping key for a date.
+
+    The month is sliced straight out of the string; no datetime is built.
+
+    Parameters
+    ----------
+    date : str
+        Date in YYYY-MM-DD format.
+
+    Returns
+    -------
+    str
+        The month as YYYY-MM, e.g. "2024-01".
+
+    Raises
+    ------
+    ValueError
+        If the date is not in YYYY-MM-DD format.
+    """
+    if (
+        len(date) != 10
+        or date[4] != "-"
+        or date[7] != "-"
+        or not (date[:4] + date[5:7] + date[8:]).isdigit()
+        or not 1 <= int(date[5:7]) <= 12
+        or not 1 <= int(date[8:]) <= 31
+    ):
+        raise ValueError(f"invalid date: {date!r}")
+    return date[:7]
+
+
+# Month group for items without a valid date; sorts after every real month
+_OTHER_MONTH = "0000-00"
+
+
+@functools.lru_cache(maxsize=4096)
+def _month_group(date: str) -> str:
+    """
+    Get the month a dated item is grouped under in feeds and galleries.
+
+    Galleries hold many photos per day, so each distinct date, valid or not,
+    is only parsed once.
+
+    Parameters
+    ----------
+    date : str
+        Date in YYYY-MM-DD format.
+
+    Returns
+    -------
+    str
+        The month as from _month_of, or _OTHER_MONTH if the date is not
+        valid.
+    """
+    try:
+        return _month_of(date)
+    except ValueError:
+        return _OTHER_MONTH
+
+
+@functools.lru_cache(maxsize=1024)
+def _month_label(month_key: str) -> str:
+    """
+    Get the display label of a month from _month_group.
+
+    Parameters
+    ----------
+    month_key : str
+        Month as YYYY-MM, or _OTHER_MONTH.
+
+    Returns
+    -------
+    str
+        The label, e.g. "January 2024", or "Other".
+    """
+    if month_key == _OTHER_MONTH:
+        return "Other"
+    return f"{_MONTH_NAMES[int(month_key[5:])]} {month_key[:4]}"
+
+
+_FIRST = operator.itemgetter(0)
+
+
+def _observation_month(observation: ObservationData) -> str:
+    """
+    Get the month an observation is grouped under in the feed.
+
+    Parameters
+    ----------
+    observation : ObservationData
+        Observation data from API.
+
+    Returns
+    -------
+    str
+        The month as from _month_group.
+    """
+    return _month_group(observation.get("remark", {}).get("date", ""))
+
+
+def _sorted_photos(photos: list[Path]) -> list[tuple[str, Path, str, str]]:
+    """
+    Sort photos by month, newest first, for the galleries.
+
+    The month comes from the filename (YYYY-MM-DD_HHMMSS_id.jpg). Each
+    photo's name and stem are read once and kept alongside it.
+
+    Parameters
+    ----------
+    photos : list[Path]
+        Photo files.
+
+    Returns
+    -------
+    list[tuple[str, Path, str, str]]
+        (month, photo, name, stem) entries, newest month first and by
+        descending path within a month.
+    """
+    entries = []
+    for photo in photos:
+        stem = photo.stem
+        entries.append((_month_group(stem.split("_", 1)[0]), photo, photo.name, stem))
+    entries.sort(reverse=True)
+    return entries
+
+
+def _timeline_json(months: list[str]) -> str:
+    """
+    Serialise the month timeline for the script that renders it in the page.
+
+    Parameters
+    ----------
+    months : list[str]
+        Months in display order, as from _month_group().
+
+    Returns
+    -------
+    str
+        Compact JSON array of [month key, short month name] pairs.
+    """
+    return json.dumps([[key, _month_label(key)[:3]] for key in months], separators=(",", ":"))
+
+
+@functools.lru_cache(maxsize=8192)
+def _format_date_long(date: str) -> str:
+    """
+    Format a date for display, e.g. "05 January 2024".
+
+    Many observations share a date, so each distinct date is only parsed
+    once.
+
+    Parameters
+    ----------
+    date : str
+        Date in YYYY-MM-DD format.
+
+    Returns
+    -------
+    str
+        The formatted date, or the input unchanged if it cannot be parsed.
+    """
+    try:
+        return datetime.strptime(date, "%Y-%m-%d").strftime("%d %B %Y")
+    except ValueError:
+        return date
+
+
+@functools.lru_cache(maxsize=8192)
+def _format_comment_datetime(sent_at: str | None) -> str:
+    """
+    Format a comment timestamp for display, e.g. "05 Jan 2024, 14:30".
+
+    Parameters
+    ----------
+    sent_at : str | None
+        ISO 8601 timestamp, possibly with a trailing Z.
+
+    Returns
+    -------
+    str
+        The formatted timestamp, or an empty string if it cannot be parsed.
+    """
+    try:
+        return datetime.fromisoformat(sent_at.replace("Z", "+00:00")).strftime("%d %b %Y, %H:%M")
+    except (ValueError, AttributeError):
+        return ""
+
+
+@functools.lru_cache(maxsize=8192)
+def _format_message_datetime(sent_at: str) -> str:
+    """
+    Format a message timestamp for display, e.g. "05 Jan 2024, 14:30".
+
+    Parameters
+    ----------
+    sent_at : str
+        ISO 8601 timestamp.
+
+    Returns
+    -------
+    str
+        The formatted timestamp, or the input escaped for HTML if it cannot
+        be parsed.
+    """
+    try:
+        dt = datetime.fromisoformat(sent_at)
+    except (ValueError, TypeError):
+        return escape(str(sent_at))
+    return f"{dt.day:02d} {_MONTHS_SHORT[dt.month]} {dt.year}, {dt.hour:02d}:{dt.minute:02d}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_message_date(sent_at: str) -> str:
+    """
+    Format the date of a message timestamp for display, e.g. "05 Jan 2024".
+
+    Parameters
+    ----------
+    sent_at : str
+        ISO 8601 timestamp.
+
+    Returns
+    -------
+    str
+        The formatted date, or the input escaped for HTML if it cannot be
+        parsed.
+    """
+    try:
+        dt = datetime.fromisoformat(sent_at)
+    except (ValueError, TypeError):
+        return escape(str(sent_at))
+    return f"{dt.day:02d} {_MONTHS_SHORT[dt.month]} {dt.year}"
+
+
 # Famly-inspired CSS styles for HTML output
 FAMLY_CSS = """
 :root {
@@ -1098,315 +1432,146 @@ header a:hover {
 }
 """
 
-FOOTER_HTML = """
-    <footer class="site-footer">
-        This archive was created with <a href="https://github.com/nrbrook/famly-downloader" target="_blank">Famly Downloader</a>
-        by <a href="https://github.com/nrbrook" target="_blank">Nick Brook</a>
-    </footer>
-"""
-
 
-class OutputFormatter(ABC):
+def _minify_css(css: str) -> str:
     """
-    Abstract base class for output formatters.
+    Strip comments and redundant whitespace from a stylesheet.
 
-    Subclass this to implement different output formats (HTML, JSON, etc.).
+    Parameters
+    ----------
+    css : str
+        Stylesheet source.
+
+    Returns
+    -------
+    str
+        The same rules with comments removed and whitespace collapsed.
     """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", css).replace(";}", "}").strip()
 
-    @property
-    @abstractmethod
-    def file_extension(self) -> str:
-        """File extension for this format (e.g., 'html', 'json')."""
-        ...
 
-    @abstractmethod
-    def format_observation(
-        self,
-        observation: dict,
-        image_paths: list[Path],
-        dir_name_func: callable,
-        file_paths: list[Path] | None = None,
-        video_paths: list[Path] | None = None,
-    ) -> str:
-        """
-        Format a single observation.
+def _minify_js(js: str) -> str:
+    """
+    Strip line comments, indentation and blank lines from an inline script.
 
-        Parameters
-        ----------
-        observation : dict
-            Observation data from API.
-        image_paths : list[Path]
-            List of local paths to downloaded images.
-        dir_name_func : callable
-            Function to generate directory names for observations.
-        file_paths : list[Path] | None
-            List of local paths to downloaded file attachments.
-        video_paths : list[Path] | None
-            List of local paths to downloaded videos.
+    Line breaks are kept so statements rely on them as before. Only use it
+    on scripts with no "//" inside strings or regular expressions.
 
-        Returns
-        -------
-        str
-            Formatted output string.
-        """
-        ...
+    Parameters
+    ----------
+    js : str
+        Script source.
 
-    @abstractmethod
-    def format_observations_feed(
-        self,
-        observations: list[dict],
-        dir_name_func: callable,
-    ) -> str:
-        """
-        Format the observations feed/index.
+    Returns
+    -------
+    str
+        The same script without comments, indentation or blank lines.
+    """
+    lines = (re.sub(r"(^|\s)//.*$", "", line).strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line)
 
-        Parameters
-        ----------
-        observations : list[dict]
-            List of observation dictionaries.
-        dir_name_func : callable
-            Function to generate directory names for observations.
 
-        Returns
-        -------
-        str
-            Formatted output string.
-        """
-        ...
+@functools.cache
+def _stylesheet_bytes() -> bytes:
+    """
+    Get the minified stylesheet, encoded for writing.
 
-    @abstractmethod
-    def format_photo_gallery(
-        self,
-        photos: list[Path],
-    ) -> str:
-        """
-        Format the photo gallery.
+    Minified on first use so runs that never write HTML skip the work.
 
-        Parameters
-        ----------
-        photos : list[Path]
-            List of photo file paths.
+    Returns
+    -------
+    bytes
+        UTF-8 encoded minified FAMLY_CSS.
+    """
+    return _minify_css(FAMLY_CSS).encode("utf-8")
 
-        Returns
-        -------
-        str
-            Formatted output string.
-        """
-        ...
 
-    @abstractmethod
-    def format_conversation(
-        self,
-        conversation: dict,
-        message_images: dict[str, list[Path]],
-    ) -> str:
-        """
-        Format a single conversation page.
+# Shared stylesheet written once at the top of each archive and linked from
+# every HTML page
+STYLESHEET_FILENAME = "styles.css"
 
-        Parameters
-        ----------
-        conversation : dict
-            Full conversation data with messages.
-        message_images : dict[str, list[Path]]
-            Map of messageId to downloaded image paths.
+FOOTER_HTML = """
+    <footer class="site-footer">
+        This archive was created with <a href="https://github.com/nrbrook/famly-downloader" target="_blank">Famly Downloader</a>
+        by <a href="https://github.com/nrbrook" target="_blank">Nick Brook</a>
+    </footer>
+"""
 
-        Returns
-        -------
-        str
-            Formatted output string.
-        """
-        ...
-
-    @abstractmethod
-    def format_conversations_index(
-        self,
-        conversations: list[dict],
-    ) -> str:
-        """
-        Format the conversations index page.
-
-        Parameters
-        ----------
-        conversations : list[dict]
-            List of conversation summaries.
-
-        Returns
-        -------
-        str
-            Formatted output string.
-        """
-        ...
-
-    @abstractmethod
-    def format_index(
-        self,
-        observations_count: int,
-        photos_count: int,
-        conversations_count: int,
-        child_name: str = "",
-    ) -> str:
-        """
-        Format the main index page.
-
-        Parameters
-        ----------
-        observations_count : int
-            Total number of observations.
-        photos_count : int
-            Total number of photos.
-        conversations_count : int
-            Total number of conversations.
-        child_name : str
-            Name of the child (for title).
-
-        Returns
-        -------
-        str
-            Formatted output string.
-        """
-        ...
-
-
-class HTMLFormatter(OutputFormatter):
-    """HTML output formatter with Famly-inspired styling."""
-
-    @property
-    def file_extension(self) -> str:
-        return "html"
-
-    def format_observation(
-        self,
-        observation: dict,
-        image_paths: list[Path],
-        dir_name_func: callable,
-        file_paths: list[Path] | None = None,
-        video_paths: list[Path] | None = None,
-    ) -> str:
-        """Generate HTML for a single observation page."""
-        remark = observation.get("remark", {})
-        date = remark.get("date", "Unknown date")
-
-        # Format date for title
-        try:
-            dt = datetime.strptime(date, "%Y-%m-%d")
-            formatted_date = dt.strftime("%d %B %Y")
-        except ValueError:
-            formatted_date = date
-
-        card_html = self._build_observation_card(
-            observation,
-            dir_name_func,
-            image_paths=image_paths,
-            file_paths=file_paths,
-            video_paths=video_paths,
-        )
+# Closing markup shared by pages that end with their main container
+_PAGE_TAIL = f"""    </div>{FOOTER_HTML}
+</body>
+</html>"""
 
-        # Get lightbox data from the card build
-        lightbox_images = getattr(self, "_current_lightbox_images", [])
-        lightbox_date = getattr(self, "_current_lightbox_date", "")
-        lightbox_likes = getattr(self, "_current_lightbox_likes", 0)
-        lightbox_comments = getattr(self, "_current_lightbox_comments", 0)
+# Icons for attachment types by lowercase extension; anything else gets a paperclip
+_EXT_ICONS = {"pdf": "📄", "doc": "📄", "docx": "📄"}
+
+# Openers for an observation card's image gallery; a single image is shown larger
+_IMAGES_OPEN_MULTI = '<div class="observation-images">'
+_IMAGES_OPEN_SINGLE = '<div class="observation-images single">'
+
+# Templates for the media entries of an observation card
+_CARD_IMAGE_HTML = (
+    '<a href="#" data-lightbox-index="{idx}" onclick="openLightbox({idx}); return false;">'
+    '<img src="{src}" alt="Observation image"></a>'
+)
+_CARD_FILE_HTML = (
+    '<a class="file-attachment" href="{href}" target="_blank">'
+    '<span class="file-icon">{icon}</span><span class="file-name">{name}</span></a>'
+)
+_CARD_VIDEO_HTML = """
+            <div class="video-container">
+                <video controls preload="metadata">
+                    <source src="{src}" type="video/mp4">
+                    Your browser does not support video playback.
+                </video>
+            </div>"""
+_CARD_COMMENT_HTML = """
+            <div class="comment">
+                {avatar}
+                <div class="comment-content">
+                    <div class="comment-header">
+                        <span class="comment-author">{author}</span>
+                        <span class="comment-date">{date}</span>
+                    </div>
+                    <div class="comment-body">{body}</div>
+                </div>
+            </div>"""
 
-        # Build lightbox HTML and JS if there are images
-        lightbox_html = ""
-        lightbox_js = ""
-        if lightbox_images:
-            photos_js_array = ", ".join(f'"{p}"' for p in lightbox_images)
-            lightbox_html = """
-    <!-- Lightbox overlay -->
-    <div id="lightbox" class="lightbox">
-        <button id="lightbox-close" class="lightbox-close" aria-label="Close"></button>
-        <button id="lightbox-prev" class="lightbox-nav prev" aria-label="Previous"></button>
-        <button id="lightbox-next" class="lightbox-nav next" aria-label="Next"></button>
-        <div class="lightbox-touch-left"></div>
-        <div class="lightbox-touch-right"></div>
-        <img id="lightbox-img" class="lightbox-image" src="" alt="Photo">
-        <div class="lightbox-info">
-            <div class="lightbox-date" id="lightbox-date"></div>
-            <div class="lightbox-stats">
-                <span id="lightbox-likes"></span>
-                <span id="lightbox-comments"></span>
+# Skeleton of an observation card, shared by observation pages and the feed
+_CARD_HTML = """
+        <div class="observation-card">
+            <div class="observation-header">
+                {avatar_html}
+                <div class="author-info">
+                    <div class="author-name">{author_name}</div>
+                    <div class="observation-meta">{formatted_date} · For {child_names}</div>
+                </div>
             </div>
-        </div>
-        <div id="lightbox-counter" class="lightbox-counter"></div>
-    </div>
-"""
-            lightbox_js = f"""
-<script>
-(function() {{
-    const photos = [{photos_js_array}];
-    const photoDate = "{lightbox_date}";
-    const likesCount = {lightbox_likes};
-    const commentsCount = {lightbox_comments};
-    let currentIndex = 0;
-
-    const lightbox = document.getElementById('lightbox');
-    const lightboxImg = document.getElementById('lightbox-img');
-    const lightboxCounter = document.getElementById('lightbox-counter');
-    const lightboxDate = document.getElementById('lightbox-date');
-    const lightboxLikes = document.getElementById('lightbox-likes');
-    const lightboxComments = document.getElementById('lightbox-comments');
-    const prevBtn = document.getElementById('lightbox-prev');
-    const nextBtn = document.getElementById('lightbox-next');
-
-    function updateLightbox() {{
-        lightboxImg.src = photos[currentIndex];
-        lightboxCounter.textContent = (currentIndex + 1) + ' / ' + photos.length;
-        lightboxDate.textContent = photoDate;
-        lightboxLikes.textContent = '💜 ' + likesCount;
-        lightboxComments.textContent = '💬 ' + commentsCount;
-        prevBtn.disabled = currentIndex === 0;
-        nextBtn.disabled = currentIndex === photos.length - 1;
-    }}
-
-    window.openLightbox = function(index) {{
-        currentIndex = index;
-        updateLightbox();
-        lightbox.classList.add('active');
-        document.body.style.overflow = 'hidden';
-    }};
-
-    function closeLightbox() {{
-        lightbox.classList.remove('active');
-        document.body.style.overflow = '';
-    }}
-
-    function navigate(direction) {{
-        const newIndex = currentIndex + direction;
-        if (newIndex >= 0 && newIndex < photos.length) {{
-            currentIndex = newIndex;
-            updateLightbox();
-        }}
-    }}
-
-    document.getElementById('lightbox-close').addEventListener('click', closeLightbox);
-    prevBtn.addEventListener('click', () => navigate(-1));
-    nextBtn.addEventListener('click', () => navigate(1));
-    document.querySelector('.lightbox-touch-left').addEventListener('click', () => navigate(-1));
-    document.querySelector('.lightbox-touch-right').addEventListener('click', () => navigate(1));
-
-    document.addEventListener('keydown', (e) => {{
-        if (!lightbox.classList.contains('active')) return;
-        switch (e.key) {{
-            case 'ArrowLeft': navigate(-1); e.preventDefault(); break;
-            case 'ArrowRight': navigate(1); e.preventDefault(); break;
-            case 'Escape': closeLightbox(); e.preventDefault(); break;
-        }}
-    }});
-
-    lightbox.addEventListener('click', (e) => {{
-        if (e.target === lightbox) closeLightbox();
-    }});
-}})();
-</script>"""
+            <div class="observation-body">
+                {body_html}
+            </div>
+            {behaviors_html}
+            {images_html}
+            {videos_html}
+            {files_html}
+            {comments_html}
+            <div class="observation-footer">
+                <span class="stat {has_tooltip_class}">💜 {likes_count} like{likes_suffix}{likes_tooltip}</span>
+                <span class="stat">💬 {comments_count} comment{comments_suffix}</span>
+            </div>
+        </div>"""
 
-        return f"""<!DOCTYPE html>
+# Static parts of the observation page around its title date and card
+_OBSERVATION_PAGE_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Observation - {formatted_date}</title>
-    <style>{FAMLY_CSS}</style>
+    <title>Observation - """
+_OBSERVATION_PAGE_BODY = f"""</title>
+    <link rel="stylesheet" href="../../{STYLESHEET_FILENAME}">
 </head>
 <body>
     <header>
@@ -1420,493 +1585,13 @@ class HTMLFormatter(OutputFormatter):
         </div>
     </header>
     <div class="container">
-        {card_html}
-    </div>{lightbox_html}{FOOTER_HTML}
-    {lightbox_js}
-</body>
-</html>"""
-
-    def _build_observation_card(
-        self,
-        observation: dict,
-        dir_name_func: callable,
-        image_paths: list[Path] | None = None,
-        file_paths: list[Path] | None = None,
-        video_paths: list[Path] | None = None,
-        base_path: str = "",
-    ) -> str:
         """
-        Build HTML for a single observation card.
-
-        Parameters
-        ----------
-        observation : dict
-            Observation data from API.
-        dir_name_func : callable
-            Function to generate directory names.
-        image_paths : list[Path] | None
-            If provided, use these actual downloaded image paths. Otherwise,
-            construct paths from observation's images metadata.
-        file_paths : list[Path] | None
-            If provided, use these downloaded file attachment paths. Otherwise,
-            construct paths from observation's files metadata.
-        video_paths : list[Path] | None
-            If provided, use these downloaded video paths. Otherwise,
-            construct paths from observation's videos metadata.
-        base_path : str
-            Base path prefix for URLs when paths are None.
+_OBSERVATION_PAGE_FOOTER = FOOTER_HTML + "\n    "
 
-        Returns
-        -------
-        str
-            HTML string for the observation card.
-        """
-        created_by = observation.get("createdBy") or {}
-        author_name = (created_by.get("name") or {}).get("fullName", "Unknown")
-        profile_image = created_by.get("profileImage") or {}
-        author_image = profile_image.get("url", "")
-        remark = observation.get("remark", {})
-        date = remark.get("date", "Unknown date")
-        body_html = remark.get("richTextBody", "") or remark.get("body", "").replace("\n", "<br>")
-        children = observation.get("children", [])
-        child_names = ", ".join(c.get("name", "") for c in children)
-        images = observation.get("images", [])
-        files = observation.get("files", [])
-        videos = observation.get("videos", [])
-        behaviors = observation.get("behaviors", [])
 
-        # Get likes data
-        likes_data = observation.get("likes", {})
-        likes_count = likes_data.get("count", 0)
-        likes_list = likes_data.get("likes", [])
-
-        # Get comments data
-        comments_data = observation.get("comments", {})
-        comments_count = comments_data.get("count", 0)
-        comments_list = comments_data.get("results", [])
-
-        # Format date nicely
-        try:
-            dt = datetime.strptime(date, "%Y-%m-%d")
-            formatted_date = dt.strftime("%d %B %Y")
-        except ValueError:
-            formatted_date = date
-
-        # Build image gallery HTML with lightbox support
-        images_html = ""
-        image_list_for_lightbox = []
-        if image_paths:
-            # Use actual downloaded image paths
-            single_class = "single" if len(image_paths) == 1 else ""
-            images_html = f'<div class="observation-images {single_class}">'
-            for idx, img_path in enumerate(image_paths):
-                rel_path = f"img/{img_path.name}"
-                image_list_for_lightbox.append(rel_path)
-                images_html += f'<a href="#" data-lightbox-index="{idx}" onclick="openLightbox({idx}); return false;"><img src="{rel_path}" alt="Observation image"></a>'
-            images_html += "</div>"
-        elif images:
-            # Construct paths from observation metadata
-            dir_name = dir_name_func(observation)
-            single_class = "single" if len(images) == 1 else ""
-            images_html = f'<div class="observation-images {single_class}">'
-            for idx, img in enumerate(images):
-                img_id = img.get("id", "")[:8]
-                path = img.get("secret", {}).get("path", "")
-                ext = Path(path).suffix if path else ".jpg"
-                rel_path = f"{base_path}{dir_name}/img/{img_id}{ext}"
-                image_list_for_lightbox.append(rel_path)
-                images_html += f'<a href="#" data-lightbox-index="{idx}" onclick="openLightbox({idx}); return false;"><img src="{rel_path}" alt="Observation image"></a>'
-            images_html += "</div>"
-
-        # Store lightbox data for this observation card
-        self._current_lightbox_images = image_list_for_lightbox
-        self._current_lightbox_date = formatted_date
-        self._current_lightbox_likes = likes_count
-        self._current_lightbox_comments = comments_count
-
-        # Build files section HTML
-        files_html = ""
-        if file_paths:
-            # Use actual downloaded file paths
-            files_html = '<div class="files-section"><h3>Attachments</h3>'
-            for fp in file_paths:
-                rel_path = f"files/{fp.name}"
-                icon = "📄" if fp.suffix.lower() == ".pdf" else "📎"
-                files_html += f'<a class="file-attachment" href="{rel_path}" target="_blank"><span class="file-icon">{icon}</span><span class="file-name">{fp.name}</span></a>'
-            files_html += "</div>"
-        elif files:
-            # Construct paths from observation metadata
-            dir_name = dir_name_func(observation)
-            files_html = '<div class="files-section"><h3>Attachments</h3>'
-            for f in files:
-                name = f.get("name", "file")
-                ext = Path(name).suffix.lower()
-                icon = "📄" if ext == ".pdf" else "📎"
-                rel_path = f"{base_path}{dir_name}/files/{name}"
-                files_html += f'<a class="file-attachment" href="{rel_path}" target="_blank"><span class="file-icon">{icon}</span><span class="file-name">{name}</span></a>'
-            files_html += "</div>"
-
-        # Build videos section HTML
-        videos_html = ""
-        if video_paths:
-            videos_html = '<div class="videos-section">'
-            for vp in video_paths:
-                rel_path = f"videos/{vp.name}"
-                videos_html += f"""
-            <div class="video-container">
-                <video controls preload="metadata">
-                    <source src="{rel_path}" type="video/mp4">
-                    Your browser does not support video playback.
-                </video>
-            </div>"""
-            videos_html += "</div>"
-        elif videos:
-            dir_name = dir_name_func(observation)
-            videos_html = '<div class="videos-section">'
-            for v in videos:
-                video_id = v.get("id", "")[:8]
-                rel_path = f"{base_path}{dir_name}/videos/{video_id}.mp4"
-                videos_html += f"""
-            <div class="video-container">
-                <video controls preload="metadata">
-                    <source src="{rel_path}" type="video/mp4">
-                    Your browser does not support video playback.
-                </video>
-            </div>"""
-            videos_html += "</div>"
-
-        # Build behaviors/milestones section HTML
-        behaviors_html = ""
-        if behaviors:
-            behavior_ids = [b.get("behaviorId", "") for b in behaviors if b.get("behaviorId")]
-            if behavior_ids:
-                behaviors_html = '<div class="behaviors-section">'
-                for bid in behavior_ids:
-                    behaviors_html += f'<span class="behavior-tag">{bid}</span>'
-                behaviors_html += "</div>"
-
-        # Avatar HTML
-        avatar_html = (
-            f'<img class="avatar" src="{author_image}" alt="">'
-            if author_image
-            else '<div class="avatar"></div>'
-        )
-
-        # Build likes tooltip HTML
-        likes_tooltip = ""
-        if likes_list:
-            likers = []
-            for like in likes_list:
-                liker_name = (like.get("likedBy") or {}).get("name", {}).get("fullName", "Someone")
-                reaction = like.get("reaction", "💜")
-                likers.append(f"{reaction} {liker_name}")
-            likes_tooltip = f'<span class="tooltip">{", ".join(likers)}</span>'
-
-        has_tooltip_class = "has-tooltip" if likes_list else ""
-
-        # Build comments section HTML
-        comments_html = ""
-        if comments_list:
-            comments_html = '<div class="comments-section"><h3>Comments</h3>'
-            for comment in comments_list:
-                comment_author = (
-                    (comment.get("sentBy") or {}).get("name", {}).get("fullName", "Unknown")
-                )
-                comment_avatar_url = ((comment.get("sentBy") or {}).get("profileImage") or {}).get(
-                    "url", ""
-                )
-                comment_body = comment.get("body", "")
-                comment_date = comment.get("sentAt", "")
-
-                # Format comment date
-                try:
-                    comment_dt = datetime.fromisoformat(comment_date.replace("Z", "+00:00"))
-                    comment_date_formatted = comment_dt.strftime("%d %b %Y, %H:%M")
-                except (ValueError, AttributeError):
-                    comment_date_formatted = ""
-
-                comment_avatar = (
-                    f'<img class="avatar" src="{comment_avatar_url}" alt="">'
-                    if comment_avatar_url
-                    else '<div class="avatar"></div>'
-                )
-
-                comments_html += f"""
-            <div class="comment">
-                {comment_avatar}
-                <div class="comment-content">
-                    <div class="comment-header">
-                        <span class="comment-author">{comment_author}</span>
-                        <span class="comment-date">{comment_date_formatted}</span>
-                    </div>
-                    <div class="comment-body">{comment_body}</div>
-                </div>
-            </div>"""
-            comments_html += "</div>"
-
-        return f"""
-        <div class="observation-card">
-            <div class="observation-header">
-                {avatar_html}
-                <div class="author-info">
-                    <div class="author-name">{author_name}</div>
-                    <div class="observation-meta">{formatted_date} · For {child_names}</div>
-                </div>
-            </div>
-            <div class="observation-body">
-                {body_html}
-            </div>
-            {behaviors_html}
-            {images_html}
-            {videos_html}
-            {files_html}
-            {comments_html}
-            <div class="observation-footer">
-                <span class="stat {has_tooltip_class}">💜 {likes_count} like{"s" if likes_count != 1 else ""}{likes_tooltip}</span>
-                <span class="stat">💬 {comments_count} comment{"s" if comments_count != 1 else ""}</span>
-            </div>
-        </div>"""
-
-    def format_observations_feed(
-        self,
-        observations: list[dict],
-        dir_name_func: callable,
-    ) -> str:
-        """Generate HTML for the observations feed/index page."""
-        # Group observations by month
-        obs_by_month: dict[tuple[str, str], list[dict]] = defaultdict(list)
-        for obs in observations:
-            remark = obs.get("remark", {})
-            date = remark.get("date", "")
-            try:
-                dt = datetime.strptime(date, "%Y-%m-%d")
-                month_key = dt.strftime("%Y-%m")
-                month_label = dt.strftime("%B %Y")
-                obs_by_month[(month_key, month_label)].append(obs)
-            except ValueError:
-                obs_by_month[("0000-00", "Other")].append(obs)
-
-        # Sort months descending (newest first)
-        sorted_months = sorted(obs_by_month.keys(), reverse=True)
-
-        # Build sections HTML and timeline nav
-        sections_html = ""
-        timeline_html = ""
-        prev_year = None
-
-        for month_key, month_label in sorted_months:
-            month_observations = obs_by_month[(month_key, month_label)]
-
-            # Build cards for this month
-            cards_html = ""
-            for obs in month_observations:
-                cards_html += self._build_observation_card(obs, dir_name_func, base_path="")
-
-            sections_html += f"""
-        <div class="month-section" id="month-{month_key}" data-month="{month_key}">
-            <h2>{month_label}</h2>
-            {cards_html}
-        </div>"""
-
-            # Timeline navigation item
-            year = month_key.split("-")[0]
-            short_month = month_label.split()[0][:3]
-
-            if prev_year is not None and year != prev_year:
-                timeline_html += f'<div class="timeline-year">{prev_year}</div>'
-            prev_year = year
-
-            timeline_html += f"""
-            <div class="timeline-item" data-target="month-{month_key}">
-                <span class="timeline-label">{short_month} {year}</span>
-                <span class="timeline-tick"></span>
-            </div>"""
-
-        if prev_year:
-            timeline_html += f'<div class="timeline-year">{prev_year}</div>'
-
-        timeline_js = """
-<script>
-(function() {
-    const items = document.querySelectorAll('.timeline-item');
-    const sections = document.querySelectorAll('.month-section');
-
-    // Click to scroll
-    items.forEach(item => {
-        item.addEventListener('click', () => {
-            const target = document.getElementById(item.dataset.target);
-            if (target) {
-                target.scrollIntoView({ behavior: 'smooth', block: 'start' });
-            }
-        });
-    });
-
-    // Hover neighbor effect
-    items.forEach((item, index) => {
-        item.addEventListener('mouseenter', () => {
-            items.forEach((other, otherIndex) => {
-                other.classList.remove('neighbor', 'neighbor-2');
-                const distance = Math.abs(otherIndex - index);
-                if (distance === 1) other.classList.add('neighbor');
-                else if (distance === 2) other.classList.add('neighbor-2');
-            });
-        });
-        item.addEventListener('mouseleave', () => {
-            items.forEach(other => other.classList.remove('neighbor', 'neighbor-2'));
-        });
-    });
-
-    // Scroll tracking
-    function updateActiveMonth() {
-        const windowHeight = window.innerHeight;
-        let activeSection = null;
-
-        sections.forEach(section => {
-            const rect = section.getBoundingClientRect();
-            if (rect.top <= windowHeight / 3 && rect.bottom > 0) {
-                activeSection = section;
-            }
-        });
-
-        items.forEach(item => {
-            item.classList.remove('active');
-            if (activeSection && item.dataset.target === activeSection.id) {
-                item.classList.add('active');
-            }
-        });
-    }
-
-    window.addEventListener('scroll', updateActiveMonth, { passive: true });
-    updateActiveMonth();
-
-    // Mobile: show timeline on scroll, hide after delay
-    // CSS handles hiding on mobile via media query; this just toggles .visible class
-    let scrollTimeout;
-    let isHovering = false;
-
-    function handleScroll() {
-        nav.classList.add('visible');
-        clearTimeout(scrollTimeout);
-        scrollTimeout = setTimeout(() => {
-            if (!isHovering) nav.classList.remove('visible');
-        }, 1500);
-    }
-    window.addEventListener('scroll', handleScroll, { passive: true });
-
-    nav.addEventListener('mouseenter', () => {
-        isHovering = true;
-        clearTimeout(scrollTimeout);
-    });
-    nav.addEventListener('mouseleave', () => {
-        isHovering = false;
-        scrollTimeout = setTimeout(() => {
-            nav.classList.remove('visible');
-        }, 1500);
-    });
-})();
-</script>"""
-
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Observations Feed</title>
-    <style>{FAMLY_CSS}</style>
-</head>
-<body>
-    <header>
-        <div class="container">
-            <h1><a href="../index.html">Famly Archive</a></h1>
-            <div class="nav-links">
-                <a href="../index.html">← Home</a>
-                <a href="../gallery.html">Photo Gallery</a>
-            </div>
-        </div>
-    </header>
-    <nav class="timeline-nav">
-        {timeline_html}
-    </nav>
-    <div class="container">
-        {sections_html}
-    </div>{FOOTER_HTML}
-    {timeline_js}
-</body>
-</html>"""
-
-    def format_photo_gallery(self, photos: list[Path]) -> str:
-        """Generate HTML for the photo gallery organized by month/year."""
-        if not photos:
-            return ""
-
-        # Group photos by month/year based on filename (YYYY-MM-DD_HHMMSS_id.jpg)
-        photos_by_month: dict[tuple[str, str], list[Path]] = defaultdict(list)
-        for photo in photos:
-            name = photo.stem
-            try:
-                date_part = name.split("_")[0]
-                dt = datetime.strptime(date_part, "%Y-%m-%d")
-                month_key = dt.strftime("%Y-%m")
-                month_label = dt.strftime("%B %Y")
-                photos_by_month[(month_key, month_label)].append(photo)
-            except (ValueError, IndexError):
-                photos_by_month[("0000-00", "Other")].append(photo)
-
-        # Sort months descending (newest first)
-        sorted_months = sorted(photos_by_month.keys(), reverse=True)
-
-        # Build sections HTML and timeline nav items
-        sections_html = ""
-        timeline_html = ""
-        prev_year = None
-
-        # Build a flat list of all photos for the lightbox navigation
-        all_photos = []
-        photo_index = 0
-
-        for month_key, month_label in sorted_months:
-            month_photos = sorted(photos_by_month[(month_key, month_label)], reverse=True)
-            photos_html = ""
-            for photo in month_photos:
-                all_photos.append(photo.name)
-                photos_html += f"""
-                <a href="#" data-lightbox-index="{photo_index}" onclick="openLightbox({photo_index}); return false;">
-                    <img src="{photo.name}" alt="{photo.stem}" loading="lazy">
-                </a>"""
-                photo_index += 1
-
-            # Use month_key as section ID
-            sections_html += f"""
-        <div class="month-section" id="month-{month_key}" data-month="{month_key}">
-            <h2>{month_label}</h2>
-            <div class="photo-grid">
-                {photos_html}
-            </div>
-        </div>"""
-
-            # Extract year and short month for timeline
-            year = month_key.split("-")[0]
-            short_month = month_label.split()[0][:3]  # "January" -> "Jan"
-
-            # Add year separator if year changed
-            if prev_year is not None and year != prev_year:
-                timeline_html += f'<div class="timeline-year">{prev_year}</div>'
-            prev_year = year
-
-            timeline_html += f"""
-            <div class="timeline-item" data-target="month-{month_key}">
-                <span class="timeline-label">{short_month} {year}</span>
-                <span class="timeline-tick"></span>
-            </div>"""
-
-        # Build the photos array for JavaScript
-        photos_js_array = ", ".join(f'"{name}"' for name in all_photos)
-
-        # Add final year label
-        if prev_year:
-            timeline_html += f'<div class="timeline-year">{prev_year}</div>'
-
-        timeline_js = """
+# Script driving the month timeline beside the feed and gallery pages, minified
+# once at import
+_TIMELINE_JS = _minify_js("""
 <script>
 (function() {
     const nav = document.querySelector('.timeline-nav');
@@ -2154,15 +1839,1039 @@ class HTMLFormatter(OutputFormatter):
         }
     }, { passive: false });
 
-    nav.addEventListener('touchend', (e) => {
-        endDrag();
-    });
+    nav.addEventListener('touchend', (e) => {
+        endDrag();
+    });
+
+    nav.addEventListener('touchcancel', (e) => {
+        endDrag();
+    });
+})();
+</script>""")
+
+# Month sections of the feed and gallery pages, and a gallery photo
+_FEED_SECTION_HTML = """
+        <div class="month-section" id="month-{key}" data-month="{key}">
+            <h2>{label}</h2>
+            {cards}
+        </div>"""
+_GALLERY_SECTION_HTML = """
+        <div class="month-section" id="month-{key}" data-month="{key}">
+            <h2>{label}</h2>
+            <div class="photo-grid">
+                {photos}
+            </div>
+        </div>"""
+_GALLERY_PHOTO_HTML = """
+                <a href="#" data-lightbox-index="{idx}" onclick="openLightbox({idx}); return false;">
+                    <img src="{name}" alt="{stem}" loading="lazy">
+                </a>"""
+
+# Static parts of the feed and gallery pages around their month sections. The
+# timeline is rendered in the browser from a JSON list of months
+_TIMELINE_NAV_OPEN = """    <nav class="timeline-nav"></nav>
+    <script>
+(function(months) {
+    const parts = [];
+    let prevYear = null;
+    months.forEach(([key, label]) => {
+        const year = key.split('-')[0];
+        if (prevYear !== null && year !== prevYear) {
+            parts.push('<div class="timeline-year">' + prevYear + '</div>');
+        }
+        prevYear = year;
+        parts.push('<div class="timeline-item" data-target="month-' + key + '">' +
+            '<span class="timeline-label">' + label + ' ' + year + '</span>' +
+            '<span class="timeline-tick"></span></div>');
+    });
+    if (prevYear) parts.push('<div class="timeline-year">' + prevYear + '</div>');
+    document.querySelector('.timeline-nav').innerHTML = parts.join('');
+})("""
+_TIMELINE_PAGE_MIDDLE = """);
+    </script>
+    <div class="container">
+        """
+_FEED_PAGE_HEAD = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Observations Feed</title>
+    <link rel="stylesheet" href="../{STYLESHEET_FILENAME}">
+</head>
+<body>
+    <header>
+        <div class="container">
+            <h1><a href="../index.html">Famly Archive</a></h1>
+            <div class="nav-links">
+                <a href="../index.html">← Home</a>
+                <a href="../gallery.html">Photo Gallery</a>
+            </div>
+        </div>
+    </header>
+"""
+_FEED_PAGE_FOOTER = f"""
+    </div>{FOOTER_HTML}
+    {_TIMELINE_JS}
+</body>
+</html>"""
+_GALLERY_PAGE_HEAD = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Photo Gallery</title>
+    <link rel="stylesheet" href="{STYLESHEET_FILENAME}">
+</head>
+<body>
+    <header>
+        <div class="container">
+            <h1><a href="index.html">Famly Archive</a></h1>
+            <div class="nav-links">
+                <a href="index.html">← Home</a>
+                <a href="observations/index.html">Observations</a>
+            </div>
+        </div>
+    </header>
+"""
+_GALLERY_PAGE_FOOTER = f"""
+    </div>
+
+    <!-- Lightbox overlay -->
+    <div id="lightbox" class="lightbox">
+        <button id="lightbox-close" class="lightbox-close" aria-label="Close"></button>
+        <button id="lightbox-prev" class="lightbox-nav prev" aria-label="Previous"></button>
+        <button id="lightbox-next" class="lightbox-nav next" aria-label="Next"></button>
+        <div class="lightbox-touch-left"></div>
+        <div class="lightbox-touch-right"></div>
+        <img id="lightbox-img" class="lightbox-image" src="" alt="Photo">
+        <div class="lightbox-info">
+            <div class="lightbox-date" id="lightbox-date"></div>
+        </div>
+        <div id="lightbox-counter" class="lightbox-counter"></div>
+    </div>
+
+    {FOOTER_HTML}
+    {_TIMELINE_JS}
+    """
+
+# str.format templates for the message and index pages
+_PARTICIPANT_CHIP_HTML = '<span class="participant-chip">{img}{name}</span>'
+_MESSAGE_HTML = """
+            <div class="message{me_class}">
+                {avatar}
+                <div class="message-content">
+                    <div class="message-author">{author}</div>
+                    <div class="message-body">{body}</div>
+                    {images}
+                    <div class="message-time">{time}</div>
+                </div>
+            </div>"""
+_CONVERSATION_PREVIEW_HTML = """
+            <a href="{conv_id}/index.html" class="conversation-preview">
+                {avatar}
+                <div class="conversation-preview-content">
+                    <div class="conversation-preview-title">{title}</div>
+                    <div class="conversation-preview-snippet">{preview}</div>
+                    <div class="conversation-preview-meta">{date}</div>
+                </div>
+            </a>"""
+_CONVERSATION_PAGE_TEMPLATE = (
+    """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - Messages</title>
+    <link rel="stylesheet" href="../../"""
+    + STYLESHEET_FILENAME
+    + """">
+</head>
+<body>
+    <header>
+        <a href="../index.html" class="back-link">← Home</a>
+        <a href="index.html" class="back-link">Messages</a>
+    </header>
+    <div class="container">
+        <div class="observation-card">
+            <div class="conversation-header">
+                <div class="conversation-participants">
+                    {participants_html}
+                </div>
+                <div class="conversation-meta">
+                    {message_count} messages
+                </div>
+            </div>
+            <div class="messages-list">
+                {messages_html}
+            </div>
+        </div>
+"""
+    + _PAGE_TAIL
+)
+
+_CONVERSATIONS_INDEX_TEMPLATE = (
+    """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Messages</title>
+    <link rel="stylesheet" href="../"""
+    + STYLESHEET_FILENAME
+    + """">
+</head>
+<body>
+    <header>
+        <a href="../index.html" class="back-link">← Home</a>
+        <span class="header-title">Messages</span>
+    </header>
+    <div class="container">
+        <div class="conversations-list">
+            {previews_html}
+        </div>
+"""
+    + _PAGE_TAIL
+)
+
+_INDEX_PAGE_TEMPLATE = (
+    """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <link rel="stylesheet" href=\""""
+    + STYLESHEET_FILENAME
+    + """">
+    <style>
+    .index-hero {{
+        text-align: center;
+        padding: 60px 20px;
+        background: linear-gradient(135deg, var(--famly-purple) 0%, var(--famly-purple-light) 100%);
+        color: white;
+        margin: -20px -20px 30px -20px;
+        border-radius: 0 0 20px 20px;
+    }}
+    .index-hero h1 {{
+        font-size: 2.5rem;
+        margin: 0 0 10px 0;
+    }}
+    .index-hero p {{
+        font-size: 1.1rem;
+        opacity: 0.9;
+        margin: 0;
+    }}
+    .index-cards {{
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
+        gap: 20px;
+        margin-top: 20px;
+    }}
+    .index-card {{
+        background: white;
+        border-radius: 16px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+        padding: 30px;
+        text-decoration: none;
+        color: inherit;
+        transition: transform 0.2s, box-shadow 0.2s;
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        text-align: center;
+    }}
+    .index-card:hover {{
+        transform: translateY(-4px);
+        box-shadow: 0 8px 24px rgba(0,0,0,0.15);
+    }}
+    .index-card-icon {{
+        font-size: 3rem;
+        margin-bottom: 15px;
+    }}
+    .index-card-title {{
+        font-size: 1.3rem;
+        font-weight: 600;
+        margin-bottom: 8px;
+        color: var(--famly-purple);
+    }}
+    .index-card-count {{
+        font-size: 2rem;
+        font-weight: 700;
+        color: var(--famly-purple);
+        margin-bottom: 5px;
+    }}
+    .index-card-label {{
+        font-size: 0.9rem;
+        color: var(--famly-text-light);
+    }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="index-hero">
+            <h1>{title}</h1>
+            <p>Photos and observations from nursery</p>
+        </div>
+        <div class="index-cards">
+            <a class="index-card" href="observations/index.html">
+                <span class="index-card-icon">📝</span>
+                <span class="index-card-title">Observations</span>
+                <span class="index-card-count">{observations_count}</span>
+                <span class="index-card-label">observations</span>
+            </a>
+            <a class="index-card" href="gallery.html">
+                <span class="index-card-icon">📷</span>
+                <span class="index-card-title">Photo Gallery</span>
+                <span class="index-card-count">{photos_count}</span>
+                <span class="index-card-label">photos</span>
+            </a>
+            <a class="index-card" href="messages/index.html">
+                <span class="index-card-icon">💬</span>
+                <span class="index-card-title">Messages</span>
+                <span class="index-card-count">{conversations_count}</span>
+                <span class="index-card-label">conversations</span>
+            </a>
+        </div>
+"""
+    + _PAGE_TAIL
+)
+
+
+class OutputFormatter(ABC):
+    """
+    Abstract base class for output formatters.
+
+    Subclass this to implement different output formats (HTML, JSON, etc.).
+    """
+
+    @property
+    @abstractmethod
+    def file_extension(self) -> str:
+        """File extension for this format (e.g., 'html', 'json')."""
+        ...
+
+    @abstractmethod
+    def format_observation(
+        self,
+        observation: dict,
+        image_paths: list[Path],
+        dir_name_func: callable,
+        file_paths: list[Path] | None = None,
+        video_paths: list[Path] | None = None,
+    ) -> str:
+        """
+        Format a single observation.
+
+        Parameters
+        ----------
+        observation : dict
+            Observation data from API.
+        image_paths : list[Path]
+            List of local paths to downloaded images.
+        dir_name_func : callable
+            Function to generate directory names for observations.
+        file_paths : list[Path] | None
+            List of local paths to downloaded file attachments.
+        video_paths : list[Path] | None
+            List of local paths to downloaded videos.
+
+        Returns
+        -------
+        str
+            Formatted output string.
+        """
+        ...
+
+    def write_observation(
+        self,
+        path: Path,
+        observation: dict,
+        image_paths: list[Path],
+        dir_name_func: callable,
+        file_paths: list[Path] | None = None,
+        video_paths: list[Path] | None = None,
+    ) -> None:
+        """
+        Format a single observation and write it to a file.
+
+        Formats that can produce a page in pieces override this to stream
+        them to the file instead of building the page first.
+
+        Parameters
+        ----------
+        path : Path
+            File to write.
+        observation : dict
+            Observation data from API.
+        image_paths : list[Path]
+            List of local paths to downloaded images.
+        dir_name_func : callable
+            Function to generate directory names for observations.
+        file_paths : list[Path] | None
+            List of local paths to downloaded file attachments.
+        video_paths : list[Path] | None
+            List of local paths to downloaded videos.
+        """
+        output = self.format_observation(
+            observation,
+            image_paths,
+            dir_name_func,
+            file_paths=file_paths,
+            video_paths=video_paths,
+        )
+        path.write_bytes(output.encode("utf-8"))
+
+    @abstractmethod
+    def format_observations_feed(
+        self,
+        observations: list[dict],
+        dir_name_func: callable,
+    ) -> str:
+        """
+        Format the observations feed/index.
+
+        Parameters
+        ----------
+        observations : list[dict]
+            List of observation dictionaries.
+        dir_name_func : callable
+            Function to generate directory names for observations.
+
+        Returns
+        -------
+        str
+            Formatted output string.
+        """
+        ...
+
+    @abstractmethod
+    def format_photo_gallery(
+        self,
+        photos: list[Path],
+    ) -> str:
+        """
+        Format the photo gallery.
+
+        Parameters
+        ----------
+        photos : list[Path]
+            List of photo file paths.
+
+        Returns
+        -------
+        str
+            Formatted output string.
+        """
+        ...
+
+    @abstractmethod
+    def format_conversation(
+        self,
+        conversation: dict,
+        message_images: dict[str, list[Path]],
+    ) -> str:
+        """
+        Format a single conversation page.
+
+        Parameters
+        ----------
+        conversation : dict
+            Full conversation data with messages.
+        message_images : dict[str, list[Path]]
+            Map of messageId to downloaded image paths.
+
+        Returns
+        -------
+        str
+            Formatted output string.
+        """
+        ...
+
+    @abstractmethod
+    def format_conversations_index(
+        self,
+        conversations: list[dict],
+    ) -> str:
+        """
+        Format the conversations index page.
+
+        Parameters
+        ----------
+        conversations : list[dict]
+            List of conversation summaries.
+
+        Returns
+        -------
+        str
+            Formatted output string.
+        """
+        ...
+
+    @abstractmethod
+    def format_index(
+        self,
+        observations_count: int,
+        photos_count: int,
+        conversations_count: int,
+        child_name: str = "",
+    ) -> str:
+        """
+        Format the main index page.
+
+        Parameters
+        ----------
+        observations_count : int
+            Total number of observations.
+        photos_count : int
+            Total number of photos.
+        conversations_count : int
+            Total number of conversations.
+        child_name : str
+            Name of the child (for title).
+
+        Returns
+        -------
+        str
+            Formatted output string.
+        """
+        ...
+
+    def write_static_assets(self, output_dir: Path) -> None:
+        """
+        Write files shared by every page of an archive.
+
+        Called once per archive before any page is written. Formats without
+        shared assets need not override it.
+
+        Parameters
+        ----------
+        output_dir : Path
+            Top-level directory of the archive.
+        """
+        return None
+
+
+class HTMLFormatter(OutputFormatter):
+    """HTML output formatter with Famly-inspired styling."""
+
+    @property
+    def file_extension(self) -> str:
+        return "html"
+
+    def write_static_assets(self, output_dir: Path) -> None:
+        """
+        Write the stylesheet linked from every page.
+
+        The file is left untouched when it is already up to date.
+
+        Parameters
+        ----------
+        output_dir : Path
+            Top-level directory of the archive.
+        """
+        stylesheet = output_dir / STYLESHEET_FILENAME
+        data = _stylesheet_bytes()
+        try:
+            if stylesheet.read_bytes() == data:
+                return
+        except FileNotFoundError:
+            pass
+        stylesheet.write_bytes(data)
+
+    def format_observation(
+        self,
+        observation: dict,
+        image_paths: list[Path],
+        dir_name_func: callable,
+        file_paths: list[Path] | None = None,
+        video_paths: list[Path] | None = None,
+    ) -> str:
+        """Generate HTML for a single observation page."""
+        return "".join(
+            self._observation_page_parts(
+                observation, image_paths, dir_name_func, file_paths, video_paths
+            )
+        )
+
+    def write_observation(
+        self,
+        path: Path,
+        observation: dict,
+        image_paths: list[Path],
+        dir_name_func: callable,
+        file_paths: list[Path] | None = None,
+        video_paths: list[Path] | None = None,
+    ) -> None:
+        """Write the HTML for a single observation page piece by piece."""
+        parts = self._observation_page_parts(
+            observation, image_paths, dir_name_func, file_paths, video_paths
+        )
+        with path.open("w", encoding="utf-8", newline="") as f:
+            f.writelines(parts)
+
+    def _observation_page_parts(
+        self,
+        observation: dict,
+        image_paths: list[Path],
+        dir_name_func: callable,
+        file_paths: list[Path] | None,
+        video_paths: list[Path] | None,
+    ) -> tuple[str, ...]:
+        """
+        Build the pieces of an observation page, in document order.
+
+        Parameters
+        ----------
+        observation : dict
+            Observation data from API.
+        image_paths : list[Path]
+            List of local paths to downloaded images.
+        dir_name_func : callable
+            Function to generate directory names for observations.
+        file_paths : list[Path] | None
+            List of local paths to downloaded file attachments.
+        video_paths : list[Path] | None
+            List of local paths to downloaded videos.
+
+        Returns
+        -------
+        tuple[str, ...]
+            Fragments that concatenate to the full page.
+        """
+        remark = observation.get("remark", {})
+        date = remark.get("date", "Unknown date")
+
+        # Format date for title
+        formatted_date = _format_date_long(date)
+
+        card_html = self._build_observation_card(
+            observation,
+            dir_name_func,
+            image_paths=image_paths,
+            file_paths=file_paths,
+            video_paths=video_paths,
+        )
+
+        # Get lightbox data from the card build
+        lightbox_images = getattr(self, "_current_lightbox_images", [])
+        lightbox_date = getattr(self, "_current_lightbox_date", "")
+        lightbox_likes = getattr(self, "_current_lightbox_likes", 0)
+        lightbox_comments = getattr(self, "_current_lightbox_comments", 0)
+
+        # Build lightbox HTML and JS if there are images
+        lightbox_html = ""
+        lightbox_js = ""
+        if lightbox_images:
+            photos_js_array = ", ".join(f'"{p}"' for p in lightbox_images)
+            lightbox_html = """
+    <!-- Lightbox overlay -->
+    <div id="lightbox" class="lightbox">
+        <button id="lightbox-close" class="lightbox-close" aria-label="Close"></button>
+        <button id="lightbox-prev" class="lightbox-nav prev" aria-label="Previous"></button>
+        <button id="lightbox-next" class="lightbox-nav next" aria-label="Next"></button>
+        <div class="lightbox-touch-left"></div>
+        <div class="lightbox-touch-right"></div>
+        <img id="lightbox-img" class="lightbox-image" src="" alt="Photo">
+        <div class="lightbox-info">
+            <div class="lightbox-date" id="lightbox-date"></div>
+            <div class="lightbox-stats">
+                <span id="lightbox-likes"></span>
+                <span id="lightbox-comments"></span>
+            </div>
+        </div>
+        <div id="lightbox-counter" class="lightbox-counter"></div>
+    </div>
+"""
+            lightbox_js = f"""
+<script>
+(function() {{
+    const photos = [{photos_js_array}];
+    const photoDate = "{lightbox_date}";
+    const likesCount = {lightbox_likes};
+    const commentsCount = {lightbox_comments};
+    let currentIndex = 0;
+
+    const lightbox = document.getElementById('lightbox');
+    const lightboxImg = document.getElementById('lightbox-img');
+    const lightboxCounter = document.getElementById('lightbox-counter');
+    const lightboxDate = document.getElementById('lightbox-date');
+    const lightboxLikes = document.getElementById('lightbox-likes');
+    const lightboxComments = document.getElementById('lightbox-comments');
+    const prevBtn = document.getElementById('lightbox-prev');
+    const nextBtn = document.getElementById('lightbox-next');
+
+    function updateLightbox() {{
+        lightboxImg.src = photos[currentIndex];
+        lightboxCounter.textContent = (currentIndex + 1) + ' / ' + photos.length;
+        lightboxDate.textContent = photoDate;
+        lightboxLikes.textContent = '💜 ' + likesCount;
+        lightboxComments.textContent = '💬 ' + commentsCount;
+        prevBtn.disabled = currentIndex === 0;
+        nextBtn.disabled = currentIndex === photos.length - 1;
+    }}
+
+    window.openLightbox = function(index) {{
+        currentIndex = index;
+        updateLightbox();
+        lightbox.classList.add('active');
+        document.body.style.overflow = 'hidden';
+    }};
+
+    function closeLightbox() {{
+        lightbox.classList.remove('active');
+        document.body.style.overflow = '';
+    }}
+
+    function navigate(direction) {{
+        const newIndex = currentIndex + direction;
+        if (newIndex >= 0 && newIndex < photos.length) {{
+            currentIndex = newIndex;
+            updateLightbox();
+        }}
+    }}
+
+    document.getElementById('lightbox-close').addEventListener('click', closeLightbox);
+    prevBtn.addEventListener('click', () => navigate(-1));
+    nextBtn.addEventListener('click', () => navigate(1));
+    document.querySelector('.lightbox-touch-left').addEventListener('click', () => navigate(-1));
+    document.querySelector('.lightbox-touch-right').addEventListener('click', () => navigate(1));
+
+    document.addEventListener('keydown', (e) => {{
+        if (!lightbox.classList.contains('active')) return;
+        switch (e.key) {{
+            case 'ArrowLeft': navigate(-1); e.preventDefault(); break;
+            case 'ArrowRight': navigate(1); e.preventDefault(); break;
+            case 'Escape': closeLightbox(); e.preventDefault(); break;
+        }}
+    }});
+
+    lightbox.addEventListener('click', (e) => {{
+        if (e.target === lightbox) closeLightbox();
+    }});
+}})();
+</script>"""
+
+        return (
+            _OBSERVATION_PAGE_HEAD,
+            formatted_date,
+            _OBSERVATION_PAGE_BODY,
+            card_html,
+            "\n    </div>",
+            lightbox_html,
+            _OBSERVATION_PAGE_FOOTER,
+            lightbox_js,
+            "\n</body>\n</html>",
+        )
+
+    def _build_observation_card(
+        self,
+        observation: dict,
+        dir_name_func: callable,
+        image_paths: list[Path] | None = None,
+        file_paths: list[Path] | None = None,
+        video_paths: list[Path] | None = None,
+        base_path: str = "",
+    ) -> str:
+        """
+        Build HTML for a single observation card.
+
+        Parameters
+        ----------
+        observation : dict
+            Observation data from API.
+        dir_name_func : callable
+            Function to generate directory names.
+        image_paths : list[Path] | None
+            If provided, use these actual downloaded image paths. Otherwise,
+            construct paths from observation's images metadata.
+        file_paths : list[Path] | None
+            If provided, use these downloaded file attachment paths. Otherwise,
+            construct paths from observation's files metadata.
+        video_paths : list[Path] | None
+            If provided, use these downloaded video paths. Otherwise,
+            construct paths from observation's videos metadata.
+        base_path : str
+            Base path prefix for URLs when paths are None.
+
+        Returns
+        -------
+        str
+            HTML string for the observation card.
+        """
+        created_by = observation.get("createdBy") or {}
+        author_name = _escape_name((created_by.get("name") or {}).get("fullName", "Unknown"))
+        profile_image = created_by.get("profileImage") or {}
+        author_image = escape(profile_image.get("url") or "")
+        remark = observation.get("remark", {})
+        date = remark.get("date", "Unknown date")
+        # richTextBody is already HTML; the plain body is text
+        body_html = remark.get("richTextBody", "") or escape(remark.get("body") or "").replace(
+            "\n", "<br>"
+        )
+        children = observation.get("children", [])
+        child_names = ", ".join(_escape_name(c.get("name", "")) for c in children)
+        images, files, videos = observation_media(observation)
+        behaviors = observation.get("behaviors", [])
+
+        # Media without downloaded paths is linked under the observation's
+        # directory, which is only named once per card
+        dir_name = (
+            dir_name_func(observation)
+            if (images and not image_paths)
+            or (files and not file_paths)
+            or (videos and not video_paths)
+            else ""
+        )
+
+        # Get likes data
+        likes_data = observation.get("likes", {})
+        likes_count = likes_data.get("count", 0)
+        likes_list = likes_data.get("likes", [])
+
+        # Get comments data
+        comments_data = observation.get("comments", {})
+        comments_count = comments_data.get("count", 0)
+        comments_list = comments_data.get("results", [])
+
+        # Format date nicely
+        formatted_date = _format_date_long(date)
+
+        # Build image gallery HTML with lightbox support
+        images_html = ""
+        if image_paths:
+            # Use actual downloaded image paths
+            image_list_for_lightbox = [f"img/{img_path.name}" for img_path in image_paths]
+        else:
+            # Construct paths from observation metadata
+            image_list_for_lightbox = []
+            for img in images:
+                img_id = img.get("id", "")[:8]
+                path = img.get("secret", {}).get("path", "")
+                ext = Path(path).suffix if path else ".jpg"
+                image_list_for_lightbox.append(f"{base_path}{dir_name}/img/{img_id}{ext}")
+        if image_list_for_lightbox:
+            images_html = (
+                (_IMAGES_OPEN_SINGLE if len(image_list_for_lightbox) == 1 else _IMAGES_OPEN_MULTI)
+                + "".join(
+                    _CARD_IMAGE_HTML.format(idx=idx, src=rel_path)
+                    for idx, rel_path in enumerate(image_list_for_lightbox)
+                )
+                + "</div>"
+            )
+
+        # Store lightbox data for this observation card
+        self._current_lightbox_images = image_list_for_lightbox
+        self._current_lightbox_date = formatted_date
+        self._current_lightbox_likes = likes_count
+        self._current_lightbox_comments = comments_count
+
+        # Build files section HTML
+        files_html = ""
+        if file_paths:
+            # Use actual downloaded file paths
+            parts = ['<div class="files-section"><h3>Attachments</h3>']
+            for fp in file_paths:
+                rel_path = f"files/{fp.name}"
+                icon = _EXT_ICONS.get(fp.name.rpartition(".")[2].lower(), "📎")
+                parts.append(
+                    _CARD_FILE_HTML.format(href=escape(rel_path), icon=icon, name=escape(fp.name))
+                )
+            parts.append("</div>")
+            files_html = "".join(parts)
+        elif files:
+            # Construct paths from observation metadata
+            parts = ['<div class="files-section"><h3>Attachments</h3>']
+            for f in files:
+                name = f.get("name", "file")
+                icon = _EXT_ICONS.get(name.rpartition(".")[2].lower(), "📎")
+                rel_path = f"{base_path}{dir_name}/files/{name}"
+                parts.append(
+                    _CARD_FILE_HTML.format(href=escape(rel_path), icon=icon, name=escape(name))
+                )
+            parts.append("</div>")
+            files_html = "".join(parts)
+
+        # Build videos section HTML
+        videos_html = ""
+        if video_paths:
+            parts = ['<div class="videos-section">']
+            for vp in video_paths:
+                rel_path = f"videos/{vp.name}"
+                parts.append(_CARD_VIDEO_HTML.format(src=rel_path))
+            parts.append("</div>")
+            videos_html = "".join(parts)
+        elif videos:
+            parts = ['<div class="videos-section">']
+            for v in videos:
+                video_id = v.get("id", "")[:8]
+                rel_path = f"{base_path}{dir_name}/videos/{video_id}.mp4"
+                parts.append(_CARD_VIDEO_HTML.format(src=rel_path))
+            parts.append("</div>")
+            videos_html = "".join(parts)
+
+        # Build behaviors/milestones section HTML
+        behaviors_html = ""
+        if behaviors:
+            behavior_ids = [b.get("behaviorId", "") for b in behaviors if b.get("behaviorId")]
+            if behavior_ids:
+                parts = ['<div class="behaviors-section">']
+                parts.extend(
+                    f'<span class="behavior-tag">{escape(bid)}</span>' for bid in behavior_ids
+                )
+                parts.append("</div>")
+                behaviors_html = "".join(parts)
+
+        # Avatar HTML
+        avatar_html = (
+            f'<img class="avatar" src="{author_image}" alt="">'
+            if author_image
+            else '<div class="avatar"></div>'
+        )
+
+        # Build likes tooltip HTML
+        likes_tooltip = ""
+        if likes_list:
+            likers = []
+            for like in likes_list:
+                liker_name = (like.get("likedBy") or {}).get("name", {}).get("fullName", "Someone")
+                reaction = like.get("reaction", "💜")
+                likers.append(f"{escape(reaction)} {_escape_name(liker_name)}")
+            likes_tooltip = f'<span class="tooltip">{", ".join(likers)}</span>'
+
+        has_tooltip_class = "has-tooltip" if likes_list else ""
+
+        # Build comments section HTML
+        comments_html = ""
+        if comments_list:
+            parts = ['<div class="comments-section"><h3>Comments</h3>']
+            for comment in comments_list:
+                sent_by = comment.get("sentBy") or {}
+                comment_author = _escape_name(
+                    (sent_by.get("name") or {}).get("fullName", "Unknown")
+                )
+                comment_avatar_url = escape((sent_by.get("profileImage") or {}).get("url") or "")
+                comment_body = escape(comment.get("body") or "")
+                comment_date = comment.get("sentAt", "")
+
+                comment_date_formatted = _format_comment_datetime(comment_date)
+
+                comment_avatar = (
+                    f'<img class="avatar" src="{comment_avatar_url}" alt="">'
+                    if comment_avatar_url
+                    else '<div class="avatar"></div>'
+                )
+
+                parts.append(
+                    _CARD_COMMENT_HTML.format(
+                        avatar=comment_avatar,
+                        author=comment_author,
+                        date=comment_date_formatted,
+                        body=comment_body,
+                    )
+                )
+            parts.append("</div>")
+            comments_html = "".join(parts)
+
+        return _CARD_HTML.format(
+            avatar_html=avatar_html,
+            author_name=author_name,
+            formatted_date=formatted_date,
+            child_names=child_names,
+            body_html=body_html,
+            behaviors_html=behaviors_html,
+            images_html=images_html,
+            videos_html=videos_html,
+            files_html=files_html,
+            comments_html=comments_html,
+            has_tooltip_class=has_tooltip_class,
+            likes_count=likes_count,
+            likes_suffix="s" if likes_count != 1 else "",
+            likes_tooltip=likes_tooltip,
+            comments_count=comments_count,
+            comments_suffix="s" if comments_count != 1 else "",
+        )
+
+    def format_observations_feed(
+        self,
+        observations: list[dict],
+        dir_name_func: callable,
+    ) -> str:
+        """Generate HTML for the observations feed/index page."""
+        # Group observations by month, newest first; the sort is stable, so
+        # observations keep their order within a month
+        by_month = sorted(
+            ((_observation_month(obs), obs) for obs in observations),
+            key=_FIRST,
+            reverse=True,
+        )
+
+        # Build sections HTML and the months for the timeline nav
+        sections: list[str] = []
+        months: list[str] = []
+
+        for month_key, group in itertools.groupby(by_month, key=_FIRST):
+            month_label = _month_label(month_key)
+            # Build cards for this month
+            cards_html = "".join(
+                self._build_observation_card(obs, dir_name_func, base_path="") for _, obs in group
+            )
+
+            sections.append(
+                _FEED_SECTION_HTML.format(key=month_key, label=month_label, cards=cards_html)
+            )
+            months.append(month_key)
+
+        sections_html = "".join(sections)
+
+        return "".join(
+            (
+                _FEED_PAGE_HEAD,
+                _TIMELINE_NAV_OPEN,
+                _timeline_json(months),
+                _TIMELINE_PAGE_MIDDLE,
+                sections_html,
+                _FEED_PAGE_FOOTER,
+            )
+        )
+
+    def format_photo_gallery(self, photos: list[Path]) -> str:
+        """Generate HTML for the photo gallery organized by month/year."""
+        if not photos:
+            return ""
+
+        # Photos newest first, so each month is one run that can be rendered as it ends
+        by_month = _sorted_photos(photos)
+
+        # Build sections HTML and the months for the timeline nav
+        sections: list[str] = []
+        months: list[str] = []
+
+        # Build a flat list of all photos for the lightbox navigation
+        all_photos = []
+        photo_index = 0
+
+        for month_key, group in itertools.groupby(by_month, key=_FIRST):
+            month_label = _month_label(month_key)
+            months.append(month_key)
+            photo_parts = []
+            for _, _, name, stem in group:
+                all_photos.append(name)
+                photo_parts.append(
+                    _GALLERY_PHOTO_HTML.format(idx=photo_index, name=name, stem=stem)
+                )
+                photo_index += 1
+            photos_html = "".join(photo_parts)
+
+            # Use month_key as section ID
+            sections.append(
+                _GALLERY_SECTION_HTML.format(key=month_key, label=month_label, photos=photos_html)
+            )
 
-    nav.addEventListener('touchcancel', (e) => {
-        endDrag();
-    });
-})();
-</script>"""
+        # Build the photos array for JavaScript
+        photos_js_array = ", ".join(f'"{name}"' for name in all_photos)
+
+        sections_html = "".join(sections)
 
         lightbox_js = f"""
 <script>
@@ -2240,50 +2949,18 @@ class HTMLFormatter(OutputFormatter):
 }})();
 </script>"""
 
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Photo Gallery</title>
-    <style>{FAMLY_CSS}</style>
-</head>
-<body>
-    <header>
-        <div class="container">
-            <h1><a href="index.html">Famly Archive</a></h1>
-            <div class="nav-links">
-                <a href="index.html">← Home</a>
-                <a href="observations/index.html">Observations</a>
-            </div>
-        </div>
-    </header>
-    <nav class="timeline-nav">
-        {timeline_html}
-    </nav>
-    <div class="container">
-        {sections_html}
-    </div>
-
-    <!-- Lightbox overlay -->
-    <div id="lightbox" class="lightbox">
-        <button id="lightbox-close" class="lightbox-close" aria-label="Close"></button>
-        <button id="lightbox-prev" class="lightbox-nav prev" aria-label="Previous"></button>
-        <button id="lightbox-next" class="lightbox-nav next" aria-label="Next"></button>
-        <div class="lightbox-touch-left"></div>
-        <div class="lightbox-touch-right"></div>
-        <img id="lightbox-img" class="lightbox-image" src="" alt="Photo">
-        <div class="lightbox-info">
-            <div class="lightbox-date" id="lightbox-date"></div>
-        </div>
-        <div id="lightbox-counter" class="lightbox-counter"></div>
-    </div>
-
-    {FOOTER_HTML}
-    {timeline_js}
-    {lightbox_js}
-</body>
-</html>"""
+        return "".join(
+            (
+                _GALLERY_PAGE_HEAD,
+                _TIMELINE_NAV_OPEN,
+                _timeline_json(months),
+                _TIMELINE_PAGE_MIDDLE,
+                sections_html,
+                _GALLERY_PAGE_FOOTER,
+                lightbox_js,
+                "\n</body>\n</html>",
+            )
+        )
 
     def format_conversation(
         self,
@@ -2293,37 +2970,30 @@ class HTMLFormatter(OutputFormatter):
         """Generate HTML for a single conversation page."""
         participants = conversation.get("participants", [])
         messages = conversation.get("messages", [])
-        title = conversation.get("title") or " & ".join(
-            p.get("title", "Unknown") for p in participants[:2]
+        title = escape(
+            conversation.get("title")
+            or " & ".join(p.get("title", "Unknown") for p in participants[:2])
         )
 
         # Build participants chips
-        participants_html = ""
-        for p in participants:
-            img = p.get("image", "")
-            name = p.get("title", "Unknown")
-            img_html = f'<img src="{img}" alt="">' if img else ""
-            participants_html += f'<span class="participant-chip">{img_html}{name}</span>'
+        participants_html = "".join(
+            _PARTICIPANT_CHIP_HTML.format(
+                img=f'<img src="{escape(p["image"])}" alt="">' if p.get("image") else "",
+                name=_escape_name(p.get("title", "Unknown")),
+            )
+            for p in participants
+        )
 
         # Build messages HTML
-        messages_html = ""
+        message_parts = []
         for msg in messages:
             msg_id = msg.get("messageId", "")
-            body = msg.get("body", "")
+            body = escape(msg.get("body") or "")
             author = msg.get("author", {})
-            author_name = author.get("title", "Unknown")
-            author_img = author.get("image", "")
+            author_name = _escape_name(author.get("title", "Unknown"))
+            author_img = escape(author.get("image") or "")
             is_me = author.get("me", False)
-            sent_at = msg.get("createdAt", "")
-
-            # Format timestamp
-            try:
-                from datetime import datetime
-
-                dt = datetime.fromisoformat(sent_at.replace("+00:00", "+00:00"))
-                time_str = dt.strftime("%d %b %Y, %H:%M")
-            except (ValueError, AttributeError):
-                time_str = sent_at
+            time_str = _format_message_datetime(msg.get("createdAt", ""))
 
             # Avatar
             avatar_html = (
@@ -2335,53 +3005,34 @@ class HTMLFormatter(OutputFormatter):
             # Images attached to this message
             images_html = ""
             if msg_id in message_images:
-                images_html = '<div class="message-images">'
-                for img_path in message_images[msg_id]:
-                    images_html += f'<img src="images/{img_path.name}" alt="Attached image">'
-                images_html += "</div>"
+                images_html = (
+                    '<div class="message-images">'
+                    + "".join(
+                        f'<img src="images/{img_path.name}" alt="Attached image">'
+                        for img_path in message_images[msg_id]
+                    )
+                    + "</div>"
+                )
 
             me_class = " from-me" if is_me else ""
-            messages_html += f"""
-            <div class="message{me_class}">
-                {avatar_html}
-                <div class="message-content">
-                    <div class="message-author">{author_name}</div>
-                    <div class="message-body">{body}</div>
-                    {images_html}
-                    <div class="message-time">{time_str}</div>
-                </div>
-            </div>"""
+            message_parts.append(
+                _MESSAGE_HTML.format(
+                    me_class=me_class,
+                    avatar=avatar_html,
+                    author=author_name,
+                    body=body,
+                    images=images_html,
+                    time=time_str,
+                )
+            )
+        messages_html = "".join(message_parts)
 
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - Messages</title>
-    <style>{FAMLY_CSS}</style>
-</head>
-<body>
-    <header>
-        <a href="../index.html" class="back-link">← Home</a>
-        <a href="index.html" class="back-link">Messages</a>
-    </header>
-    <div class="container">
-        <div class="observation-card">
-            <div class="conversation-header">
-                <div class="conversation-participants">
-                    {participants_html}
-                </div>
-                <div class="conversation-meta">
-                    {len(messages)} messages
-                </div>
-            </div>
-            <div class="messages-list">
-                {messages_html}
-            </div>
-        </div>
-    </div>{FOOTER_HTML}
-</body>
-</html>"""
+        return _CONVERSATION_PAGE_TEMPLATE.format(
+            title=title,
+            participants_html=participants_html,
+            message_count=len(messages),
+            messages_html=messages_html,
+        )
 
     def format_conversations_index(
         self,
@@ -2389,68 +3040,41 @@ class HTMLFormatter(OutputFormatter):
     ) -> str:
         """Generate HTML for the conversations index page."""
         # Build conversation previews
-        previews_html = ""
+        previews = []
         for conv in conversations:
-            conv_id = conv.get("conversationId", "")[:8]
+            conv_id = escape(conv.get("conversationId", "")[:8])
             participants = conv.get("participants", [])
-            title = conv.get("title") or " & ".join(
-                p.get("title", "Unknown") for p in participants[:2]
+            title = escape(
+                conv.get("title") or " & ".join(p.get("title", "Unknown") for p in participants[:2])
             )
-            last_msg = conv.get("lastMessage", {})
-            preview = last_msg.get("body", "")[:80]
-            if len(last_msg.get("body", "")) > 80:
+            last_body = (conv.get("lastMessage") or {}).get("body") or ""
+            preview = escape(last_body[:80])
+            if len(last_body) > 80:
                 preview += "..."
-            last_activity = conv.get("lastActivityAt", "")
-
-            # Format date
-            try:
-                from datetime import datetime
-
-                dt = datetime.fromisoformat(last_activity.replace("+00:00", "+00:00"))
-                date_str = dt.strftime("%d %b %Y")
-            except (ValueError, AttributeError):
-                date_str = last_activity
+            date_str = _format_message_date(conv.get("lastActivityAt", ""))
 
             # Get avatar from first participant
             avatar = ""
             if participants:
-                avatar = participants[0].get("image", "")
+                avatar = escape(participants[0].get("image") or "")
             avatar_html = (
                 f'<img class="conversation-preview-avatar" src="{avatar}" alt="">'
                 if avatar
                 else '<div class="conversation-preview-avatar"></div>'
             )
 
-            previews_html += f"""
-            <a href="{conv_id}/index.html" class="conversation-preview">
-                {avatar_html}
-                <div class="conversation-preview-content">
-                    <div class="conversation-preview-title">{title}</div>
-                    <div class="conversation-preview-snippet">{preview}</div>
-                    <div class="conversation-preview-meta">{date_str}</div>
-                </div>
-            </a>"""
+            previews.append(
+                _CONVERSATION_PREVIEW_HTML.format(
+                    conv_id=conv_id,
+                    avatar=avatar_html,
+                    title=title,
+                    preview=preview,
+                    date=date_str,
+                )
+            )
+        previews_html = "".join(previews)
 
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Messages</title>
-    <style>{FAMLY_CSS}</style>
-</head>
-<body>
-    <header>
-        <a href="../index.html" class="back-link">← Home</a>
-        <span class="header-title">Messages</span>
-    </header>
-    <div class="container">
-        <div class="conversations-list">
-            {previews_html}
-        </div>
-    </div>{FOOTER_HTML}
-</body>
-</html>"""
+        return _CONVERSATIONS_INDEX_TEMPLATE.format(previews_html=previews_html)
 
     def format_index(
         self,
@@ -2460,106 +3084,14 @@ class HTMLFormatter(OutputFormatter):
         child_name: str = "",
     ) -> str:
         """Generate HTML for the main index page."""
-        title = f"{child_name}'s Famly Archive" if child_name else "Famly Archive"
+        title = f"{escape(child_name)}'s Famly Archive" if child_name else "Famly Archive"
 
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>{FAMLY_CSS}
-    .index-hero {{
-        text-align: center;
-        padding: 60px 20px;
-        background: linear-gradient(135deg, var(--famly-purple) 0%, var(--famly-purple-light) 100%);
-        color: white;
-        margin: -20px -20px 30px -20px;
-        border-radius: 0 0 20px 20px;
-    }}
-    .index-hero h1 {{
-        font-size: 2.5rem;
-        margin: 0 0 10px 0;
-    }}
-    .index-hero p {{
-        font-size: 1.1rem;
-        opacity: 0.9;
-        margin: 0;
-    }}
-    .index-cards {{
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-        gap: 20px;
-        margin-top: 20px;
-    }}
-    .index-card {{
-        background: white;
-        border-radius: 16px;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        padding: 30px;
-        text-decoration: none;
-        color: inherit;
-        transition: transform 0.2s, box-shadow 0.2s;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        text-align: center;
-    }}
-    .index-card:hover {{
-        transform: translateY(-4px);
-        box-shadow: 0 8px 24px rgba(0,0,0,0.15);
-    }}
-    .index-card-icon {{
-        font-size: 3rem;
-        margin-bottom: 15px;
-    }}
-    .index-card-title {{
-        font-size: 1.3rem;
-        font-weight: 600;
-        margin-bottom: 8px;
-        color: var(--famly-purple);
-    }}
-    .index-card-count {{
-        font-size: 2rem;
-        font-weight: 700;
-        color: var(--famly-purple);
-        margin-bottom: 5px;
-    }}
-    .index-card-label {{
-        font-size: 0.9rem;
-        color: var(--famly-text-light);
-    }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="index-hero">
-            <h1>{title}</h1>
-            <p>Photos and observations from nursery</p>
-        </div>
-        <div class="index-cards">
-            <a class="index-card" href="observations/index.html">
-                <span class="index-card-icon">📝</span>
-                <span class="index-card-title">Observations</span>
-                <span class="index-card-count">{observations_count}</span>
-                <span class="index-card-label">observations</span>
-            </a>
-            <a class="index-card" href="gallery.html">
-                <span class="index-card-icon">📷</span>
-                <span class="index-card-title">Photo Gallery</span>
-                <span class="index-card-count">{photos_count}</span>
-                <span class="index-card-label">photos</span>
-            </a>
-            <a class="index-card" href="messages/index.html">
-                <span class="index-card-icon">💬</span>
-                <span class="index-card-title">Messages</span>
-                <span class="index-card-count">{conversations_count}</span>
-                <span class="index-card-label">conversations</span>
-            </a>
-        </div>
-    </div>{FOOTER_HTML}
-</body>
-</html>"""
+        return _INDEX_PAGE_TEMPLATE.format(
+            title=title,
+            observations_count=observations_count,
+            photos_count=photos_count,
+            conversations_count=conversations_count,
+        )
 
 
 class JSONFormatter(OutputFormatter):
@@ -2578,15 +3110,38 @@ class JSONFormatter(OutputFormatter):
         video_paths: list[Path] | None = None,
     ) -> str:
         """Generate JSON for a single observation."""
-        import json
+        return _dump_json(self._observation_data(observation, image_paths, file_paths, video_paths))
+
+    def write_observation(
+        self,
+        path: Path,
+        observation: dict,
+        image_paths: list[Path],
+        dir_name_func: callable,
+        file_paths: list[Path] | None = None,
+        video_paths: list[Path] | None = None,
+    ) -> None:
+        """Write JSON for a single observation, encoded straight to bytes."""
+        path.write_bytes(
+            _dump_json_bytes(
+                self._observation_data(observation, image_paths, file_paths, video_paths)
+            )
+        )
 
+    def _observation_data(
+        self,
+        observation: dict,
+        image_paths: list[Path],
+        file_paths: list[Path] | None,
+        video_paths: list[Path] | None,
+    ) -> dict:
+        """Build the JSON data of a single observation."""
         created_by = observation.get("createdBy") or {}
         remark = observation.get("remark", {})
         children = observation.get("children", [])
         likes_data = observation.get("likes", {})
         comments_data = observation.get("comments", {})
-        files_data = observation.get("files", [])
-        videos_data = observation.get("videos", [])
+        images_data, files_data, videos_data = observation_media(observation)
         behaviors_data = observation.get("behaviors", [])
         file_paths = file_paths or []
         video_paths = video_paths or []
@@ -2611,12 +3166,9 @@ class JSONFormatter(OutputFormatter):
                     "width": img.get("width"),
                     "height": img.get("height"),
                 }
-                for img, p in zip(
-                    observation.get("images", []),
-                    [*image_paths, *[None] * 100],
-                    strict=False,  # Pad with None for undownloaded
-                )
-            ][: len(observation.get("images", []))],
+                # Media that was not downloaded gets no local path
+                for img, p in zip(images_data, _pad_none(image_paths), strict=False)
+            ],
             "videos": [
                 {
                     "id": v.get("id"),
@@ -2625,24 +3177,16 @@ class JSONFormatter(OutputFormatter):
                     "width": v.get("width"),
                     "height": v.get("height"),
                 }
-                for v, p in zip(
-                    videos_data,
-                    [*video_paths, *[None] * 100],
-                    strict=False,
-                )
-            ][: len(videos_data)],
+                for v, p in zip(videos_data, _pad_none(video_paths), strict=False)
+            ],
             "files": [
                 {
                     "id": f.get("id"),
                     "name": f.get("name"),
                     "localPath": f"files/{Path(p).name}" if p else None,
                 }
-                for f, p in zip(
-                    files_data,
-                    [*file_paths, *[None] * 100],
-                    strict=False,
-                )
-            ][: len(files_data)],
+                for f, p in zip(files_data, _pad_none(file_paths), strict=False)
+            ],
             "likes": {
                 "count": likes_data.get("count", 0),
                 "likers": [
@@ -2674,7 +3218,7 @@ class JSONFormatter(OutputFormatter):
             },
         }
 
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return data
 
     def format_observations_feed(
         self,
@@ -2682,8 +3226,6 @@ class JSONFormatter(OutputFormatter):
         dir_name_func: callable,
     ) -> str:
         """Generate JSON for the observations feed/index."""
-        import json
-
         feed_data = {
             "type": "observations_feed",
             "count": len(observations),
@@ -2694,7 +3236,7 @@ class JSONFormatter(OutputFormatter):
             created_by = obs.get("createdBy") or {}
             remark = obs.get("remark", {})
             children = obs.get("children", [])
-            images = obs.get("images", [])
+            images, _, _ = observation_media(obs)
 
             obs_data = {
                 "id": obs.get("id"),
@@ -2709,30 +3251,15 @@ class JSONFormatter(OutputFormatter):
             }
             feed_data["observations"].append(obs_data)
 
-        return json.dumps(feed_data, indent=2, ensure_ascii=False)
+        return _dump_json(feed_data)
 
     def format_photo_gallery(self, photos: list[Path]) -> str:
         """Generate JSON for the photo gallery."""
-        import json
-
         if not photos:
-            return json.dumps({"type": "photo_gallery", "count": 0, "months": []})
-
-        # Group photos by month/year
-        photos_by_month: dict[tuple[str, str], list[Path]] = defaultdict(list)
-        for photo in photos:
-            name = photo.stem
-            try:
-                date_part = name.split("_")[0]
-                dt = datetime.strptime(date_part, "%Y-%m-%d")
-                month_key = dt.strftime("%Y-%m")
-                month_label = dt.strftime("%B %Y")
-                photos_by_month[(month_key, month_label)].append(photo)
-            except (ValueError, IndexError):
-                photos_by_month[("0000-00", "Other")].append(photo)
-
-        # Sort months descending
-        sorted_months = sorted(photos_by_month.keys(), reverse=True)
+            return _dump_json({"type": "photo_gallery", "count": 0, "months": []})
+
+        # Photos newest first, so each month is one run
+        by_month = _sorted_photos(photos)
 
         gallery_data = {
             "type": "photo_gallery",
@@ -2740,23 +3267,24 @@ class JSONFormatter(OutputFormatter):
             "months": [],
         }
 
-        for month_key, month_label in sorted_months:
-            month_photos = sorted(photos_by_month[(month_key, month_label)], reverse=True)
+        for month_key, group in itertools.groupby(by_month, key=_FIRST):
+            month_label = _month_label(month_key)
+            month_photos = [
+                {
+                    "filename": name,
+                    "date": stem.split("_", 1)[0] if "_" in stem else None,
+                }
+                for _, _, name, stem in group
+            ]
             month_data = {
                 "key": month_key,
                 "label": month_label,
                 "count": len(month_photos),
-                "photos": [
-                    {
-                        "filename": p.name,
-                        "date": p.stem.split("_")[0] if "_" in p.stem else None,
-                    }
-                    for p in month_photos
-                ],
+                "photos": month_photos,
             }
             gallery_data["months"].append(month_data)
 
-        return json.dumps(gallery_data, indent=2, ensure_ascii=False)
+        return _dump_json(gallery_data)
 
     def format_conversation(
         self,
@@ -2764,8 +3292,6 @@ class JSONFormatter(OutputFormatter):
         message_images: dict[str, list[Path]],
     ) -> str:
         """Generate JSON for a single conversation."""
-        import json
-
         participants = conversation.get("participants", [])
         messages = conversation.get("messages", [])
 
@@ -2803,15 +3329,13 @@ class JSONFormatter(OutputFormatter):
                 for msg in messages
             ],
         }
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return _dump_json(data)
 
     def format_conversations_index(
         self,
         conversations: list[dict],
     ) -> str:
         """Generate JSON for the conversations index."""
-        import json
-
         data = {
             "type": "conversations_index",
             "count": len(conversations),
@@ -2827,7 +3351,7 @@ class JSONFormatter(OutputFormatter):
                 for conv in conversations
             ],
         }
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return _dump_json(data)
 
     def format_index(
         self,
@@ -2837,8 +3361,6 @@ class JSONFormatter(OutputFormatter):
         child_name: str = "",
     ) -> str:
         """Generate JSON for the main index page."""
-        import json
-
         data = {
             "type": "index",
             "childName": child_name,
@@ -2855,9 +3377,12 @@ class JSONFormatter(OutputFormatter):
                 "path": "messages/index.json",
             },
         }
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return _dump_json(data)
 
 
+# File extensions treated as photos when scanning the output directory
+PHOTO_SUFFIXES = frozenset((".jpg", ".jpeg", ".png"))
+
 # Registry of available formatters
 FORMATTERS: dict[str, type[OutputFormatter]] = {
     "html": HTMLFormatter,
@@ -2904,15 +3429,31 @@ def get_photos_from_directory(output_dir: Path) -> list[Path]:
     list[Path]
         List of photo file paths.
     """
-    if not output_dir.exists():
-        return []
+    # scandir reports entry types from the directory listing itself, so
+    # thousands of photos need no stat() call each
     photos = []
-    for f in output_dir.iterdir():
-        if f.is_file() and f.suffix.lower() in (".jpg", ".jpeg", ".png"):
-            photos.append(f)
+    try:
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                # Same suffix as os.path.splitext, without building a tuple per entry
+                dot = name.rfind(".")
+                if dot > 0 and name[dot:].lower() in PHOTO_SUFFIXES and entry.is_file():
+                    photos.append(output_dir / name)
+    except FileNotFoundError:
+        return []
     return photos
 
 
+def _count_subdirectories(directory: Path) -> int:
+    """Count the subdirectories of a directory, or 0 if it does not exist."""
+    try:
+        with os.scandir(directory) as entries:
+            return sum(1 for entry in entries if entry.is_dir())
+    except FileNotFoundError:
+        return 0
+
+
 def get_observations_count_from_directory(output_dir: Path) -> int:
     """
     Count observation folders in the observations subdirectory.
@@ -2927,14 +3468,7 @@ def get_observations_count_from_directory(output_dir: Path) -> int:
     int
         Number of observation folders found.
     """
-    obs_dir = output_dir / "observations"
-    if not obs_dir.exists():
-        return 0
-    count = 0
-    for f in obs_dir.iterdir():
-        if f.is_dir():
-            count += 1
-    return count
+    return _count_subdirectories(output_dir / "observations")
 
 
 def get_conversations_count_from_directory(output_dir: Path) -> int:
@@ -2951,11 +3485,4 @@ def get_conversations_count_from_directory(output_dir: Path) -> int:
     int
         Number of conversation folders found.
     """
-    messages_dir = output_dir / "messages"
-    if not messages_dir.exists():
-        return 0
-    count = 0
-    for f in messages_dir.iterdir():
-        if f.is_dir():
-            count += 1
-    return count
+    return _count_subdirectories(output_dir / "messages")
@@ -37,21 +37,65 @@ Usage:
 
 import argparse
 import contextlib
+import hashlib
 import json
 import os
+import re
+import shutil
 import subprocess
 import sys
-import urllib.error
-import urllib.request
-import zipfile
+import tempfile
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import zipfile
 
 # Default config file locations (searched in order)
 DEFAULT_CONFIG_FILES = [".publish.yaml", ".publish.json"]
 
+# JSON copies of parsed YAML config files, so later runs can skip importing and
+# running PyYAML. Kept in the user's cache directory, away from anything that
+# might be committed, since they hold the same credentials as the config.
+YAML_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "famly-downloader"
+    / "publish"
+)
+
+# Cloudflare API host, and seconds to wait on it
+CLOUDFLARE_API_HOST = "api.cloudflare.com"
+CLOUDFLARE_API_TIMEOUT = 30
+# Methods resent once when a kept-alive API connection turns out to be closed
+API_RETRY_METHODS = frozenset({"GET", "PUT", "DELETE"})
+
+# Account ID in `wrangler whoami` output, matched against the raw bytes
+_ACCOUNT_ID_RE = re.compile(rb"\b([a-f0-9]{32})\b")
+
+# Separators between the words and table borders of `wrangler pages project list`
+_PROJECT_LIST_SPLIT_RE = re.compile(r"[\s│|]+")
+
+# Parsed config files and the modification time they were read at, keyed by
+# resolved path
+_config_cache: dict[Path, tuple[int, dict]] = {}
+
+# Suffix of the file kept next to each zip listing the files it was built from
+ZIP_MANIFEST_SUFFIX = ".manifest.json"
+
+# Write buffer for the zip file, and the size of the pieces members are copied
+# into it in, in bytes
+ZIP_WRITE_BUFFER_SIZE = 1 << 20
+
+# Files that are already compressed; deflating them again costs CPU for no gain,
+# so they are stored as they are
+ZIP_STORED_SUFFIXES = frozenset(
+    {".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".mp4", ".mov", ".m4v", ".gz", ".zip"}
+)
+
 
 @dataclass
 class PublishConfig:
@@ -155,32 +199,16 @@ def load_config(config_path: Path | None = None) -> PublishConfig:
         return config
 
     try:
-        with open(config_file) as f:
-            content = f.read()
-
-        # Try YAML first, fall back to JSON
-        data = None
-        if config_file.suffix in (".yaml", ".yml"):
-            try:
-                import yaml
-
-                data = yaml.safe_load(content)
-            except ImportError:
-                print(
-                    f"Warning: PyYAML not installed, cannot read {config_file}",
-                    file=sys.stderr,
-                )
-        elif config_file.suffix == ".json":
-            data = json.loads(content)
+        # A file unchanged since it was last parsed is served from memory
+        cache_key = config_file.resolve()
+        mtime = config_file.stat().st_mtime_ns
+        cached = _config_cache.get(cache_key)
+        if cached is not None and cached[0] == mtime:
+            data = cached[1]
         else:
-            # Try YAML first, then JSON
-            try:
-                import yaml
-
-                data = yaml.safe_load(content)
-            except ImportError:
-                with contextlib.suppress(json.JSONDecodeError):
-                    data = json.loads(content)
+            data = _parse_config_file(config_file, mtime)
+            if isinstance(data, dict):
+                _config_cache[cache_key] = (mtime, data)
 
         if data:
             config = PublishConfig.from_dict(data)
@@ -192,6 +220,145 @@ def load_config(config_path: Path | None = None) -> PublishConfig:
     return config
 
 
+def _parse_config_file(config_file: Path, mtime: int) -> Any:
+    """Parses a YAML or JSON config file.
+
+    A YAML file is read from its JSON copy when that was written for the
+    same modification time.
+
+    Parameters
+    ----------
+    config_file : Path
+        Config file to read.
+    mtime : int
+        The file's st_mtime_ns.
+
+    Returns
+    -------
+    Any
+        The parsed content, or None if it could not be parsed.
+    """
+    is_yaml = config_file.suffix in (".yaml", ".yml")
+    if is_yaml:
+        cache_path = _yaml_cache_path(config_file)
+        with contextlib.suppress(OSError, ValueError, KeyError, TypeError):
+            cached = json.loads(cache_path.read_text())
+            if cached["src_mtime"] == mtime:
+                return cached["data"]
+
+    with open(config_file) as f:
+        content = f.read()
+
+    # Try YAML first, fall back to JSON
+    data = None
+    if is_yaml:
+        try:
+            import yaml
+
+            data = yaml.safe_load(content)
+            _write_yaml_cache(cache_path, mtime, data)
+        except ImportError:
+            print(
+                f"Warning: PyYAML not installed, cannot read {config_file}",
+                file=sys.stderr,
+            )
+    elif config_file.suffix == ".json":
+        data = json.loads(content)
+    else:
+        # Try YAML first, then JSON
+        try:
+            import yaml
+
+            data = yaml.safe_load(content)
+        except ImportError:
+            with contextlib.suppress(json.JSONDecodeError):
+                data = json.loads(content)
+
+    return data
+
+
+def _yaml_cache_path(config_file: Path) -> Path:
+    """Returns where the JSON copy of a YAML config file is kept.
+
+    Parameters
+    ----------
+    config_file : Path
+        The YAML config file.
+
+    Returns
+    -------
+    Path
+        A file in YAML_CACHE_DIR named after the config file's resolved path.
+    """
+    key = hashlib.sha256(os.fsencode(config_file.resolve())).hexdigest()[:32]
+    return YAML_CACHE_DIR / f"{key}.json"
+
+
+def _write_yaml_cache(cache_path: Path, mtime: int, data: Any) -> None:
+    """Writes the JSON copy of a parsed YAML config file.
+
+    The copy is private to the user, since it holds the same credentials, and
+    is written to a temporary file that is renamed into place, so a failed
+    write never leaves a partial copy. Data that JSON cannot hold, such as
+    YAML dates, is not cached.
+
+    Parameters
+    ----------
+    cache_path : Path
+        Where to write the copy.
+    mtime : int
+        The YAML file's st_mtime_ns when it was read.
+    data : Any
+        The parsed content.
+    """
+    try:
+        content = json.dumps({"src_mtime": mtime, "data": data})
+        cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix=".tmp"
+        )
+    except (OSError, TypeError, ValueError):
+        return
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(tmp_name, cache_path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+
+
+def _walk_files(root: Path) -> Iterator[tuple[str, os.DirEntry]]:
+    """Yields every file under a directory with its path relative to it.
+
+    Directory entries carry their type from the listing itself, so walking
+    needs no stat() call per entry. Symlinked directories are not followed
+    and unreadable ones are skipped, as with Path.rglob.
+
+    Parameters
+    ----------
+    root : Path
+        Directory to walk.
+
+    Yields
+    ------
+    tuple[str, os.DirEntry]
+        Relative path using "/" separators, and the file's entry.
+    """
+    stack = [(os.fspath(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{prefix}{entry.name}/"))
+                    elif entry.is_file():
+                        yield prefix + entry.name, entry
+        except PermissionError:
+            continue
+
+
 @dataclass
 class DeployResult:
     """Result of a deployment operation."""
@@ -206,6 +373,25 @@ class DeployResult:
 class DeployProvider(ABC):
     """Abstract base class for deployment providers."""
 
+    @classmethod
+    @abstractmethod
+    def from_options(cls, args: argparse.Namespace, config: PublishConfig) -> "DeployProvider":
+        """Create the provider from command-line arguments and config file settings.
+
+        Parameters
+        ----------
+        args : argparse.Namespace
+            Parsed command-line arguments, which take priority.
+        config : PublishConfig
+            Settings loaded from the config file.
+
+        Returns
+        -------
+        DeployProvider
+            The configured provider.
+        """
+        pass
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -244,32 +430,128 @@ class ZipProvider(DeployProvider):
         """
         self.output_dir = Path(output_dir)
 
+    @classmethod
+    def from_options(cls, args: argparse.Namespace, config: PublishConfig) -> "ZipProvider":
+        return cls(output_dir=args.output_dir or config.zip_output_dir)
+
     @property
     def name(self) -> str:
         return "zip"
 
+    @staticmethod
+    def _build_manifest(source_dir: Path) -> dict[str, list[int]]:
+        """Lists the files to zip with their size and modification time.
+
+        Parameters
+        ----------
+        source_dir : Path
+            Directory being zipped.
+
+        Returns
+        -------
+        dict[str, list[int]]
+            Map of archive name to [size, mtime_ns] for every file.
+        """
+        manifest = {}
+        for arcname, entry in _walk_files(source_dir):
+            st = entry.stat()
+            manifest[arcname] = [st.st_size, st.st_mtime_ns]
+        return manifest
+
+    @staticmethod
+    def _load_manifest(manifest_path: Path) -> dict[str, list[int]] | None:
+        """Reads the manifest of an earlier zip, or None if there is none."""
+        try:
+            return json.loads(manifest_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_member(zf: "zipfile.ZipFile", source_dir: Path, arcname: str) -> None:
+        """Adds one file to the zip.
+
+        ZipFile.write copies in 8 KiB pieces; copying in much larger ones
+        makes far fewer read and write calls for photos and videos.
+
+        Parameters
+        ----------
+        zf : zipfile.ZipFile
+            Zip open for writing.
+        source_dir : Path
+            Directory being zipped.
+        arcname : str
+            Path of the file within source_dir, as stored in the zip.
+        """
+        import zipfile
+
+        file_path = os.path.join(source_dir, arcname)
+        zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+        if os.path.splitext(arcname)[1].lower() in ZIP_STORED_SUFFIXES:
+            zinfo.compress_type = zipfile.ZIP_STORED
+        else:
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+        with open(file_path, "rb") as src, zf.open(zinfo, "w") as dest:
+            shutil.copyfileobj(src, dest, ZIP_WRITE_BUFFER_SIZE)
+
     def deploy(self, source_dir: Path, project_name: str) -> DeployResult:
-        """Creates a zip file of the photos archive."""
+        """Creates a zip file of the photos archive.
+
+        A zip built earlier today from the same files is kept as it is, and
+        one that only lacks newly added files has them appended.
+        """
+        import zipfile
+
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         date_str = datetime.now().strftime("%Y-%m-%d")
         zip_filename = f"{project_name}-{date_str}.zip"
         zip_path = self.output_dir / zip_filename
+        manifest_path = zip_path.with_name(zip_path.name + ZIP_MANIFEST_SUFFIX)
 
         try:
-            if zip_path.exists():
-                zip_path.unlink()
+            manifest = self._build_manifest(source_dir)
+            previous = self._load_manifest(manifest_path) if zip_path.exists() else None
+            if previous == manifest:
+                return DeployResult(
+                    success=True,
+                    provider=self.name,
+                    message=f"Zip file already up to date: {zip_path}",
+                    path=str(zip_path),
+                )
 
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                for file_path in source_dir.rglob("*"):
-                    if file_path.is_file():
-                        arcname = file_path.relative_to(source_dir)
-                        zf.write(file_path, arcname)
+            # A manifest left behind by a failed build must not vouch for it
+            manifest_path.unlink(missing_ok=True)
 
+            # A zip cannot drop or replace members, so it is only extended when
+            # every file it holds is unchanged; otherwise it is built afresh
+            append = isinstance(previous, dict) and all(
+                manifest.get(arcname) == stat for arcname, stat in previous.items()
+            )
+            if append:
+                arcnames = [arcname for arcname in manifest if arcname not in previous]
+            else:
+                zip_path.unlink(missing_ok=True)
+                arcnames = list(manifest)
+
+            with (
+                open(zip_path, "r+b" if append else "wb", buffering=ZIP_WRITE_BUFFER_SIZE) as fp,
+                zipfile.ZipFile(
+                    fp, "a" if append else "w", zipfile.ZIP_DEFLATED, allowZip64=True
+                ) as zf,
+            ):
+                for arcname in arcnames:
+                    self._write_member(zf, source_dir, arcname)
+
+            manifest_path.write_text(json.dumps(manifest, sort_keys=True))
+
+            if append:
+                message = f"Added {len(arcnames)} file(s) to zip file: {zip_path}"
+            else:
+                message = f"Created zip file: {zip_path}"
             return DeployResult(
                 success=True,
                 provider=self.name,
-                message=f"Created zip file: {zip_path}",
+                message=message,
                 path=str(zip_path),
             )
         except Exception as e:
@@ -312,17 +594,23 @@ class S3Provider(DeployProvider):
         self.prefix = prefix
         self.custom_url = custom_url
 
+    @classmethod
+    def from_options(cls, args: argparse.Namespace, config: PublishConfig) -> "S3Provider":
+        return cls(
+            bucket=args.bucket or config.s3_bucket,
+            region=args.region or config.s3_region,
+            prefix=args.prefix if args.prefix is not None else config.s3_prefix,
+            custom_url=args.custom_url or config.s3_custom_url,
+        )
+
     @property
     def name(self) -> str:
         return "s3"
 
     def _check_aws_cli(self) -> bool:
         """Checks if AWS CLI is available."""
-        try:
-            subprocess.run(["aws", "--version"], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        # Looking it up on PATH avoids starting the CLI's interpreter just for --version
+        return shutil.which("aws") is not None
 
     def _get_s3_path(self, project_name: str) -> str:
         """Builds the S3 destination path."""
@@ -408,6 +696,19 @@ class CloudflareProvider(DeployProvider):
         self.api_token = api_token or os.environ.get("CLOUDFLARE_API_TOKEN", "")
         self.access_emails = access_emails or []
         self._account_id_fetched = False
+        self._apps_cache: list[dict] | None = None
+        self._api_conn = None
+        self._wrangler: list[str] | None = None
+        self._env: tuple[str, dict[str, str]] | None = None
+        self._projects: set[str] | None = None
+
+    @classmethod
+    def from_options(cls, args: argparse.Namespace, config: PublishConfig) -> "CloudflareProvider":
+        return cls(
+            account_id=args.account_id or config.cloudflare_account_id,
+            api_token=args.api_token or config.cloudflare_api_token,
+            access_emails=args.access_emails or config.cloudflare_access_emails,
+        )
 
     @property
     def name(self) -> str:
@@ -423,17 +724,14 @@ class CloudflareProvider(DeployProvider):
         self._account_id_fetched = True
 
         try:
-            import re
-
             result = subprocess.run(
-                ["npx", "--yes", "wrangler", "whoami"],
+                self._wrangler_cmd("whoami"),
                 capture_output=True,
-                text=True,
                 check=True,
             )
-            match = re.search(r"\b([a-f0-9]{32})\b", result.stdout)
+            match = _ACCOUNT_ID_RE.search(result.stdout)
             if match:
-                self.account_id = match.group(1)
+                self.account_id = match.group(1).decode()
                 return True
         except (subprocess.CalledProcessError, FileNotFoundError):
             pass
@@ -441,98 +739,152 @@ class CloudflareProvider(DeployProvider):
         return False
 
     def _check_wrangler(self) -> bool:
-        """Checks if wrangler CLI is available (via npx or directly)."""
-        try:
-            subprocess.run(
-                ["npx", "--yes", "wrangler", "--version"],
-                capture_output=True,
-                check=True,
-            )
+        """Checks if wrangler CLI is available (directly or via npx).
+
+        The command that works is remembered and used for every later wrangler run.
+        """
+        if self._wrangler is not None:
+            return bool(self._wrangler)
+
+        # An installed wrangler skips npx resolving the package on every run
+        if shutil.which("wrangler"):
+            self._wrangler = ["wrangler"]
             return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
 
         try:
             subprocess.run(
-                ["wrangler", "--version"],
+                ["npx", "--yes", "wrangler", "--version"],
                 capture_output=True,
                 check=True,
             )
-            return True
+            self._wrangler = ["npx", "--yes", "wrangler"]
         except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+            self._wrangler = []
+        return bool(self._wrangler)
+
+    def _wrangler_cmd(self, *args: str) -> list[str]:
+        """Builds a wrangler command line, using npx unless wrangler is installed."""
+        return [*(self._wrangler or ["npx", "--yes", "wrangler"]), *args]
 
     def _get_env(self) -> dict[str, str]:
-        """Gets environment with Cloudflare credentials set."""
-        env = os.environ.copy()
-        if self.account_id:
-            env["CLOUDFLARE_ACCOUNT_ID"] = self.account_id
-        return env
+        """Gets environment with Cloudflare credentials set.
+
+        The environment is built once per account ID, so every wrangler run
+        shares one copy.
+        """
+        if self._env is None or self._env[0] != self.account_id:
+            env = os.environ.copy()
+            if self.account_id:
+                env["CLOUDFLARE_ACCOUNT_ID"] = self.account_id
+            self._env = (self.account_id, env)
+        return self._env[1]
 
     def _project_exists(self, project_name: str) -> bool:
-        """Checks if a Pages project exists."""
-        cmd = [
-            "npx",
-            "--yes",
-            "wrangler",
-            "pages",
-            "project",
-            "list",
-        ]
+        """Checks if a Pages project exists.
+
+        The project list is fetched once and reused for later checks.
+        """
+        if self._projects is not None:
+            return project_name in self._projects
+
+        cmd = self._wrangler_cmd("pages", "project", "list")
 
         try:
             result = subprocess.run(
                 cmd, capture_output=True, text=True, check=True, env=self._get_env()
             )
-            return project_name in result.stdout
         except subprocess.CalledProcessError:
             return False
+        # Whole table cells, so a project is not found inside a longer name
+        self._projects = set(_PROJECT_LIST_SPLIT_RE.split(result.stdout))
+        return project_name in self._projects
 
     def _create_project(self, project_name: str) -> bool:
         """Creates a new Pages project."""
         print(f"  Creating project: {project_name}")
-        cmd = [
-            "npx",
-            "--yes",
-            "wrangler",
-            "pages",
-            "project",
-            "create",
-            project_name,
-            "--production-branch=main",
-        ]
+        cmd = self._wrangler_cmd(
+            "pages", "project", "create", project_name, "--production-branch=main"
+        )
 
         try:
             subprocess.run(cmd, check=True, env=self._get_env())
-            return True
         except subprocess.CalledProcessError:
             return False
+        if self._projects is not None:
+            self._projects.add(project_name)
+        return True
+
+    def _api_request(
+        self, method: str, endpoint: str, data: dict | bytes | None = None
+    ) -> dict | None:
+        """Makes an authenticated request to the Cloudflare API.
 
-    def _api_request(self, method: str, endpoint: str, data: dict | None = None) -> dict | None:
-        """Makes an authenticated request to the Cloudflare API."""
+        data may be a dict to send as JSON, or an already encoded JSON body.
+        """
         if not self.api_token or not self.account_id:
             return None
 
-        url = f"https://api.cloudflare.com/client/v4/accounts/{self.account_id}/{endpoint}"
+        # Only Access setup talks to the API, so other runs skip loading http.client
+        import http.client
+
+        path = f"/client/v4/accounts/{self.account_id}/{endpoint}"
         headers = {
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json",
         }
 
-        body = json.dumps(data).encode() if data else None
-        req = urllib.request.Request(url, data=body, headers=headers, method=method)
+        if isinstance(data, bytes):
+            body = data
+        else:
+            body = json.dumps(data).encode() if data else None
 
         try:
-            with urllib.request.urlopen(req) as response:
-                return json.loads(response.read().decode())
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode() if e.fp else ""
-            print(f"  API error: {e.code} - {error_body}", file=sys.stderr)
-            return None
+            # One kept-alive connection serves every request of the Access setup
+            reused = self._api_conn is not None
+            if not reused:
+                self._api_conn = http.client.HTTPSConnection(
+                    CLOUDFLARE_API_HOST, timeout=CLOUDFLARE_API_TIMEOUT
+                )
+            try:
+                self._api_conn.request(method, path, body=body, headers=headers)
+                response = self._api_conn.getresponse()
+            except (http.client.HTTPException, ConnectionError):
+                self._api_conn.close()
+                # A POST may already have reached the server, so only resend requests
+                # that are safe to repeat
+                if not reused or method not in API_RETRY_METHODS:
+                    raise
+                # The server closed the idle connection; send once more on a new one
+                self._api_conn = http.client.HTTPSConnection(
+                    CLOUDFLARE_API_HOST, timeout=CLOUDFLARE_API_TIMEOUT
+                )
+                self._api_conn.request(method, path, body=body, headers=headers)
+                response = self._api_conn.getresponse()
+            response_body = response.read().decode()
         except Exception as e:
+            if self._api_conn is not None:
+                self._api_conn.close()
+                self._api_conn = None
             print(f"  API error: {e}", file=sys.stderr)
             return None
 
+        if response.status >= 400:
+            print(f"  API error: {response.status} - {response_body}", file=sys.stderr)
+            return None
+        try:
+            return json.loads(response_body)
+        except ValueError as e:
+            print(f"  API error: {e}", file=sys.stderr)
+            return None
+
+    def _list_access_apps(self) -> list[dict] | None:
+        """Lists the account's Access applications, fetching them once per run."""
+        if self._apps_cache is None:
+            existing_apps = self._api_request("GET", "access/apps")
+            if existing_apps and existing_apps.get("success"):
+                self._apps_cache = existing_apps.get("result") or []
+        return self._apps_cache
+
     def _setup_access(self, project_name: str, emails: list[str]) -> bool:
         """Sets up Cloudflare Access for the Pages project.
 
@@ -562,13 +914,21 @@ class CloudflareProvider(DeployProvider):
 
         print(f"  Setting up Access for {domain} ({len(emails)} email(s))")
 
-        existing_apps = self._api_request("GET", "access/apps")
-        if existing_apps and existing_apps.get("success"):
-            for app in existing_apps.get("result", []):
-                if app.get("name") == app_name:
-                    print(f"  Access application already exists: {app_name}")
-                    app_id = app["id"]
-                    return self._update_access_policy(app_id, emails)
+        # The same policy is sent whichever request ends up creating or updating it
+        policy_body = json.dumps(
+            {
+                "name": "Email Access",
+                "decision": "allow",
+                "include": [{"email": {"email": email}} for email in emails],
+                "precedence": 1,
+            }
+        ).encode()
+
+        for app in self._list_access_apps() or []:
+            if app.get("name") == app_name:
+                print(f"  Access application already exists: {app_name}")
+                app_id = app["id"]
+                return self._update_access_policy(app_id, emails, policy_body)
 
         app_data = {
             "name": app_name,
@@ -583,15 +943,10 @@ class CloudflareProvider(DeployProvider):
             return True
 
         app_id = result["result"]["id"]
+        if self._apps_cache is not None:
+            self._apps_cache.append(result["result"])
 
-        policy_data = {
-            "name": "Email Access",
-            "decision": "allow",
-            "include": [{"email": {"email": email}} for email in emails],
-            "precedence": 1,
-        }
-
-        policy_result = self._api_request("POST", f"access/apps/{app_id}/policies", policy_data)
+        policy_result = self._api_request("POST", f"access/apps/{app_id}/policies", policy_body)
         if not policy_result or not policy_result.get("success"):
             print("  Warning: Failed to create Access policy", file=sys.stderr)
             return True
@@ -599,8 +954,11 @@ class CloudflareProvider(DeployProvider):
         print(f"  Access configured for: {', '.join(emails)}")
         return True
 
-    def _update_access_policy(self, app_id: str, emails: list[str]) -> bool:
-        """Updates an existing Access application's policy."""
+    def _update_access_policy(self, app_id: str, emails: list[str], policy_body: bytes) -> bool:
+        """Updates an existing Access application's policy.
+
+        policy_body is the encoded policy for emails.
+        """
         policies = self._api_request("GET", f"access/apps/{app_id}/policies")
         if not policies or not policies.get("success"):
             return True
@@ -608,23 +966,11 @@ class CloudflareProvider(DeployProvider):
         for policy in policies.get("result", []):
             if policy.get("name") == "Email Access":
                 policy_id = policy["id"]
-                policy_data = {
-                    "name": "Email Access",
-                    "decision": "allow",
-                    "include": [{"email": {"email": email}} for email in emails],
-                    "precedence": 1,
-                }
-                self._api_request("PUT", f"access/apps/{app_id}/policies/{policy_id}", policy_data)
+                self._api_request("PUT", f"access/apps/{app_id}/policies/{policy_id}", policy_body)
                 print(f"  Access policy updated for: {', '.join(emails)}")
                 return True
 
-        policy_data = {
-            "name": "Email Access",
-            "decision": "allow",
-            "include": [{"email": {"email": email}} for email in emails],
-            "precedence": 1,
-        }
-        self._api_request("POST", f"access/apps/{app_id}/policies", policy_data)
+        self._api_request("POST", f"access/apps/{app_id}/policies", policy_body)
         print(f"  Access policy created for: {', '.join(emails)}")
         return True
 
@@ -649,10 +995,7 @@ class CloudflareProvider(DeployProvider):
                     message=f"Failed to create project: {cf_project_name}",
                 )
 
-        cmd = [
-            "npx",
-            "--yes",
-            "wrangler",
+        cmd = self._wrangler_cmd(
             "pages",
             "deploy",
             str(source_dir),
@@ -660,7 +1003,7 @@ class CloudflareProvider(DeployProvider):
             cf_project_name,
             "--commit-dirty=true",
             "--branch=main",
-        ]
+        )
 
         try:
             print(f"  Running: {' '.join(cmd)}")
@@ -839,20 +1182,6 @@ Environment variables:
     source_dir_str = args.source_dir or config.source_dir
     project_name = args.project_name or config.project_name
 
-    # Cloudflare settings
-    account_id = args.account_id or config.cloudflare_account_id
-    api_token = args.api_token or config.cloudflare_api_token
-    access_emails = args.access_emails if args.access_emails else config.cloudflare_access_emails
-
-    # S3 settings
-    bucket = args.bucket or config.s3_bucket
-    region = args.region or config.s3_region
-    prefix = args.prefix if args.prefix is not None else config.s3_prefix
-    custom_url = args.custom_url or config.s3_custom_url
-
-    # Zip settings
-    output_dir = args.output_dir or config.zip_output_dir
-
     if not provider_name:
         parser.error(
             "--provider is required (use --list-providers to see options, "
@@ -868,25 +1197,12 @@ Environment variables:
         print(f"Error: Not a directory: {source_dir}", file=sys.stderr)
         return 1
 
-    # Create provider with merged options
-    if provider_name == "zip":
-        provider = ZipProvider(output_dir=output_dir)
-    elif provider_name == "s3":
-        provider = S3Provider(
-            bucket=bucket,
-            region=region,
-            prefix=prefix,
-            custom_url=custom_url,
-        )
-    elif provider_name == "cloudflare":
-        provider = CloudflareProvider(
-            account_id=account_id,
-            api_token=api_token,
-            access_emails=access_emails,
-        )
-    else:
+    # Create provider with merged options (each provider reads only its own settings)
+    provider_class = PROVIDERS.get(provider_name)
+    if provider_class is None:
         print(f"Unknown provider: {provider_name}", file=sys.stderr)
         return 1
+    provider = provider_class.from_options(args, config)
 
     print(f"Publishing {source_dir} via {provider.name}...")
 
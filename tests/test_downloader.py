@@ -0,0 +1,733 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the downloader's helpers, run without network access.
+
+Run with: uv run pytest tests/test_downloader.py -v
+"""
+
+import errno
+import io
+import json
+import re
+import threading
+
+import pytest
+import requests
+from urllib3.exceptions import ProtocolError
+
+import famly_downloader
+from famly_downloader import (
+    CONFIG_FILENAME,
+    SYNC_STATE_FILENAME,
+    FamlyDownloader,
+    RateLimiter,
+    _link_or_copy,
+    conversation_index_entry,
+    flush_sync_state,
+    get_last_sync,
+    load_sync_state,
+    mount_pooled_adapter,
+    page_signature,
+    update_last_sync,
+    write_page,
+)
+from output_formats import HTMLFormatter
+
+CONVERSATION_SUMMARY = {
+    "conversationId": "aaaaaaaa-0000-0000-0000-000000000000",
+    "title": "Nursery team",
+    "participants": [{"title": "Jane Smith", "image": ""}],
+    "lastActivityAt": "2024-03-01T09:00:00Z",
+    "lastMessage": {"body": "See you tomorrow"},
+    "unreadCount": 0,
+}
+
+FULL_CONVERSATION = {
+    "conversationId": "bbbbbbbb-0000-0000-0000-000000000000",
+    "title": None,
+    "participants": [{"title": "Sam Jones", "image": ""}, {"title": "Alex Jones"}],
+    "lastActivityAt": "2024-03-02T10:30:00Z",
+    "createdAt": "2024-01-01T08:00:00Z",
+    "messages": [{"messageId": "m1", "body": "Thanks!", "author": {"title": "Sam Jones"}}],
+}
+
+FULL_CONVERSATION_SUMMARY = {
+    "conversationId": FULL_CONVERSATION["conversationId"],
+    "title": None,
+    "participants": FULL_CONVERSATION["participants"],
+    "lastActivityAt": FULL_CONVERSATION["lastActivityAt"],
+    "lastMessage": {"body": "Thanks!"},
+    "unreadCount": 1,
+}
+
+
+class TestConversationsIndex:
+    """Tests for building the conversations index from mixed sources."""
+
+    def test_entries_share_one_shape(self):
+        """Summaries and fetched conversations should reduce to the same fields."""
+        unchanged = conversation_index_entry(CONVERSATION_SUMMARY)
+        fetched = conversation_index_entry(FULL_CONVERSATION_SUMMARY, FULL_CONVERSATION)
+
+        assert unchanged.keys() == fetched.keys()
+        assert "messages" not in fetched
+        assert "unreadCount" not in unchanged
+
+    def test_index_from_summary_and_full_conversation(self):
+        """The index should list both conversations with their previews."""
+        conversations = [
+            conversation_index_entry(CONVERSATION_SUMMARY),
+            conversation_index_entry(FULL_CONVERSATION_SUMMARY, FULL_CONVERSATION),
+        ]
+
+        html = HTMLFormatter().format_conversations_index(conversations)
+
+        assert "Nursery team" in html
+        assert "See you tomorrow" in html
+        assert "Sam Jones &amp; Alex Jones" in html
+        assert "Thanks!" in html
+        assert 'href="aaaaaaaa/index.html"' in html
+        assert 'href="bbbbbbbb/index.html"' in html
+
+
+@pytest.fixture(scope="module")
+def downloader(tmp_path_factory):
+    """Create a downloader that is only used for its helpers, never the network."""
+    with FamlyDownloader("child", "token", output_dir=str(tmp_path_factory.mktemp("out"))) as dl:
+        yield dl
+
+
+class TestGenerateFilename:
+    """Tests for naming downloaded images after their creation time."""
+
+    @pytest.mark.parametrize(
+        ("created_at", "expected"),
+        [
+            ("2024-01-15T14:23:05.123+00:00", "2024-01-15_142305_abcdefgh.jpg"),
+            ("2024-01-15T14:23:05Z", "2024-01-15_142305_abcdefgh.jpg"),
+            ("2024-01-15", "2024-01-15_000000_abcdefgh.jpg"),
+            ("not a date", "unknown_date_abcdefgh.jpg"),
+            ("", "unknown_date_abcdefgh.jpg"),
+            (None, "unknown_date_abcdefgh.jpg"),
+        ],
+    )
+    def test_filename_from_created_at(self, downloader, created_at, expected):
+        """Timestamps should name the file by local date and time, or fall back."""
+        image = {"imageId": "abcdefgh-1234", "createdAt": created_at}
+        assert downloader._generate_filename(image) == expected
+
+    def test_missing_image_id(self, downloader):
+        """An image without an ID should still get a name."""
+        image = {"createdAt": "2024-01-15T14:23:05+00:00"}
+        assert downloader._generate_filename(image) == "2024-01-15_142305_unknown.jpg"
+
+
+class TestSyncState:
+    """Tests for loading and saving the last sync timestamps."""
+
+    def test_migrates_legacy_credentials_entry(self, tmp_path):
+        """Timestamps kept in the credentials file should move to the sync state file."""
+        (tmp_path / CONFIG_FILENAME).write_text(
+            json.dumps({"access_token": "t", "last_sync": {"child": "2024-01-15T10:00:00Z"}})
+        )
+
+        state = load_sync_state(tmp_path)
+        assert get_last_sync(state, "child") == "2024-01-15T10:00:00Z"
+        assert get_last_sync(state, "child", "conversations") is None
+
+        flush_sync_state(tmp_path)
+        saved = json.loads((tmp_path / SYNC_STATE_FILENAME).read_text())
+        assert saved == {"child": "2024-01-15T10:00:00Z"}
+
+    def test_update_keeps_legacy_image_timestamp(self, tmp_path):
+        """Adding a kind to a legacy entry should keep its image timestamp."""
+        (tmp_path / SYNC_STATE_FILENAME).write_text(json.dumps({"child": "2024-01-15T10:00:00Z"}))
+
+        update_last_sync(tmp_path, "child", "2024-02-01T09:00:00Z", "conversations")
+        flush_sync_state(tmp_path)
+
+        saved = json.loads((tmp_path / SYNC_STATE_FILENAME).read_text())
+        assert saved == {
+            "child": {"images": "2024-01-15T10:00:00Z", "conversations": "2024-02-01T09:00:00Z"}
+        }
+
+    def test_drops_malformed_entries(self, tmp_path):
+        """Entries that are neither timestamps nor maps of them should be ignored."""
+        (tmp_path / SYNC_STATE_FILENAME).write_text(
+            json.dumps({"good": {"images": "2024-01-15", "bad": 1}, "bad": 3})
+        )
+
+        assert load_sync_state(tmp_path) == {"good": {"images": "2024-01-15"}}
+
+
+class TestWritePage:
+    """Tests for skipping pages whose inputs have not changed."""
+
+    def test_unchanged_page_is_not_rewritten(self, tmp_path):
+        """A page with the same signature should not be rendered again."""
+        formatter = HTMLFormatter()
+        page = tmp_path / "index.html"
+        signatures = {}
+        renders = []
+
+        def render(text):
+            renders.append(text)
+            return text
+
+        signature = page_signature(formatter, ["a", "b"])
+        assert write_page(page, signature, signatures, "index.html", render, "first")
+        assert not write_page(page, signature, signatures, "index.html", render, "second")
+
+        assert renders == ["first"]
+        assert page.read_text() == "first"
+
+    def test_changed_inputs_rewrite_page(self, tmp_path):
+        """A page should be rewritten when its inputs change."""
+        formatter = HTMLFormatter()
+        page = tmp_path / "index.html"
+        signatures = {}
+
+        write_page(page, page_signature(formatter, ["a"]), signatures, "index.html", str, "old")
+        signature = page_signature(formatter, ["a", "b"])
+        assert write_page(page, signature, signatures, "index.html", str, "new")
+
+        assert page.read_text() == "new"
+        assert signatures["index.html"] == signature
+
+    def test_missing_page_is_rewritten(self, tmp_path):
+        """A page deleted since the last run should be written again."""
+        formatter = HTMLFormatter()
+        page = tmp_path / "index.html"
+        signature = page_signature(formatter, ["a"])
+        signatures = {"index.html": signature}
+
+        assert write_page(page, signature, signatures, "index.html", str, "restored")
+        assert page.read_text() == "restored"
+
+
+OBSERVATION = {
+    "id": "obs12345-0000",
+    "remark": {"date": "2024-03-01", "body": "Painted a rainbow"},
+    "createdBy": {"name": {"fullName": "Jane Smith"}, "profileImage": {"url": "https://x/a.jpg"}},
+    "children": [{"name": "Sam"}],
+    "images": [],
+}
+
+NO_ASSETS = {"images": [], "files": [], "videos": []}
+
+
+@pytest.fixture
+def obs_dir(tmp_path):
+    """Create the observations directory with OBSERVATION's subdirectory in place."""
+    (tmp_path / FamlyDownloader._get_observation_dir_name(OBSERVATION)).mkdir()
+    return tmp_path
+
+
+class TestObservationPages:
+    """Tests for skipping observation pages whose inputs have not changed."""
+
+    def test_unchanged_observation_is_not_rewritten(self, downloader, obs_dir):
+        """An observation rendered by an earlier run should keep its page."""
+        formatter = HTMLFormatter()
+        signatures = {}
+        downloader.write_observation_pages(
+            formatter, [OBSERVATION], [NO_ASSETS], obs_dir, signatures
+        )
+        (page,) = obs_dir.glob("*/index.html")
+        assert "Painted a rainbow" in page.read_text()
+
+        page.write_text("kept")
+        downloader.write_observation_pages(
+            formatter, [OBSERVATION], [NO_ASSETS], obs_dir, signatures
+        )
+        assert page.read_text() == "kept"
+
+    def test_changed_observation_is_rewritten(self, downloader, obs_dir):
+        """An observation whose data changed should have its page rendered again."""
+        formatter = HTMLFormatter()
+        signatures = {}
+        downloader.write_observation_pages(
+            formatter, [OBSERVATION], [NO_ASSETS], obs_dir, signatures
+        )
+        (page,) = obs_dir.glob("*/index.html")
+        page.write_text("stale")
+
+        edited = {**OBSERVATION, "likes": {"count": 2}}
+        downloader.write_observation_pages(formatter, [edited], [NO_ASSETS], obs_dir, signatures)
+        assert "Painted a rainbow" in page.read_text()
+
+
+class TestMessageImages:
+    """Tests for recording conversations whose message images failed."""
+
+    @staticmethod
+    def conversation(*image_ids: str) -> dict:
+        """Build a conversation with one message holding the given images."""
+        images = [{"imageId": i, "prefix": "https://img", "key": i} for i in image_ids]
+        return {"conversationId": "conv1", "messages": [{"messageId": "m1", "images": images}]}
+
+    def test_failed_image_marks_conversation_incomplete(self, tmp_path, monkeypatch):
+        """A message image that failed should keep its conversation for the next run."""
+        with FamlyDownloader("child", "token", output_dir=str(tmp_path)) as dl:
+
+            def fake_download(url, filepath, timeout, label):
+                if url.endswith("bad"):
+                    return None
+                filepath.write_bytes(b"jpeg")
+                return filepath
+
+            monkeypatch.setattr(dl, "_download_stream", fake_download)
+            images = dl.download_message_images(self.conversation("good", "bad"), tmp_path)
+
+            assert [p.name for p in images["m1"]] == ["good.jpg"]
+            assert dl.incomplete_conversations == {"conv1"}
+
+    def test_downloaded_images_leave_conversation_complete(self, tmp_path, monkeypatch):
+        """A conversation whose images all downloaded should not be recorded."""
+        with FamlyDownloader("child", "token", output_dir=str(tmp_path)) as dl:
+
+            def fake_download(url, filepath, timeout, label):
+                filepath.write_bytes(b"jpeg")
+                return filepath
+
+            monkeypatch.setattr(dl, "_download_stream", fake_download)
+            dl.download_message_images(self.conversation("good"), tmp_path)
+
+            assert dl.incomplete_conversations == set()
+
+
+class TestDownloadMissing:
+    """Tests for fetching each URL once and linking it to every path that wants it."""
+
+    @pytest.fixture
+    def dl(self, tmp_path, monkeypatch):
+        """Downloader whose downloads write the URL into the file and are counted."""
+        with FamlyDownloader("child", "token", output_dir=str(tmp_path)) as dl:
+            dl.fetched = []
+
+            def fake_download(url, filepath, timeout, label):
+                dl.fetched.append(url)
+                filepath.write_text(url)
+                return filepath
+
+            monkeypatch.setattr(dl, "_download_stream", fake_download)
+            yield dl
+
+    def test_shared_url_fetched_once(self, dl, tmp_path):
+        """Paths that share a URL should all get the file from a single download."""
+        tasks = [
+            ("https://img/a", tmp_path / "obs1" / "a.jpg", 30, "a"),
+            ("https://img/a", tmp_path / "obs2" / "a.jpg", 30, "a"),
+            ("https://img/b", tmp_path / "obs2" / "b.jpg", 30, "b"),
+        ]
+
+        paths = dl._download_missing(tasks)
+
+        assert sorted(dl.fetched) == ["https://img/a", "https://img/b"]
+        assert paths == [task[1] for task in tasks]
+        assert [path.read_text() for path in paths] == [task[0] for task in tasks]
+
+    def test_repeated_path_fetched_once(self, dl, tmp_path):
+        """The same task listed twice should be downloaded once and returned twice."""
+        task = ("https://img/a", tmp_path / "a.jpg", 30, "a")
+
+        paths = dl._download_missing([task, task])
+
+        assert dl.fetched == ["https://img/a"]
+        assert paths == [task[1], task[1]]
+
+    def test_url_from_earlier_batch_is_linked(self, dl, tmp_path):
+        """A URL downloaded by an earlier call should be linked rather than fetched again."""
+        dl._download_missing([("https://img/a", tmp_path / "obs1" / "a.jpg", 30, "a")])
+
+        paths = dl._download_missing([("https://img/a", tmp_path / "obs2" / "a.jpg", 30, "a")])
+
+        assert dl.fetched == ["https://img/a"]
+        assert paths[0].read_text() == "https://img/a"
+
+    def test_existing_file_is_linked(self, dl, tmp_path):
+        """A URL already on disk from a previous run should be linked to new paths."""
+        existing = tmp_path / "obs1" / "a.jpg"
+        existing.parent.mkdir()
+        existing.write_text("from last run")
+        tasks = [
+            ("https://img/a", existing, 30, "a"),
+            ("https://img/a", tmp_path / "obs2" / "a.jpg", 30, "a"),
+        ]
+
+        paths = dl._download_missing(tasks)
+
+        assert dl.fetched == []
+        assert [path.read_text() for path in paths] == ["from last run", "from last run"]
+
+    def test_failed_download_is_not_linked(self, dl, tmp_path, monkeypatch):
+        """Paths sharing a URL that failed should all be left out."""
+        monkeypatch.setattr(dl, "_download_stream", lambda *task: None)
+        tasks = [
+            ("https://img/a", tmp_path / "obs1" / "a.jpg", 30, "a"),
+            ("https://img/a", tmp_path / "obs2" / "a.jpg", 30, "a"),
+        ]
+
+        assert dl._download_missing(tasks) == []
+        assert not (tmp_path / "obs2" / "a.jpg").exists()
+
+
+class TestLinkOrCopy:
+    """Tests for giving a downloaded file a second name."""
+
+    def test_hard_links(self, tmp_path):
+        """The destination should be a hard link to the source."""
+        source = tmp_path / "a.jpg"
+        source.write_bytes(b"jpeg")
+
+        assert _link_or_copy(source, tmp_path / "b.jpg")
+        assert (tmp_path / "b.jpg").stat().st_ino == source.stat().st_ino
+
+    def test_copies_when_linking_fails(self, tmp_path, monkeypatch):
+        """A file system without hard links should get a copy instead."""
+
+        def no_links(source, destination):
+            raise OSError(errno.EPERM, "Operation not permitted")
+
+        monkeypatch.setattr(famly_downloader.os, "link", no_links)
+        source = tmp_path / "a.jpg"
+        source.write_bytes(b"jpeg")
+
+        assert _link_or_copy(source, tmp_path / "b.jpg")
+        assert (tmp_path / "b.jpg").read_bytes() == b"jpeg"
+
+    def test_existing_destination_kept(self, tmp_path):
+        """A destination that already exists should count as done and be left alone."""
+        source = tmp_path / "a.jpg"
+        source.write_bytes(b"new")
+        (tmp_path / "b.jpg").write_bytes(b"old")
+
+        assert _link_or_copy(source, tmp_path / "b.jpg")
+        assert (tmp_path / "b.jpg").read_bytes() == b"old"
+
+
+class FakeBody(io.BytesIO):
+    """Response body that breaks off like a dropped connection after `fail_after` bytes."""
+
+    def __init__(self, data: bytes, fail_after: int | None = None):
+        super().__init__(data)
+        self.fail_after = fail_after
+
+    def read(self, size: int = -1) -> bytes:
+        if self.fail_after is None:
+            return super().read(size)
+        remaining = self.fail_after - self.tell()
+        if remaining <= 0:
+            raise ProtocolError("Connection broken")
+        return super().read(remaining if size < 0 else min(size, remaining))
+
+
+class FakeResponse:
+    """The parts of a streamed requests.Response the downloader uses."""
+
+    def __init__(self, status_code: int, headers: dict, body: FakeBody):
+        self.status_code = status_code
+        self.headers = headers
+        self.raw = body
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "FakeResponse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+class FakeFileSession:
+    """Session serving one file that records each request's Range header.
+
+    Parameters
+    ----------
+    data : bytes
+        The file's content.
+    honour_ranges : bool
+        Answer Range requests with 206 and the range, or ignore them as some
+        servers do and send the whole file.
+    failures : dict[str | None, int] | None
+        Number of times the body for a Range header (None for the whole file)
+        breaks off early before it is served in full.
+    """
+
+    def __init__(self, data: bytes, honour_ranges: bool = True, failures: dict | None = None):
+        self.data = data
+        self.honour_ranges = honour_ranges
+        self.failures = dict(failures or {})
+        self.ranges: list[str | None] = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, stream=False, timeout=None) -> FakeResponse:
+        requested = (headers or {}).get("Range")
+        with self._lock:
+            self.ranges.append(requested)
+            failing = self.failures.get(requested, 0) > 0
+            if failing:
+                self.failures[requested] -= 1
+
+        response_headers = {"Accept-Ranges": "bytes"}
+        if requested and self.honour_ranges:
+            start, end = map(int, re.fullmatch(r"bytes=(\d+)-(\d+)", requested).groups())
+            body, status = self.data[start : end + 1], 206
+            response_headers["Content-Range"] = f"bytes {start}-{end}/{len(self.data)}"
+        else:
+            body, status = self.data, 200
+        response_headers["Content-Length"] = str(len(body))
+        return FakeResponse(
+            status, response_headers, FakeBody(body, len(body) // 8 if failing else None)
+        )
+
+    def close(self) -> None:
+        pass
+
+
+# 4003 bytes split four ways: the open response keeps 0-1000 and these are requested
+RANGED_FILE = bytes(range(256)) * 15 + bytes(163)
+RANGES = ["bytes=1001-2001", "bytes=2002-3002", "bytes=3003-4002"]
+
+
+class TestRangeDownload:
+    """Tests for fetching large files as parallel byte ranges."""
+
+    @pytest.fixture(autouse=True)
+    def small_multipart_size(self, monkeypatch):
+        """Split files of a few kilobytes, so the tests need no large data, and retry at once."""
+        monkeypatch.setattr(famly_downloader, "MULTIPART_MIN_SIZE", 1000)
+        monkeypatch.setattr(
+            famly_downloader, "RETRY_POLICY", famly_downloader.RETRY_POLICY.new(backoff_factor=0)
+        )
+
+    @staticmethod
+    def download(session: FakeFileSession, tmp_path):
+        """Download RANGED_FILE through the session, returning the path or None."""
+        with FamlyDownloader(
+            "child", "token", output_dir=str(tmp_path), sessions=(session, session)
+        ) as dl:
+            return dl._download_stream("https://media/file", tmp_path / "file", 30, "file")
+
+    def test_file_is_split_into_ranges(self, tmp_path):
+        """The open response should supply the first range and the rest be requested."""
+        session = FakeFileSession(RANGED_FILE)
+
+        path = self.download(session, tmp_path)
+
+        assert path.read_bytes() == RANGED_FILE
+        assert session.ranges[0] is None
+        assert sorted(session.ranges[1:]) == RANGES
+
+    def test_only_failed_range_is_retried(self, tmp_path):
+        """A range that breaks off should be requested again, and nothing else."""
+        session = FakeFileSession(RANGED_FILE, failures={RANGES[1]: 1})
+
+        path = self.download(session, tmp_path)
+
+        assert path.read_bytes() == RANGED_FILE
+        assert session.ranges.count(None) == 1
+        assert sorted(session.ranges[1:]) == sorted([*RANGES, RANGES[1]])
+
+    def test_broken_first_range_is_requested(self, tmp_path):
+        """If the open response breaks off, only its range should be requested again."""
+        session = FakeFileSession(RANGED_FILE, failures={None: 1})
+
+        path = self.download(session, tmp_path)
+
+        assert path.read_bytes() == RANGED_FILE
+        assert session.ranges.count(None) == 1
+        assert sorted(session.ranges[1:]) == sorted(["bytes=0-1000", *RANGES])
+
+    def test_ignored_ranges_fall_back_to_whole_file(self, tmp_path):
+        """A server that ignores Range headers should get one plain GET for the file."""
+        session = FakeFileSession(RANGED_FILE, honour_ranges=False)
+
+        path = self.download(session, tmp_path)
+
+        assert path.read_bytes() == RANGED_FILE
+        assert session.ranges.count(None) == 2
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_part_file_removed_after_failure(self, tmp_path):
+        """A range that keeps failing should fail the download and leave no .part file."""
+        session = FakeFileSession(RANGED_FILE, failures={RANGES[0]: 100})
+
+        assert self.download(session, tmp_path) is None
+
+        assert session.ranges.count(RANGES[0]) == famly_downloader.RETRY_POLICY.total + 1
+        assert list(tmp_path.iterdir()) == []
+
+    def test_disk_errors_are_not_retried(self, tmp_path, monkeypatch):
+        """A local write error should fail the download without requesting again."""
+        copy_exact = famly_downloader._copy_exact
+
+        def disk_full(source, f, size):
+            if f.tell():
+                raise OSError(errno.ENOSPC, "No space left on device")
+            copy_exact(source, f, size)
+
+        monkeypatch.setattr(famly_downloader, "_copy_exact", disk_full)
+        session = FakeFileSession(RANGED_FILE)
+
+        assert self.download(session, tmp_path) is None
+
+        assert len(set(session.ranges)) == len(session.ranges)
+        assert list(tmp_path.iterdir()) == []
+
+
+class FakeClock:
+    """Stands in for the time module, where sleeping moves the clock on at once."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+    """Tests for spacing out requests with a token bucket."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Replace the downloader's clock and sleep with a FakeClock."""
+        clock = FakeClock()
+        monkeypatch.setattr(famly_downloader, "time", clock)
+        return clock
+
+    def test_burst_then_spaced(self, clock):
+        """The first `burst` requests should go at once, then one every 1/rate seconds."""
+        limiter = RateLimiter(rate=4, burst=3)
+        sent = []
+
+        for _ in range(6):
+            limiter.acquire()
+            sent.append(clock.now - 1000.0)
+
+        assert sent == pytest.approx([0, 0, 0, 0.25, 0.5, 0.75])
+
+    def test_burst_defaults_to_one_second(self, clock):
+        """Without a burst, one second's worth of requests should go at once."""
+        limiter = RateLimiter(rate=2)
+
+        for _ in range(3):
+            limiter.acquire()
+
+        assert clock.sleeps == pytest.approx([0.5])
+
+    def test_idle_time_refills_up_to_burst(self, clock):
+        """An idle spell should earn back tokens, but no more than the burst."""
+        limiter = RateLimiter(rate=4, burst=2)
+        for _ in range(2):
+            limiter.acquire()
+        clock.now += 60
+
+        for _ in range(3):
+            limiter.acquire()
+
+        assert clock.sleeps == pytest.approx([0.25])
+
+    def test_adapter_takes_token_per_request(self, clock, monkeypatch):
+        """Each request sent through a rate-limited session should wait its turn."""
+        sent = []
+
+        def send(adapter, request, **kwargs):
+            sent.append(clock.now - 1000.0)
+            response = requests.Response()
+            response.status_code = 200
+            response.request = request
+            response.url = request.url
+            response._content = b""
+            return response
+
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+        session = requests.Session()
+        mount_pooled_adapter(session, rate_limiter=RateLimiter(rate=10, burst=1))
+
+        for _ in range(3):
+            session.get("https://app.famly.co/api/me")
+
+        assert sent == pytest.approx([0, 0.1, 0.2])
+
+
+def image_history(count: int) -> list[dict]:
+    """Build `count` images, newest first, one minute apart."""
+    return [
+        {"imageId": f"img{i}", "createdAt": f"2024-03-01T{23 - i // 60:02d}:{59 - i % 60:02d}:00Z"}
+        for i in range(count)
+    ]
+
+
+class TestImagePaging:
+    """Tests for paging through the image list."""
+
+    @pytest.fixture
+    def dl(self, tmp_path, monkeypatch):
+        """Downloader whose image list comes from a fake API that records each limit."""
+        monkeypatch.setattr(famly_downloader, "PAGE_DELAY", 0)
+        with FamlyDownloader("child", "token", output_dir=str(tmp_path)) as dl:
+            dl.images = image_history(250)
+            dl.limits = []
+
+            def fetch_image_list(older_than=None, limit=100):
+                dl.limits.append(limit)
+                older = [i for i in dl.images if not older_than or i["createdAt"] < older_than]
+                return older[:limit]
+
+            monkeypatch.setattr(dl, "fetch_image_list", fetch_image_list)
+            yield dl
+
+    def test_full_sync_pages_at_batch_size(self, dl):
+        """Without a sync mark every page should be a full batch until the list runs out."""
+        pages = list(dl.iter_image_pages(batch_size=100))
+
+        assert dl.limits == [100, 100, 100]
+        assert [len(page) for page in pages] == [100, 100, 50]
+        assert [img for page in pages for img in page] == dl.images
+
+    def test_incremental_sync_doubles_page_size(self, dl):
+        """An incremental sync should start small and double while pages come back full."""
+        stop_at = dl.images[150]["createdAt"]
+
+        pages = list(dl.iter_image_pages(batch_size=100, stop_at=stop_at))
+
+        assert dl.limits == [20, 40, 80, 100]
+        assert [len(page) for page in pages] == [20, 40, 80, 10]
+
+    def test_stops_at_last_synced_image(self, dl, capsys):
+        """Paging should stop at the first synced image and yield only newer ones."""
+        stop_at = dl.images[5]["createdAt"]
+
+        pages = list(dl.iter_image_pages(batch_size=100, stop_at=stop_at))
+
+        assert dl.limits == [20]
+        assert pages == [dl.images[:5]]
+        assert "Reached previously synced images" in capsys.readouterr().out
+
+    def test_nothing_new(self, dl):
+        """If the newest image is already synced no page should be yielded."""
+        pages = list(dl.iter_image_pages(batch_size=100, stop_at=dl.images[0]["createdAt"]))
+
+        assert pages == []
+        assert dl.limits == [20]
+
+    def test_pause_between_pages(self, dl, monkeypatch):
+        """Each page after the first should wait PAGE_DELAY before it is requested."""
+        monkeypatch.setattr(famly_downloader, "PAGE_DELAY", 0.5)
+        clock = FakeClock()
+        monkeypatch.setattr(famly_downloader, "time", clock)
+
+        list(dl.iter_image_pages(batch_size=100))
+
+        assert clock.sleeps == [0.5, 0.5]
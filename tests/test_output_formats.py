@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Unit tests for rendering API data that has missing or null fields.
+
+Run with: uv run pytest tests/test_output_formats.py -v
+"""
+
+from output_formats import HTMLFormatter
+
+NO_AVATAR_OBSERVATION = {
+    "id": "obs12345-0000",
+    "remark": {"date": "2024-03-01", "body": None},
+    "createdBy": {"name": {"fullName": "Jane Smith"}, "profileImage": {"url": None}},
+    "children": [{"name": "Sam"}],
+    "comments": {
+        "count": 1,
+        "results": [
+            {
+                "body": "Lovely!",
+                "sentAt": "2024-03-01T10:00:00Z",
+                "sentBy": {"name": {"fullName": "Alex Jones"}, "profileImage": {"url": None}},
+            }
+        ],
+    },
+}
+
+
+def dir_name(observation: dict) -> str:
+    """Name observation directories by ID, as a stand-in for the downloader's."""
+    return observation["id"]
+
+
+class TestNullFields:
+    """Tests that null API values render as if they were absent."""
+
+    def test_observation_without_profile_image(self):
+        """A null profile image URL should show the placeholder avatar."""
+        html = HTMLFormatter().format_observation(NO_AVATAR_OBSERVATION, [], dir_name)
+
+        assert "Jane Smith" in html
+        assert "Lovely!" in html
+        assert 'src="None"' not in html
+        assert html.count('<div class="avatar"></div>') == 2
+
+    def test_conversation_with_null_message_fields(self):
+        """A message with a null body or author image should still render."""
+        conversation = {
+            "conversationId": "aaaaaaaa-0000",
+            "title": "Nursery team",
+            "participants": [{"title": "Jane Smith", "image": None}],
+            "messages": [
+                {
+                    "messageId": "m1",
+                    "body": None,
+                    "author": {"title": "Jane Smith", "image": None},
+                    "createdAt": "2024-03-01T10:00:00Z",
+                }
+            ],
+        }
+
+        html = HTMLFormatter().format_conversation(conversation, {})
+
+        assert "Nursery team" in html
+        assert "None" not in html
+
+    def test_conversations_index_with_null_fields(self):
+        """A null last message body or participant image should not break the index."""
+        conversations = [
+            {
+                "conversationId": "aaaaaaaa-0000",
+                "title": "Nursery team",
+                "participants": [{"title": "Jane Smith", "image": None}],
+                "lastActivityAt": "2024-03-01T10:00:00Z",
+                "lastMessage": {"body": None},
+            }
+        ]
+
+        html = HTMLFormatter().format_conversations_index(conversations)
+
+        assert "Nursery team" in html
+        assert "None" not in html
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the publish providers that run locally.
+
+Run with: uv run pytest tests/test_publish.py -v
+"""
+
+import http.client
+import json
+import os
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import publish
+from publish import ZIP_MANIFEST_SUFFIX, CloudflareProvider, ZipProvider, load_config
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Create a small photos archive to zip."""
+    source = tmp_path / "famly_photos"
+    (source / "photos").mkdir(parents=True)
+    (source / "index.html").write_text("<html></html>")
+    (source / "photos" / "2024-01-15_142305_abcdefgh.jpg").write_bytes(b"\xff\xd8" * 100)
+    return source
+
+
+def deploy(provider: ZipProvider, source):
+    """Zip the archive, returning the result and the names in the zip."""
+    result = provider.deploy(source, "famly-photos")
+    assert result.success, result.message
+    with zipfile.ZipFile(result.path) as zf:
+        return result, sorted(zf.namelist())
+
+
+class TestZipProvider:
+    """Tests for reusing and extending the zip between runs."""
+
+    def test_creates_zip_and_manifest(self, tmp_path, archive):
+        """The first run should zip every file and record them in the manifest."""
+        provider = ZipProvider(output_dir=str(tmp_path / "out"))
+
+        result, names = deploy(provider, archive)
+
+        assert result.message.startswith("Created zip file")
+        assert names == ["index.html", "photos/2024-01-15_142305_abcdefgh.jpg"]
+        manifest = json.loads(Path(result.path + ZIP_MANIFEST_SUFFIX).read_text())
+        assert sorted(manifest) == names
+
+    def test_unchanged_archive_keeps_zip(self, tmp_path, archive):
+        """A second run over the same files should leave the zip alone."""
+        provider = ZipProvider(output_dir=str(tmp_path / "out"))
+        first, _ = deploy(provider, archive)
+        mtime = os.stat(first.path).st_mtime_ns
+
+        result, _ = deploy(provider, archive)
+
+        assert result.message.startswith("Zip file already up to date")
+        assert os.stat(result.path).st_mtime_ns == mtime
+
+    def test_new_files_are_appended(self, tmp_path, archive):
+        """Files added since the last run should be appended to the zip."""
+        provider = ZipProvider(output_dir=str(tmp_path / "out"))
+        deploy(provider, archive)
+        (archive / "photos" / "2024-01-16_090000_ijklmnop.jpg").write_bytes(b"\xff\xd8" * 50)
+
+        result, names = deploy(provider, archive)
+
+        assert result.message.startswith("Added 1 file(s) to zip file")
+        assert names == [
+            "index.html",
+            "photos/2024-01-15_142305_abcdefgh.jpg",
+            "photos/2024-01-16_090000_ijklmnop.jpg",
+        ]
+        with zipfile.ZipFile(result.path) as zf:
+            assert zf.testzip() is None
+
+    def test_changed_file_rebuilds_zip(self, tmp_path, archive):
+        """A file changed since the last run should rebuild the zip with its new content."""
+        provider = ZipProvider(output_dir=str(tmp_path / "out"))
+        deploy(provider, archive)
+        (archive / "index.html").write_text("<html><body>updated</body></html>")
+
+        result, names = deploy(provider, archive)
+
+        assert result.message.startswith("Created zip file")
+        with zipfile.ZipFile(result.path) as zf:
+            assert zf.read("index.html") == b"<html><body>updated</body></html>"
+        assert names.count("index.html") == 1
+
+    def test_removed_file_rebuilds_zip(self, tmp_path, archive):
+        """A file removed since the last run should be dropped from the zip."""
+        provider = ZipProvider(output_dir=str(tmp_path / "out"))
+        deploy(provider, archive)
+        (archive / "photos" / "2024-01-15_142305_abcdefgh.jpg").unlink()
+
+        result, names = deploy(provider, archive)
+
+        assert result.message.startswith("Created zip file")
+        assert names == ["index.html"]
+
+
+class FakeApiResponse:
+    """The parts of an http.client response that _api_request reads."""
+
+    status = 200
+
+    def read(self) -> bytes:
+        return b'{"success": true, "result": []}'
+
+
+class FakeConnection:
+    """HTTPSConnection stand-in that records requests and can drop them."""
+
+    def __init__(self, host, timeout=None):
+        self.requests: list[str] = []
+        self.dropped = False
+        self.closed = False
+
+    def request(self, method, path, body=None, headers=None):
+        self.requests.append(method)
+        if self.dropped:
+            raise http.client.RemoteDisconnected("Remote end closed connection")
+
+    def getresponse(self) -> FakeApiResponse:
+        return FakeApiResponse()
+
+    def close(self):
+        self.closed = True
+
+
+class TestApiRequest:
+    """Tests for resending Cloudflare API requests on a dropped kept-alive connection."""
+
+    @pytest.fixture
+    def connections(self, monkeypatch):
+        """Make _api_request open FakeConnections, returning the list of those opened."""
+        opened = []
+
+        def connect(host, timeout=None):
+            opened.append(FakeConnection(host, timeout))
+            return opened[-1]
+
+        monkeypatch.setattr(http.client, "HTTPSConnection", connect)
+        return opened
+
+    @pytest.fixture
+    def provider(self, connections):
+        """Provider that has already sent one request, so its connection is reused."""
+        provider = CloudflareProvider(account_id="account", api_token="token")
+        assert provider._api_request("GET", "access/apps")
+        return provider
+
+    def test_get_resent_on_new_connection(self, provider, connections):
+        """A GET on a connection the server dropped should be sent once more on a new one."""
+        connections[0].dropped = True
+
+        result = provider._api_request("GET", "access/apps")
+
+        assert result == {"success": True, "result": []}
+        assert connections[0].closed
+        assert [conn.requests for conn in connections] == [["GET", "GET"], ["GET"]]
+
+    def test_post_not_resent(self, provider, connections, capsys):
+        """A POST may have reached the server already, so it should fail rather than repeat."""
+        connections[0].dropped = True
+
+        result = provider._api_request("POST", "access/apps", {"name": "famly-photos"})
+
+        assert result is None
+        assert len(connections) == 1
+        assert connections[0].requests == ["GET", "POST"]
+        assert "API error" in capsys.readouterr().err
+        assert provider._api_conn is None
+
+    def test_new_connection_failure_not_resent(self, connections, monkeypatch):
+        """A request that fails on a fresh connection should not be retried."""
+        provider = CloudflareProvider(account_id="account", api_token="token")
+
+        def refuse(host, timeout=None):
+            connections.append(FakeConnection(host, timeout))
+            connections[-1].dropped = True
+            return connections[-1]
+
+        monkeypatch.setattr(http.client, "HTTPSConnection", refuse)
+
+        assert provider._api_request("GET", "access/apps") is None
+        assert len(connections) == 1
+
+
+class TestYamlCache:
+    """Tests for reading YAML config files from their JSON copies."""
+
+    @pytest.fixture
+    def config_file(self, tmp_path, monkeypatch):
+        """Write a YAML config, with HOME and the cache directory under tmp_path."""
+        pytest.importorskip("yaml")
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        monkeypatch.setattr(publish, "YAML_CACHE_DIR", tmp_path / "home" / ".cache" / "publish")
+        monkeypatch.setattr(publish, "_config_cache", {})
+        path = tmp_path / "publish.yaml"
+        path.write_text("provider: zip\nproject_name: famly-photos\n")
+        return path
+
+    @staticmethod
+    def write_config(path, text: str) -> None:
+        """Rewrite the config with a modification time clearly later than before."""
+        mtime = path.stat().st_mtime_ns
+        path.write_text(text)
+        os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+    def test_cache_hit_skips_yaml(self, config_file, monkeypatch):
+        """An unchanged file should be read from its copy without importing PyYAML."""
+        load_config(config_file)
+        monkeypatch.setattr(publish, "_config_cache", {})
+        monkeypatch.setitem(sys.modules, "yaml", None)
+
+        config = load_config(config_file)
+
+        assert config.provider == "zip"
+        cache_path = publish._yaml_cache_path(config_file)
+        assert cache_path.stat().st_mode & 0o777 == 0o600
+
+    def test_changed_file_is_parsed_again(self, config_file, monkeypatch):
+        """A file modified since its copy was written should be parsed afresh."""
+        load_config(config_file)
+        monkeypatch.setattr(publish, "_config_cache", {})
+        self.write_config(config_file, "provider: cloudflare\n")
+
+        config = load_config(config_file)
+
+        assert config.provider == "cloudflare"
+        cached = json.loads(publish._yaml_cache_path(config_file).read_text())
+        assert cached["src_mtime"] == config_file.stat().st_mtime_ns
+        assert cached["data"] == {"provider": "cloudflare"}
+
+    def test_corrupt_cache_is_replaced(self, config_file):
+        """A copy that is not valid JSON should be ignored and written again."""
+        cache_path = publish._yaml_cache_path(config_file)
+        cache_path.parent.mkdir(parents=True)
+        cache_path.write_text('{"src_mtime": ')
+
+        config = load_config(config_file)
+
+        assert config.provider == "zip"
+        assert json.loads(cache_path.read_text())["data"]["provider"] == "zip"
+
+    def test_cache_kept_out_of_config_directory(self, config_file):
+        """The copy should be written to the cache directory, not next to the config."""
+        load_config(config_file)
+
+        assert sorted(p.name for p in config_file.parent.iterdir()) == ["home", "publish.yaml"]
+        assert list(publish.YAML_CACHE_DIR.iterdir()) == [publish._yaml_cache_path(config_file)]
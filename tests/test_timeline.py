@@ -3,57 +3,156 @@
 Automated tests for the timeline navigation component.
 
 Tests both desktop and mobile viewports to ensure the timeline
-works correctly with both mouse and touch interactions.
+works correctly with both mouse and touch interactions, on a photo
+gallery rendered by HTMLFormatter.
 
 Run with: uv run pytest tests/test_timeline.py -v
+In parallel: uv run pytest tests -n auto --dist=loadfile -v
 """
 
 import re
-from pathlib import Path
 
 import pytest
-from playwright.sync_api import Page, expect, sync_playwright
+from playwright.sync_api import Page, expect
+
+from output_formats import HTMLFormatter
 
 # Test configurations
 DESKTOP_VIEWPORT = {"width": 1280, "height": 800}
 MOBILE_VIEWPORT = {"width": 375, "height": 667}
 
-TEST_HTML_PATH = Path(__file__).parent / "test_timeline.html"
+# Months the generated gallery covers, newest first, and photos in each; enough
+# to make the page several screens tall on both viewports
+GALLERY_MONTHS = (
+    [(2026, 1)] + [(2025, m) for m in range(12, 0, -1)] + [(2024, m) for m in range(12, 3, -1)]
+)
+PHOTOS_PER_MONTH = 6
+
+# Class names the timeline toggles, for to_have_class checks
+RE_ACTIVE = re.compile(r"active")
+RE_VISIBLE = re.compile(r"visible")
+RE_EXPANDED = re.compile(r"expanded")
+
+# The page's script runs inline at the end of <body>, so the timeline is ready at
+# DOMContentLoaded; waiting any longer only waits on its (missing) photos
+PAGE_READY_STATE = "domcontentloaded"
+
+# Turns off CSS transitions and animations, so styles reach their end state at once
+# and condition-based waits return immediately
+NO_TRANSITIONS_JS = """
+document.addEventListener("DOMContentLoaded", () => {
+    const style = document.createElement("style");
+    style.textContent =
+        "*, *::before, *::after { transition: none !important; " +
+        "animation: none !important; scroll-behavior: auto !important; }";
+    document.head.appendChild(style);
+});
+"""
+
+# Marks the page once the timeline enters drag mode, since a tap ends the drag
+# (and removes the expanded class) before a check could see it
+RECORD_DRAG_JS = """
+document.addEventListener("DOMContentLoaded", () => {
+    const nav = document.querySelector(".timeline-nav");
+    new MutationObserver(() => {
+        if (nav.classList.contains("expanded")) {
+            document.documentElement.dataset.dragStarted = "true";
+        }
+    }).observe(nav, { attributes: true, attributeFilter: ["class"] });
+});
+"""
+
+# Reads the timeline's box and the first label's computed width in one round trip
+TIMELINE_STATE_JS = """() => {
+    const rect = document.querySelector(".timeline-nav").getBoundingClientRect();
+    const label = document.querySelector(".timeline-label");
+    return {
+        x: rect.x,
+        y: rect.y,
+        width: rect.width,
+        height: rect.height,
+        labelWidth: window.getComputedStyle(label).width,
+    };
+}"""
 
 
 @pytest.fixture(scope="module")
-def browser_context():
-    """Create a browser context for testing."""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        yield browser
-        browser.close()
+def gallery_url(tmp_path_factory) -> str:
+    """Render a photo gallery with HTMLFormatter and return its file URL.
+
+    The photos themselves are never written; the grid cells keep their size
+    without them, and the timeline only depends on the months.
+    """
+    gallery_dir = tmp_path_factory.mktemp("gallery")
+    photos = [
+        gallery_dir / f"{year}-{month:02d}-{day:02d}_120000_{year}{month:02d}{day:02d}.jpg"
+        for year, month in GALLERY_MONTHS
+        for day in range(1, PHOTOS_PER_MONTH + 1)
+    ]
+    gallery_file = gallery_dir / "photos.html"
+    gallery_file.write_text(HTMLFormatter().format_photo_gallery(photos), encoding="utf-8")
+    return gallery_file.as_uri()
 
 
-@pytest.fixture
-def desktop_page(browser_context):
-    """Create a desktop-sized page."""
+@pytest.fixture(scope="module")
+def desktop_context(browser_context):
+    """Create a desktop-sized browser context shared by the desktop tests."""
     context = browser_context.new_context(viewport=DESKTOP_VIEWPORT)
-    page = context.new_page()
-    page.goto(f"file://{TEST_HTML_PATH.absolute()}")
-    page.wait_for_load_state("networkidle")
-    yield page
+    context.add_init_script(NO_TRANSITIONS_JS)
+    yield context
+    context.close()
+
+
+@pytest.fixture(scope="module")
+def mobile_context(browser_context):
+    """Create a mobile-sized browser context with touch enabled."""
+    # The mobile layout comes from the viewport width media query, so touch is
+    # all that needs emulating on top of it
+    context = browser_context.new_context(viewport=MOBILE_VIEWPORT, has_touch=True)
+    context.add_init_script(NO_TRANSITIONS_JS)
+    context.add_init_script(RECORD_DRAG_JS)
+    yield context
     context.close()
 
 
+@pytest.fixture(scope="module")
+def desktop_page_shared(desktop_context, gallery_url):
+    """Open the desktop-sized page once for all desktop tests."""
+    page = desktop_context.new_page()
+    page.goto(gallery_url, wait_until=PAGE_READY_STATE)
+    yield page
+    page.close()
+
+
 @pytest.fixture
-def mobile_page(browser_context):
+def desktop_page(desktop_page_shared):
+    """Provide the shared desktop page, reset to its initial state afterwards.
+
+    Desktop tests only scroll, hover and click, so moving the mouse away and
+    reloading from the top undoes everything they change.
+    """
+    page = desktop_page_shared
+    yield page
+    page.mouse.move(0, 0)
+    page.evaluate("window.scrollTo(0, 0)")
+    page.reload(wait_until=PAGE_READY_STATE)
+
+
+@pytest.fixture
+def mobile_page(mobile_context, gallery_url):
     """Create a mobile-sized page with touch enabled."""
-    context = browser_context.new_context(
-        viewport=MOBILE_VIEWPORT,
-        has_touch=True,
-        is_mobile=True,
-    )
-    page = context.new_page()
-    page.goto(f"file://{TEST_HTML_PATH.absolute()}")
-    page.wait_for_load_state("networkidle")
+    page = mobile_context.new_page()
+    page.goto(gallery_url, wait_until=PAGE_READY_STATE)
     yield page
-    context.close()
+    page.close()
+
+
+@pytest.fixture
+def mobile_page_visible(mobile_page):
+    """Provide a mobile page scrolled just enough to show the timeline."""
+    mobile_page.evaluate("window.scrollBy(0, 100)")
+    expect(mobile_page.locator(".timeline-nav")).to_have_class(RE_VISIBLE)
+    return mobile_page
 
 
 class TestDesktopTimeline:
@@ -70,22 +169,24 @@ class TestDesktopTimeline:
         item = desktop_page.locator('.timeline-item[data-target="month-2025-06"]')
         item.click()
 
-        # Wait for scroll
-        desktop_page.wait_for_timeout(500)
-
-        # Check that the section is in view
+        # Check that the section is in view (retried while the smooth scroll runs)
         section = desktop_page.locator("#month-2025-06")
         expect(section).to_be_in_viewport()
 
     def test_active_state_updates_on_scroll(self, desktop_page: Page):
         """Active timeline item should update when scrolling."""
-        # Scroll to a specific month
-        desktop_page.evaluate('document.getElementById("month-2024-10").scrollIntoView()')
-        desktop_page.wait_for_timeout(300)
+        # Scroll to a specific month, returning once the page has handled the scroll:
+        # scroll events are dispatched before the next animation frame callbacks
+        desktop_page.evaluate(
+            """() => new Promise((resolve) => {
+                document.getElementById("month-2024-10").scrollIntoView();
+                requestAnimationFrame(() => resolve());
+            })"""
+        )
 
         # Check that the corresponding timeline item is active
         item = desktop_page.locator('.timeline-item[data-target="month-2024-10"]')
-        expect(item).to_have_class(re.compile(r"active"))
+        expect(item).to_have_class(RE_ACTIVE)
 
     def test_hover_shows_labels(self, desktop_page: Page):
         """Hovering over timeline should show labels on desktop."""
@@ -94,11 +195,12 @@ class TestDesktopTimeline:
 
         # Hover over timeline
         timeline.hover()
-        desktop_page.wait_for_timeout(200)
 
-        # Labels should have opacity > 0 (visible)
-        opacity = label.evaluate("el => window.getComputedStyle(el).opacity")
-        assert float(opacity) > 0, "Labels should be visible on hover"
+        # Labels should reach opacity > 0 (visible) as the transition runs
+        desktop_page.wait_for_function(
+            "el => parseFloat(window.getComputedStyle(el).opacity) > 0",
+            arg=label.element_handle(),
+        )
 
 
 class TestMobileTimeline:
@@ -117,10 +219,9 @@ class TestMobileTimeline:
 
         # Scroll the page
         mobile_page.evaluate("window.scrollBy(0, 500)")
-        mobile_page.wait_for_timeout(300)
 
         # Timeline should now be visible
-        expect(timeline).to_have_class(re.compile(r"visible"))
+        expect(timeline).to_have_class(RE_VISIBLE)
 
     def test_timeline_hides_after_delay(self, mobile_page: Page):
         """Timeline should hide after scroll stops on mobile."""
@@ -128,23 +229,14 @@ class TestMobileTimeline:
 
         # Scroll to make visible
         mobile_page.evaluate("window.scrollBy(0, 500)")
-        mobile_page.wait_for_timeout(300)
-        expect(timeline).to_have_class(re.compile(r"visible"))
-
-        # Wait for hide timeout (1.5s + buffer)
-        mobile_page.wait_for_timeout(2000)
+        expect(timeline).to_have_class(RE_VISIBLE)
 
-        # Should no longer have visible class
-        classes = timeline.get_attribute("class")
-        assert "visible" not in classes, "Timeline should hide after delay"
+        # Should lose the visible class once the hide timeout (1.5s) fires
+        expect(timeline).not_to_have_class(RE_VISIBLE, timeout=3000)
 
-    def test_drag_navigates_to_month(self, mobile_page: Page):
+    def test_drag_navigates_to_month(self, mobile_page_visible: Page):
         """Dragging on timeline should navigate to months."""
-        timeline = mobile_page.locator(".timeline-nav")
-
-        # First make timeline visible
-        mobile_page.evaluate("window.scrollBy(0, 100)")
-        mobile_page.wait_for_timeout(300)
+        timeline = mobile_page_visible.locator(".timeline-nav")
 
         # Get timeline position
         box = timeline.bounding_box()
@@ -154,77 +246,54 @@ class TestMobileTimeline:
         start_y = box["y"] + 50
         end_y = box["y"] + box["height"] - 50
 
-        mobile_page.mouse.move(box["x"] + box["width"] / 2, start_y)
-        mobile_page.mouse.down()
-        mobile_page.wait_for_timeout(100)
+        mobile_page_visible.mouse.move(box["x"] + box["width"] / 2, start_y)
+        mobile_page_visible.mouse.down()
 
         # Should have expanded class
-        expect(timeline).to_have_class(re.compile(r"expanded"))
+        expect(timeline).to_have_class(RE_EXPANDED)
 
         # Drag down
-        mobile_page.mouse.move(box["x"] + box["width"] / 2, end_y, steps=10)
-        mobile_page.wait_for_timeout(100)
-
-        mobile_page.mouse.up()
+        mobile_page_visible.mouse.move(box["x"] + box["width"] / 2, end_y, steps=10)
+        mobile_page_visible.mouse.up()
 
         # Should no longer have expanded class
-        mobile_page.wait_for_timeout(100)
-        classes = timeline.get_attribute("class")
-        assert "expanded" not in classes, "Timeline should collapse after drag"
-
-    def test_labels_hidden_when_not_dragging(self, mobile_page: Page):
-        """Labels should be hidden when not dragging on mobile."""
-        # Make timeline visible first
-        mobile_page.evaluate("window.scrollBy(0, 100)")
-        mobile_page.wait_for_timeout(300)
-
-        label = mobile_page.locator(".timeline-label").first
-        # Check width is 0 (hidden)
-        width = label.evaluate("el => window.getComputedStyle(el).width")
-        assert width == "0px", "Labels should have 0 width when not expanded"
-
-    def test_labels_visible_when_dragging(self, mobile_page: Page):
-        """Labels should be visible when dragging on mobile."""
-        timeline = mobile_page.locator(".timeline-nav")
+        expect(timeline).not_to_have_class(RE_EXPANDED)
 
-        # Make visible
-        mobile_page.evaluate("window.scrollBy(0, 100)")
-        mobile_page.wait_for_timeout(300)
+    def test_labels_visible_when_dragging(self, mobile_page_visible: Page):
+        """Labels should be hidden on mobile until a drag starts, then visible."""
+        timeline = mobile_page_visible.locator(".timeline-nav")
+
+        # Labels have 0 width (hidden) while not dragging
+        state = mobile_page_visible.evaluate(TIMELINE_STATE_JS)
+        assert state["labelWidth"] == "0px", "Labels should have 0 width when not expanded"
 
         # Start drag
-        box = timeline.bounding_box()
-        mobile_page.mouse.move(box["x"] + box["width"] / 2, box["y"] + 100)
-        mobile_page.mouse.down()
-        mobile_page.wait_for_timeout(200)
+        mobile_page_visible.mouse.move(state["x"] + state["width"] / 2, state["y"] + 100)
+        mobile_page_visible.mouse.down()
+        expect(timeline).to_have_class(RE_EXPANDED)
 
         # Check labels are visible (have width)
-        label = mobile_page.locator(".timeline-label").first
-        width = label.evaluate("el => window.getComputedStyle(el).width")
-        assert width != "0px", "Labels should have width when expanded"
+        state = mobile_page_visible.evaluate(TIMELINE_STATE_JS)
+        assert state["labelWidth"] != "0px", "Labels should have width when expanded"
 
-        mobile_page.mouse.up()
+        mobile_page_visible.mouse.up()
 
 
 class TestTouchInteraction:
     """Tests specifically for touch interaction."""
 
-    def test_touch_starts_drag(self, mobile_page: Page):
+    def test_touch_starts_drag(self, mobile_page_visible: Page):
         """Touch on timeline should start drag mode."""
-        timeline = mobile_page.locator(".timeline-nav")
-
-        # Make visible
-        mobile_page.evaluate("window.scrollBy(0, 100)")
-        mobile_page.wait_for_timeout(300)
+        timeline = mobile_page_visible.locator(".timeline-nav")
 
         box = timeline.bounding_box()
 
         # Use touch tap
-        mobile_page.touchscreen.tap(box["x"] + box["width"] / 2, box["y"] + 100)
-        mobile_page.wait_for_timeout(100)
+        mobile_page_visible.touchscreen.tap(box["x"] + box["width"] / 2, box["y"] + 100)
 
-        # Should have expanded class (at least briefly)
-        # Note: This might be flaky as expanded is removed quickly
-        # The important thing is the interaction works
+        # The expanded class is gone again by the time a tap ends, so check the
+        # record RECORD_DRAG_JS keeps that a drag started instead
+        expect(mobile_page_visible.locator("html")).to_have_attribute("data-drag-started", "true")
 
 
 if __name__ == "__main__":